@@ -0,0 +1,357 @@
+"""
+Offline end-to-end benchmarks against the bundled mock node and oracle.
+
+    python -m bench.bench                       run every scenario
+    python -m bench.bench -s baseline -t 50     one scenario, 50 ticks
+    python -m bench.bench --json out.json       save results
+    python -m bench.bench --compare out.json    compare against saved results
+
+Each scenario starts local MockServers with scripted latency, errors and
+rate limits, then times the engines directly and drives `cli.run()` for a
+number of ticks, live and then recorded and replayed. Reported per
+benchmark: latency percentiles, HTTP requests and RPC calls per iteration
+(counted server-side), CPU time and memory.
+"""
+import argparse
+import copy
+import json
+import logging
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import cli
+from gearbox.endpoints import EndpointSelector
+from gearbox.engine.block_cache import BlockCache
+from gearbox.engine.chain_orientation import observe_chain
+from gearbox.engine.gas import DEFAULT_WINDOW_BLOCKS, FeeWindow, collect_gas_snapshot
+from gearbox.engine.oracle import collect_oracle_snapshot, collect_oracle_snapshots
+from gearbox.mock.server import MockBehavior, MockServer
+from gearbox.transport import HttpTransport
+from gearbox.validate import validate
+
+# name -> (behavior of each RPC node, behavior of the oracle)
+SCENARIOS = {
+    "baseline": (
+        [dict(latency_ms=20), dict(latency_ms=20)],
+        dict(latency_ms=30),
+    ),
+    "slow_primary": (
+        [dict(latency_ms=150, jitter_ms=100), dict(latency_ms=25)],
+        dict(latency_ms=30),
+    ),
+    "flaky": (
+        [dict(latency_ms=20, error_rate=0.2), dict(latency_ms=40, rpc_error_rate=0.05)],
+        dict(latency_ms=30, error_rate=0.1),
+    ),
+    "rate_limited": (
+        [dict(latency_ms=20, rate_limit_rps=10), dict(latency_ms=30, rate_limit_rps=10)],
+        dict(latency_ms=30, rate_limit_rps=2),
+    ),
+}
+
+DEFAULT_TICKS = 20
+DEFAULT_ITERATIONS = 50
+DEFAULT_INTERVAL_SEC = 0.2
+DEFAULT_REGRESSION_PCT = 20
+MULTI_ASSET_PAIRS = [f"A{i:02d}-USD" for i in range(16)]
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return round(ordered[index], 2)
+
+
+def _max_rss_kb() -> int:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS, kilobytes elsewhere
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+class _TickCollector(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.durations_ms = []
+
+    def emit(self, record):
+        if record.getMessage() == "Evaluation phase complete":
+            self.durations_ms.append(record.data["duration_ms"])
+
+
+def start_servers(scenario):
+    node_behaviors, oracle_behavior = SCENARIOS[scenario]
+    nodes = [MockServer(MockBehavior(seed=i, **b)).start() for i, b in enumerate(node_behaviors)]
+    oracle = MockServer(MockBehavior(seed=len(nodes), **oracle_behavior)).start()
+    return nodes, oracle
+
+
+def bench_config(validated, nodes, oracle, ticks, interval_sec):
+    """Copy of the validated config, pointed at the mock servers."""
+    config = copy.deepcopy(validated)
+    parsed = config["parsed"]
+    runtime_cfg = parsed["runtime.yaml"]["runtime"]
+    chains = parsed["chain.yaml"]["chains"]
+
+    runtime_cfg["allowed_chains"] = runtime_cfg["allowed_chains"][:1]
+    chain_cfg = chains[runtime_cfg["allowed_chains"][0]]
+    network_cfg = chain_cfg["networks"][chain_cfg["default_network"]]
+    network_cfg["rpc_endpoints"] = [node.rpc_url for node in nodes]
+    network_cfg["chain_id"] = nodes[0].behavior.chain_id
+
+    oracle_cfg = parsed["oracle.yaml"]["oracle"]
+    oracle_cfg["endpoint_url"] = oracle.oracle_url
+
+    runtime_cfg["evaluation_interval_sec"] = interval_sec
+    runtime_cfg["max_runtime_sec"] = interval_sec * (ticks - 1)
+    runtime_cfg["state"] = {"enabled": False}
+    # The config above exists only in memory; edits on disk must not replace it.
+    runtime_cfg["config_reload"] = False
+    # Benchmarks measure tick cost, not health policy: never pause or halt.
+    runtime_cfg["health"]["pause_after_failures"] = ticks + 1
+    runtime_cfg["health"]["halt_after_failures"] = ticks + 1
+    runtime_cfg["health"].pop("pause_failure_rate", None)
+    runtime_cfg["health"].pop("halt_failure_rate", None)
+    return config
+
+
+def _measure(fn, iterations, servers):
+    for server in servers:
+        server.reset_stats()
+    cpu_start = time.process_time()
+    wall_start = time.monotonic()
+    latencies = []
+    for _ in range(iterations):
+        start = time.monotonic()
+        fn()
+        latencies.append((time.monotonic() - start) * 1000)
+    return latencies, time.process_time() - cpu_start, time.monotonic() - wall_start
+
+
+def _result(latencies, cpu_sec, wall_sec, servers):
+    count = len(latencies) or 1
+    stats = [server.stats_snapshot() for server in servers]
+    statuses = {}
+    for s in stats:
+        for status, n in s["status"].items():
+            statuses[str(status)] = statuses.get(str(status), 0) + n
+    return {
+        "iterations": len(latencies),
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "max_ms": round(max(latencies), 2) if latencies else None,
+        "requests_per_iter": round(sum(s["requests"] for s in stats) / count, 2),
+        "rpc_calls_per_iter": round(sum(s["rpc_calls"] for s in stats) / count, 2),
+        "http_status": statuses,
+        "cpu_ms_per_iter": round(cpu_sec * 1000 / count, 3),
+        "cpu_utilization": round(cpu_sec / wall_sec, 3) if wall_sec else None,
+        "max_rss_kb": _max_rss_kb(),
+    }
+
+
+def bench_engines(config, nodes, oracle, iterations):
+    parsed = config["parsed"]
+    chain_name = parsed["runtime.yaml"]["runtime"]["allowed_chains"][0]
+    chain_cfg = parsed["chain.yaml"]["chains"][chain_name]
+    network_cfg = chain_cfg["networks"][chain_cfg["default_network"]]
+    oracle_cfg = parsed["oracle.yaml"]["oracle"]
+
+    results = {}
+    for batch, cached in ((False, False), (True, False), (True, True)):
+        cfg = copy.deepcopy(chain_cfg)
+        cfg["networks"][chain_cfg["default_network"]]["rpc_batch"] = batch
+        transport = HttpTransport()
+        selector = EndpointSelector(
+            network_cfg["rpc_endpoints"],
+            hedge_percentile=network_cfg.get("hedge_percentile"),
+            hedge_min_delay_ms=network_cfg.get("hedge_min_delay_ms", 0),
+        )
+        block_cache = BlockCache() if cached else None
+        latencies, cpu_sec, wall_sec = _measure(
+            lambda: observe_chain(chain_name, cfg, transport, selector, block_cache),
+            iterations,
+            nodes,
+        )
+        transport.close()
+        name = "observe_chain[batch]" if batch else "observe_chain[sequential]"
+        if cached:
+            name = "observe_chain[batch,cached]"
+        results[name] = _result(latencies, cpu_sec, wall_sec, nodes)
+
+    # The head moves once per mock block, so most iterations need no RPC
+    transport = HttpTransport()
+    fee_window = FeeWindow(network_cfg.get("fee_window_blocks", DEFAULT_WINDOW_BLOCKS))
+    latencies, cpu_sec, wall_sec = _measure(
+        lambda: collect_gas_snapshot(
+            chain_name, chain_cfg, fee_window, transport, head=nodes[0].block_height()
+        ),
+        iterations,
+        nodes,
+    )
+    transport.close()
+    results["collect_gas_snapshot[incremental]"] = _result(latencies, cpu_sec, wall_sec, nodes)
+
+    transport = HttpTransport()
+    latencies, cpu_sec, wall_sec = _measure(
+        lambda: collect_oracle_snapshot(oracle_cfg, transport), iterations, [oracle]
+    )
+    transport.close()
+    results["collect_oracle_snapshot"] = _result(latencies, cpu_sec, wall_sec, [oracle])
+
+    multi_cfg = dict(oracle_cfg, asset_pairs=MULTI_ASSET_PAIRS)
+    multi_cfg.pop("asset_pair", None)
+    transport = HttpTransport(default_pool_maxsize=multi_cfg.get("max_concurrency", 4))
+    latencies, cpu_sec, wall_sec = _measure(
+        lambda: collect_oracle_snapshots(multi_cfg, transport), iterations, [oracle]
+    )
+    transport.close()
+    name = f"collect_oracle_snapshots[{len(MULTI_ASSET_PAIRS)} pairs]"
+    results[name] = _result(latencies, cpu_sec, wall_sec, [oracle])
+    return results
+
+
+def bench_run(config, nodes, oracle, record_path=None, replay_path=None):
+    """
+    Drive cli.run() and time its ticks. Live runs tick far faster than the
+    shipped oracle rate limit, so they go without it (the scenarios script
+    their own limits); a replay keeps it and must not be slowed by it.
+    """
+    servers = nodes + [oracle]
+    for server in servers:
+        server.reset_stats()
+    if replay_path is None:
+        config = copy.deepcopy(config)
+        config["parsed"]["oracle.yaml"]["oracle"].pop("rate_limit_rps", None)
+
+    root_logger = logging.getLogger()
+    saved_handlers, saved_level = root_logger.handlers, root_logger.level
+    collector = _TickCollector()
+    root_logger.handlers = [collector]
+    root_logger.setLevel(logging.INFO)
+
+    cpu_start = time.process_time()
+    wall_start = time.monotonic()
+    try:
+        cli.run(config, record_path=record_path, replay_path=replay_path)
+    finally:
+        root_logger.handlers = saved_handlers
+        root_logger.setLevel(saved_level)
+    return _result(
+        collector.durations_ms,
+        time.process_time() - cpu_start,
+        time.monotonic() - wall_start,
+        servers,
+    )
+
+
+def run_scenario(scenario, validated, ticks, iterations, interval_sec, trace_memory):
+    nodes, oracle = start_servers(scenario)
+    try:
+        config = bench_config(validated, nodes, oracle, ticks, interval_sec)
+        if trace_memory:
+            tracemalloc.start()
+        results = bench_engines(config, nodes, oracle, iterations)
+        results["run"] = bench_run(config, nodes, oracle)
+        with tempfile.TemporaryDirectory() as tmp:
+            capture_path = str(Path(tmp) / "capture.ndjson")
+            results["run[record]"] = bench_run(config, nodes, oracle, record_path=capture_path)
+            results["run[replay]"] = bench_run(config, nodes, oracle, replay_path=capture_path)
+        if trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results["run"]["py_heap_peak_kb"] = peak // 1024
+        return results
+    finally:
+        for server in nodes + [oracle]:
+            server.stop()
+
+
+def print_results(scenario, results, baseline=None):
+    print(f"\n== {scenario}")
+    print(
+        f"  {'benchmark':<36}{'n':>5}{'p50':>9}{'p95':>9}{'p99':>9}"
+        f"{'req/it':>8}{'rpc/it':>8}{'cpu ms':>9}{'rss MB':>8}"
+    )
+    for name, r in results.items():
+        line = (
+            f"  {name:<36}{r['iterations']:>5}{r['p50_ms'] or 0:>9.1f}{r['p95_ms'] or 0:>9.1f}"
+            f"{r['p99_ms'] or 0:>9.1f}{r['requests_per_iter']:>8.2f}{r['rpc_calls_per_iter']:>8.2f}"
+            f"{r['cpu_ms_per_iter']:>9.2f}{r['max_rss_kb'] / 1024:>8.1f}"
+        )
+        previous = (baseline or {}).get(scenario, {}).get(name)
+        if previous and previous.get("p95_ms"):
+            change = (r["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100
+            line += f"  p95 {change:+.0f}%"
+        print(line)
+
+
+def regressions(results, baseline, threshold_pct):
+    found = []
+    for scenario, benchmarks in results.items():
+        for name, r in benchmarks.items():
+            previous = baseline.get(scenario, {}).get(name)
+            if not previous or not previous.get("p95_ms") or r["p95_ms"] is None:
+                continue
+            change = (r["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100
+            if change > threshold_pct:
+                found.append(f"{scenario}/{name}: p95 {previous['p95_ms']}ms -> {r['p95_ms']}ms")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gearbox offline benchmarks")
+    parser.add_argument("--scenario", "-s", action="append", choices=sorted(SCENARIOS))
+    parser.add_argument("--ticks", "-t", type=int, default=DEFAULT_TICKS)
+    parser.add_argument("--iterations", "-n", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--interval", type=float, default=DEFAULT_INTERVAL_SEC,
+                        help="Tick interval for the run() benchmark, in seconds")
+    parser.add_argument("--tracemalloc", action="store_true",
+                        help="Also report the Python heap peak (slows the run)")
+    parser.add_argument("--json", metavar="PATH", help="Write results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="Compare against saved JSON results")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_PCT,
+                        help="p95 increase (percent) reported as a regression")
+    args = parser.parse_args()
+
+    validated = validate(Path(cli.CONFIGDIR))
+    if not validated["ok"]:
+        print("[!] Configuration invalid:")
+        for error in validated["errors"]:
+            print(f"    - {error}")
+        sys.exit(cli.EXIT_VALIDATION_FAILED)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {}
+    for scenario in args.scenario or list(SCENARIOS):
+        results[scenario] = run_scenario(
+            scenario, validated, args.ticks, args.iterations, args.interval, args.tracemalloc
+        )
+        print_results(scenario, results[scenario], baseline)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n[+] Results written to {args.json}")
+
+    if baseline is not None:
+        found = regressions(results, baseline, args.threshold)
+        if found:
+            print(f"\n[!] p95 regressions above {args.threshold:g}%:")
+            for line in found:
+                print(f"    - {line}")
+            sys.exit(cli.EXIT_ERROR)
+        print("\n[+] No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+Cold-start benchmarks: import time and `cli.py --validate` wall time.
+
+    python -m bench.startup                     default runs
+    python -m bench.startup -n 50 --json s.json save results
+    python -m bench.startup --compare s.json    compare against saved results
+
+Every run is a fresh interpreter in a scratch directory that links the
+repo's config/, so logs and the compiled config cache stay out of the tree.
+`validate (cold)` clears the config cache before each run, `validate
+(cached)` keeps it, and `python -c pass` is the interpreter's own floor.
+The import report lists the slowest modules `import cli` imports directly
+(`-X importtime`, cumulative).
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cli
+from bench.bench import DEFAULT_REGRESSION_PCT, percentile, regressions
+
+REPO = Path(__file__).resolve().parent.parent
+DEFAULT_RUNS = 20
+DEFAULT_TOP_IMPORTS = 12
+
+
+def _time_run(argv, cwd) -> float:
+    started = time.perf_counter()
+    subprocess.run(argv, cwd=cwd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - started) * 1000
+
+
+def _result(wall_ms):
+    return {
+        "iterations": len(wall_ms),
+        "p50_ms": percentile(wall_ms, 50),
+        "p95_ms": percentile(wall_ms, 95),
+        "min_ms": round(min(wall_ms), 1),
+    }
+
+
+def bench_startup(runs):
+    workdir = Path(tempfile.mkdtemp(prefix="gearbox-startup-"))
+    try:
+        (workdir / "config").symlink_to(REPO / "config", target_is_directory=True)
+        cache_dir = workdir / cli.CACHEDIR
+        validate_argv = [sys.executable, str(REPO / "cli.py"), "--validate"]
+        cases = {
+            "python -c pass": ([sys.executable, "-c", "pass"], False),
+            "validate (cold)": (validate_argv, True),
+            "validate (cached)": (validate_argv, False),
+        }
+
+        # Warm the OS page cache and the compiled config cache once
+        _time_run(validate_argv, workdir)
+
+        results = {}
+        for name, (argv, cold) in cases.items():
+            wall_ms = []
+            for _ in range(runs):
+                if cold:
+                    shutil.rmtree(cache_dir, ignore_errors=True)
+                wall_ms.append(_time_run(argv, workdir))
+            results[name] = _result(wall_ms)
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def import_times(top):
+    """Cumulative import time of `cli` and of its slowest direct imports, in ms."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import cli"],
+        cwd=REPO, check=True, capture_output=True, text=True,
+    )
+    entries = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        # Imports are listed after their own imports, indented two spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), int(cumulative_us) / 1000, depth))
+
+    # The modules cli imports directly: the depth-1 entries just before it
+    end = max(i for i, (name, _, depth) in enumerate(entries) if name == "cli" and depth == 0)
+    start = max((i for i in range(end) if entries[i][2] == 0), default=-1) + 1
+    total_ms = entries[end][1]
+    slowest = sorted(
+        ((name, ms) for name, ms, depth in entries[start:end] if depth == 1),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:top]
+    return total_ms, slowest
+
+
+def print_results(results, total_import_ms, slowest, baseline=None):
+    print("\n== startup")
+    print(f"  {'benchmark':<36}{'n':>5}{'min':>9}{'p50':>9}{'p95':>9}")
+    for name, r in results.items():
+        line = f"  {name:<36}{r['iterations']:>5}{r['min_ms']:>9.1f}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}"
+        previous = (baseline or {}).get("startup", {}).get(name)
+        if previous and previous.get("p95_ms"):
+            change = (r["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100
+            line += f"  p95 {change:+.0f}%"
+        print(line)
+
+    print(f"\n== import cli: {total_import_ms:.1f} ms")
+    for name, ms in slowest:
+        print(f"  {name:<36}{ms:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gearbox cold-start benchmarks")
+    parser.add_argument("--runs", "-n", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP_IMPORTS,
+                        help="Number of slowest imports to list")
+    parser.add_argument("--json", metavar="PATH", help="Write results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="Compare against saved JSON results")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_PCT,
+                        help="p95 increase (percent) reported as a regression")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {"startup": bench_startup(args.runs)}
+    total_import_ms, slowest = import_times(args.top)
+    print_results(results["startup"], total_import_ms, slowest, baseline)
+    results["imports"] = {"cli_ms": total_import_ms, "slowest": dict(slowest)}
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n[+] Results written to {args.json}")
+
+    if baseline is not None:
+        found = regressions({"startup": results["startup"]}, baseline, args.threshold)
+        if found:
+            print(f"\n[!] p95 regressions above {args.threshold:g}%:")
+            for line in found:
+                print(f"    - {line}")
+            sys.exit(cli.EXIT_ERROR)
+        print("\n[+] No regressions")
+
+
+if __name__ == "__main__":
+    main()
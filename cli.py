@@ -5,13 +5,35 @@ import sys
 import json
 import logging
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from gearbox.validate import validate
-from gearbox.engine.market_data import evaluate_chain
-from gearbox.engine.chain_orientation import collect_chain_orientation
-from gearbox.engine.oracle import collect_oracle_snapshot
-from gearbox.engine.reconciliation import reconcile
-from gearbox.health import RuntimeHealth
+from gearbox.agent.schema import Record, json_default
+from gearbox.breaker import CLOSED
+from gearbox.config_cache import load_config
+from gearbox.deadline import (
+    DEFAULT_BACKOFF_MS,
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_MAX_BACKOFF_MS,
+    DEFAULT_RETRY_BUDGET,
+    Deadline,
+)
+from gearbox.health import DEFAULT_MIN_WINDOW_TICKS, DEFAULT_WINDOW_TICKS, RuntimeHealth
+from gearbox.logqueue import LogWriter, QueueingHandler, StreamSink, set_current_tick
+from gearbox.logsegments import SegmentedLogSink
+from gearbox.ratelimit import TokenBucket
+from gearbox.scheduler import (
+    DEFAULT_BLOCK_OFFSET_SEC,
+    DEFAULT_MIN_INTERVAL_SEC,
+    FIXED,
+    SKIP,
+    TickScheduler,
+)
+from gearbox.stages import Stage, run_stages
+from gearbox.trace import span, tracer
+
+# The engines, transports, capture and metrics server pull in requests, ssl
+# and http.server, so they are imported where they are first used rather
+# than here: --validate (and a cached-config start) never loads them.
 
 BANNER = r"""
 #########################################################
@@ -32,6 +54,7 @@ BANNER = r"""
 VERSION = "0.4.1"
 LOGDIR = "./logs"
 CONFIGDIR = "./config"
+CACHEDIR = "./.cache"
 
 # Exit Codes
 EXIT_OK = 0
@@ -48,6 +71,10 @@ class GearboxArgumentParser(argparse.ArgumentParser):
 
 # Logging
 class JsonFormatter(logging.Formatter):
+    def __init__(self, indent=None):
+        super().__init__()
+        self.indent = indent
+
     def format(self, record):
         payload = {
             "timestamp": datetime.datetime.utcfromtimestamp(record.created).isoformat() + "Z",
@@ -55,13 +82,31 @@ class JsonFormatter(logging.Formatter):
             "message": record.getMessage(),
         }
 
+        if getattr(record, "tick", None) is not None:
+            payload["tick"] = record.tick
+
+        # Set on records forwarded from supervised worker processes
+        if getattr(record, "worker", None) is not None:
+            payload["worker"] = record.worker
+
+        data = getattr(record, "data", None)
+        if self.indent is None and isinstance(data, Record) and not (record.exc_info or record.exc_text):
+            # Snapshot records write their own JSON; splice it in directly
+            head = json.dumps(payload, separators=(",", ":"), sort_keys=False)
+            return head[:-1] + ',"data":' + data.to_json() + "}"
+
         if hasattr(record, "data"):
             payload["data"] = record.data
 
         if record.exc_info:
             payload["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            payload["exception"] = record.exc_text
 
-        return json.dumps(payload, indent=2, sort_keys=False)
+        if self.indent is None:
+            # One record per line (NDJSON)
+            return json.dumps(payload, separators=(",", ":"), sort_keys=False, default=json_default)
+        return json.dumps(payload, indent=self.indent, sort_keys=False, default=json_default)
 
 # Argument Parsing
 def parse_args():
@@ -91,16 +136,53 @@ def parse_args():
         action="store_true",
         help="Validate configuration files and exit"
     )
+    capture = parser.add_mutually_exclusive_group()
+    capture.add_argument(
+        "--record",
+        metavar="CAPTURE",
+        help="Record raw RPC and oracle HTTP responses to a capture file"
+    )
+    capture.add_argument(
+        "--replay",
+        metavar="CAPTURE",
+        help="Replay a capture file through the engines as fast as possible, without network access"
+    )
+    parser.add_argument(
+        "--no-config-cache",
+        action="store_true",
+        help="Validate the configuration files even if they are unchanged since the last start"
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="TRACE",
+        help="Write per-tick timing spans to a Chrome trace-event file"
+    )
     return parser.parse_args()
 
 # Functions
 def get_run_timestamp():
-    return datetime.datetime.now().strftime("%m%d%y%H%M")
+    # Second resolution plus pid so runs started close together never share logs
+    return f"{datetime.datetime.now():%m%d%y%H%M%S}-{os.getpid()}"
 
 def print_banner():
     print(BANNER.rstrip())
     print(f"Version: {VERSION}\n")
 
+def configure_logging(log_writer, segment_sink, logging_cfg):
+    log_format = logging_cfg.get("format", "ndjson")
+    log_writer.set_formatter(JsonFormatter(indent=2 if log_format == "pretty" else None))
+    log_writer.configure(
+        queue_size=logging_cfg.get("queue_size"),
+        overflow=logging_cfg.get("overflow"),
+        batch_size=logging_cfg.get("batch_size"),
+        flush_interval_ms=logging_cfg.get("flush_interval_ms"),
+    )
+    segment_sink.configure(
+        max_bytes=logging_cfg.get("segment_max_bytes"),
+        max_age_sec=logging_cfg.get("segment_max_age_sec"),
+        compress=logging_cfg.get("compress_segments"),
+    )
+
 def initialize():
     logging.info("Initialization started")
     if not os.path.exists(os.path.expanduser(LOGDIR)):
@@ -121,20 +203,718 @@ def initialize():
 
     logging.info("Initialization complete")
 
-def run(validated_config):
+def _pool_sizes(chain_defs, allowed_chains, oracle_cfg):
+    """Connection pool size configured for each RPC and oracle endpoint URL."""
+    from gearbox.engine.oracle import DEFAULT_MAX_CONCURRENCY, oracle_pairs
+    from gearbox.transport import DEFAULT_POOL_MAXSIZE
+
+    pool_sizes = {}
+    for chain_name in allowed_chains:
+        for network_cfg in chain_defs[chain_name].get("networks", {}).values():
+            pool_maxsize = network_cfg.get("http_pool_maxsize")
+            if pool_maxsize is None:
+                continue
+            for rpc in network_cfg.get("rpc_endpoints", []):
+                pool_sizes[rpc] = pool_maxsize
+
+    # Concurrent pair fetches each need their own keep-alive connection
+    pool_maxsize = oracle_cfg.get("http_pool_maxsize")
+    if len(oracle_pairs(oracle_cfg)) > 1:
+        concurrency = oracle_cfg.get("max_concurrency", DEFAULT_MAX_CONCURRENCY)
+        pool_maxsize = max(pool_maxsize or DEFAULT_POOL_MAXSIZE, concurrency)
+    endpoint_url = oracle_cfg.get("endpoint_url")
+    if pool_maxsize is not None and endpoint_url:
+        pool_sizes[endpoint_url] = pool_maxsize
+
+    return pool_sizes
+
+def build_transport(chain_defs, allowed_chains, oracle_cfg):
+    from gearbox.transport import HttpTransport
+
+    transport = HttpTransport()
+    for url, pool_maxsize in _pool_sizes(chain_defs, allowed_chains, oracle_cfg).items():
+        transport.configure_host(url, pool_maxsize)
+    return transport
+
+def build_selectors(chain_defs, allowed_chains, adaptive=True):
+    from gearbox.endpoints import (
+        DEFAULT_BREAKER_FAILURE_THRESHOLD,
+        DEFAULT_BREAKER_RESET_SEC,
+        EndpointSelector,
+    )
+
+    selectors = {}
+    for chain_name in allowed_chains:
+        chain_cfg = chain_defs[chain_name]
+        network_cfg = chain_cfg.get("networks", {}).get(chain_cfg.get("default_network"))
+        if not network_cfg or not network_cfg.get("rpc_endpoints"):
+            continue
+        selectors[chain_name] = EndpointSelector(
+            network_cfg["rpc_endpoints"],
+            hedge_percentile=network_cfg.get("hedge_percentile"),
+            hedge_min_delay_ms=network_cfg.get("hedge_min_delay_ms", 0),
+            breaker_failure_threshold=network_cfg.get(
+                "breaker_failure_threshold", DEFAULT_BREAKER_FAILURE_THRESHOLD
+            ),
+            breaker_reset_sec=network_cfg.get("breaker_reset_sec", DEFAULT_BREAKER_RESET_SEC),
+            adaptive=adaptive,
+        )
+    return selectors
+
+def build_fee_windows(chain_defs, allowed_chains):
+    """Fee history window per chain whose default network enables `fee_history`."""
+    from gearbox.engine.gas import DEFAULT_MAX_BLOCKS_PER_CALL, DEFAULT_WINDOW_BLOCKS, FeeWindow
+
+    fee_windows = {}
+    for chain_name in allowed_chains:
+        chain_cfg = chain_defs[chain_name]
+        network_cfg = chain_cfg.get("networks", {}).get(chain_cfg.get("default_network"))
+        if not network_cfg or not network_cfg.get("fee_history", False):
+            continue
+        fee_windows[chain_name] = FeeWindow(
+            network_cfg.get("fee_window_blocks", DEFAULT_WINDOW_BLOCKS),
+            network_cfg.get("fee_max_blocks_per_call", DEFAULT_MAX_BLOCKS_PER_CALL),
+        )
+    return fee_windows
+
+def build_head_streams(chain_defs, allowed_chains):
+    """Start a newHeads subscription for each allowed chain that enables one."""
+    from gearbox.engine.head_stream import DEFAULT_STALE_SEC, HeadSubscription
+
+    streams = {}
+    for chain_name in allowed_chains:
+        chain_cfg = chain_defs[chain_name]
+        network_cfg = chain_cfg.get("networks", {}).get(chain_cfg.get("default_network"))
+        if not network_cfg or not network_cfg.get("head_stream") or not network_cfg.get("ws_endpoint"):
+            continue
+        block_time_sec = network_cfg.get("block_time_sec")
+        stale_sec = network_cfg.get(
+            "stream_stale_sec", 3 * block_time_sec if block_time_sec else DEFAULT_STALE_SEC
+        )
+        streams[chain_name] = HeadSubscription(
+            network_cfg["ws_endpoint"],
+            expected_chain_id=network_cfg.get("chain_id"),
+            stale_sec=stale_sec,
+            connect_timeout_sec=network_cfg.get("rpc_timeout_sec", 5),
+            name=f"gearbox-heads-{chain_name}",
+        ).start()
+    return streams
+
+def build_oracle_limiter(oracle_cfg):
+    rate = oracle_cfg.get("rate_limit_rps")
+    if rate is None:
+        return None
+    return TokenBucket(rate, oracle_cfg.get("rate_limit_burst", 1))
+
+def new_tick_deadline(tick_deadline_sec, retry_cfg, realtime=True):
+    """The deadline and RPC retry budget one tick's chain stages share."""
+    return Deadline(
+        tick_deadline_sec,
+        retry_budget=retry_cfg.get("budget_per_tick", DEFAULT_RETRY_BUDGET),
+        max_attempts=retry_cfg.get("max_attempts", DEFAULT_MAX_ATTEMPTS),
+        backoff_ms=retry_cfg.get("backoff_ms", DEFAULT_BACKOFF_MS),
+        max_backoff_ms=retry_cfg.get("max_backoff_ms", DEFAULT_MAX_BACKOFF_MS),
+        realtime=realtime,
+    )
+
+def build_oracle_cache(oracle_cfg):
+    from gearbox.engine.oracle_cache import DEFAULT_MAX_ENTRIES, OracleCache
+
+    cache_cfg = oracle_cfg.get("cache")
+    if not cache_cfg:
+        return None
+    return OracleCache(
+        cache_cfg["ttl_sec"],
+        max_entries=cache_cfg.get("max_entries", DEFAULT_MAX_ENTRIES),
+        pair_ttl_sec=cache_cfg.get("pair_ttl_sec"),
+    )
+
+def build_oracle_executor(oracle_cfg):
+    """Pool for fetching asset pairs concurrently; None for a single pair."""
+    from gearbox.engine.oracle import DEFAULT_MAX_CONCURRENCY, oracle_pairs
+
+    if len(oracle_pairs(oracle_cfg)) <= 1:
+        return None
+    return ThreadPoolExecutor(
+        max_workers=oracle_cfg.get("max_concurrency", DEFAULT_MAX_CONCURRENCY),
+        thread_name_prefix="gearbox-oracle",
+    )
+
+def _stream_settings(chain_cfg):
+    network_cfg = chain_cfg.get("networks", {}).get(chain_cfg.get("default_network")) or {}
+    return tuple(
+        network_cfg.get(field)
+        for field in (
+            "head_stream", "ws_endpoint", "stream_stale_sec", "block_time_sec",
+            "chain_id", "rpc_timeout_sec",
+        )
+    )
+
+def _fee_settings(chain_cfg):
+    network_cfg = chain_cfg.get("networks", {}).get(chain_cfg.get("default_network")) or {}
+    return (
+        chain_cfg.get("default_network"),
+        network_cfg.get("fee_history"),
+        network_cfg.get("fee_window_blocks"),
+        network_cfg.get("fee_max_blocks_per_call"),
+    )
+
+def reload_chains(old_defs, new_defs, allowed_chains, selectors, head_streams, live,
+                  fee_windows=None):
+    """
+    Apply a reloaded chain.yaml between ticks, touching only chains whose
+    config changed. Their endpoint selector is rebuilt from the new
+    endpoints but keeps the history and breakers of endpoints it shares
+    with the old one; their head stream restarts and their fee window is
+    refilled only if its own settings changed. `selectors`, `head_streams`
+    and `fee_windows` are updated in place. Head streams and adaptive
+    endpoint selection only apply when `live` (not capturing).
+    """
+    changed = [name for name in allowed_chains if old_defs.get(name) != new_defs.get(name)]
+
+    rebuilt = build_selectors(new_defs, changed, adaptive=live)
+    for chain_name in changed:
+        previous = selectors.pop(chain_name, None)
+        selector = rebuilt.get(chain_name)
+        if selector is None:
+            continue
+        if previous is not None:
+            selector.inherit(previous)
+        selectors[chain_name] = selector
+
+    if live:
+        for chain_name in changed:
+            old_settings = _stream_settings(old_defs.get(chain_name, {}))
+            if old_settings == _stream_settings(new_defs[chain_name]):
+                continue
+            stream = head_streams.pop(chain_name, None)
+            if stream is not None:
+                stream.close()
+            head_streams.update(build_head_streams(new_defs, [chain_name]))
+
+    if fee_windows is not None:
+        for chain_name in changed:
+            if _fee_settings(old_defs.get(chain_name, {})) == _fee_settings(new_defs[chain_name]):
+                continue
+            fee_windows.pop(chain_name, None)
+            fee_windows.update(build_fee_windows(new_defs, [chain_name]))
+
+    return changed
+
+def reload_oracle(old_cfg, new_cfg, limiter, cache, executor, cache_enabled):
+    """
+    Apply a reloaded oracle.yaml between ticks. The rate limiter, cache and
+    pair pool are rebuilt only if their own settings changed, so a bucket
+    that is backing off or a warm cache survives unrelated edits. Returns
+    (limiter, cache, executor).
+    """
+    def changed(*fields):
+        return any(old_cfg.get(field) != new_cfg.get(field) for field in fields)
+
+    if changed("rate_limit_rps", "rate_limit_burst"):
+        limiter = build_oracle_limiter(new_cfg)
+    if cache_enabled and changed("cache", "provider", "endpoint_url"):
+        cache = build_oracle_cache(new_cfg)
+    if changed("asset_pair", "asset_pairs", "max_concurrency"):
+        if executor is not None:
+            executor.shutdown(wait=False)
+        executor = build_oracle_executor(new_cfg)
+    return limiter, cache, executor
+
+def apply_pool_sizes(transport, old_sizes, new_sizes):
+    """Resize only the pools whose size changed; other hosts keep their warm connections."""
+    for url, pool_maxsize in new_sizes.items():
+        if old_sizes.get(url) != pool_maxsize:
+            transport.configure_host(url, pool_maxsize)
+
+def _reference_snapshot(oracle_snapshots):
+    """The first configured pair's snapshot, which reconciliation runs against."""
+    if not oracle_snapshots:
+        return None
+    return next(iter(oracle_snapshots.values()))
+
+def _reconcile_stage(reconciliation_cfg):
+    from gearbox.engine.reconciliation import reconcile
+
+    def stage(*inputs):
+        *chain_results, oracle_snapshots = inputs
+        oracle_snapshot = _reference_snapshot(oracle_snapshots)
+        last_chain_snapshot = None
+        for chain_result in chain_results:
+            if chain_result is None:
+                continue
+            _, orientation = chain_result
+            if orientation is not None and orientation["success"]:
+                last_chain_snapshot = orientation
+        if last_chain_snapshot is None:
+            return None
+        if oracle_snapshot is None:
+            oracle_snapshot = {"success": False}
+        return (
+            last_chain_snapshot["chain"],
+            reconcile(last_chain_snapshot, oracle_snapshot, reconciliation_cfg),
+        )
+    return stage
+
+def _observed_head(observed):
+    """Block height from a chain stage's (reachability, orientation), or None."""
+    orientation = observed[1] if observed is not None else None
+    if orientation is None or not orientation["success"]:
+        return None
+    return orientation["block_height"]
+
+def build_tick_stages(allowed_chains, chain_defs, oracle_cfg, reconciliation_cfg,
+                      transport, selectors, stage_timeouts, block_cache=None, head_streams=None,
+                      oracle_limiter=None, oracle_executor=None, oracle_cache=None, deadline=None,
+                      fee_windows=None):
+    """
+    Build the per-tick stage graph.
+
+    Chain probes and the oracle fetch are independent and run concurrently;
+    reconciliation waits for all of them. The oracle stage fetches all
+    asset pairs on `oracle_executor` and yields {asset_pair: snapshot}.
+    With no `oracle_cfg` (supervised workers other than the first) only the
+    chain stages are built. Chain and oracle stages pass the tick
+    `deadline`, narrowed to their own stage timeout, down into every RPC
+    and oracle request. Chains with a fee
+    window get a gas stage that runs after their chain stage, so it knows
+    the head it should fetch fee history up to.
+    """
+    from gearbox.engine.chain_orientation import observe_chain
+    from gearbox.engine.gas import collect_gas_snapshot
+    from gearbox.engine.oracle import collect_oracle_snapshots
+
+    def within(timeout_sec):
+        return deadline.within(timeout_sec) if deadline is not None else None
+
+    head_streams = head_streams or {}
+    fee_windows = fee_windows or {}
+    stages = []
+    for chain_name in allowed_chains:
+        stages.append(Stage(
+            f"chain:{chain_name}",
+            lambda name=chain_name: observe_chain(
+                name, chain_defs[name], transport, selectors.get(name), block_cache,
+                head_streams.get(name), within(stage_timeouts.get("chain")),
+            ),
+            timeout_sec=stage_timeouts.get("chain"),
+        ))
+
+        if chain_name in fee_windows:
+            stages.append(Stage(
+                f"gas:{chain_name}",
+                lambda observed, name=chain_name: collect_gas_snapshot(
+                    name, chain_defs[name], fee_windows[name], transport, selectors.get(name),
+                    _observed_head(observed), within(stage_timeouts.get("gas")),
+                ),
+                inputs=[f"chain:{chain_name}"],
+                timeout_sec=stage_timeouts.get("gas"),
+                allow_failed_inputs=True,
+            ))
+
+    if oracle_cfg is None:
+        return stages
+
+    stages.append(Stage(
+        "oracle",
+        lambda: collect_oracle_snapshots(
+            oracle_cfg, transport, oracle_limiter, oracle_executor, oracle_cache,
+            within(stage_timeouts.get("oracle")),
+        ),
+        timeout_sec=stage_timeouts.get("oracle"),
+    ))
+
+    stages.append(Stage(
+        "reconcile",
+        _reconcile_stage(reconciliation_cfg),
+        inputs=[f"chain:{name}" for name in allowed_chains] + ["oracle"],
+        timeout_sec=stage_timeouts.get("reconcile"),
+        allow_failed_inputs=True,
+    ))
+
+    return stages
+
+def record_tick(store, tick, allowed_chains, outcomes):
+    observed_epoch = time.time()
+
+    for chain_name in allowed_chains:
+        outcome = outcomes[f"chain:{chain_name}"]
+        if outcome.ok and outcome.value[1] is not None:
+            store.record_chain(tick, observed_epoch, outcome.value[1])
+
+        gas = outcomes.get(f"gas:{chain_name}")
+        if gas is not None and gas.ok:
+            store.record_gas(tick, observed_epoch, gas.value)
+
+    oracle = outcomes.get("oracle")
+    if oracle is not None and oracle.ok:
+        for snapshot in oracle.value.values():
+            store.record_oracle(tick, observed_epoch, snapshot)
+
+        reconciled = outcomes["reconcile"]
+        if reconciled.ok and reconciled.value is not None:
+            chain_name, reconciliation = reconciled.value
+            store.record_reconciliation(
+                tick, observed_epoch, chain_name,
+                _reference_snapshot(oracle.value)["asset"], reconciliation,
+            )
+
+    store.flush()
+
+def report_outcomes(allowed_chains, outcomes):
+    """Log the tick's stage outcomes and return (evaluation_failed, failure_reason)."""
+    evaluation_failed = False
+    failure_reason = None
+
+    for chain_name in allowed_chains:
+        outcome = outcomes[f"chain:{chain_name}"]
+        if not outcome.ok:
+            logging.warning(
+                "Chain stage failed",
+                extra={"data": {"chain": chain_name, "error": str(outcome.error)}},
+            )
+            evaluation_failed = True
+            failure_reason = f"Chain stage failed: {chain_name}"
+            continue
+
+        result, orientation = outcome.value
+
+        if result["reachable"]:
+            logging.info("Chain reachable", extra={"data": result})
+            if orientation["success"]:
+                logging.info("Chain orientation", extra={"data": orientation})
+            else:
+                logging.warning("Chain orientation failed", extra={"data": orientation})
+                evaluation_failed = True
+                failure_reason = f"Chain orientation failed: {chain_name}"
+        else:
+            logging.warning("Chain unreachable", extra={"data": result})
+            evaluation_failed = True
+            failure_reason = f"Chain unreachable: {chain_name}"
+
+    # Fee history enriches the tick; like the oracle, a miss does not fail it
+    for chain_name in allowed_chains:
+        outcome = outcomes.get(f"gas:{chain_name}")
+        if outcome is None:
+            continue
+        if not outcome.ok:
+            logging.warning(
+                "Gas stage failed",
+                extra={"data": {"chain": chain_name, "error": str(outcome.error)}},
+            )
+        elif outcome.value["success"]:
+            logging.info("Gas fees", extra={"data": outcome.value})
+        else:
+            logging.warning("Gas fee history failed", extra={"data": outcome.value})
+
+    outcome = outcomes.get("oracle")
+    if outcome is None:
+        return evaluation_failed, failure_reason
+    if not outcome.ok:
+        logging.warning("Oracle stage failed", extra={"data": {"error": str(outcome.error)}})
+    else:
+        for snapshot in outcome.value.values():
+            if snapshot["success"]:
+                logging.info("Oracle snapshot", extra={"data": snapshot})
+            else:
+                logging.warning("Oracle snapshot failed", extra={"data": snapshot})
+
+    outcome = outcomes["reconcile"]
+    if not outcome.ok:
+        logging.warning("Reconciliation stage failed", extra={"data": {"error": str(outcome.error)}})
+        evaluation_failed = True
+        failure_reason = "Reconciliation stage failed"
+    elif outcome.value is not None:
+        reconciled_chain, reconciliation = outcome.value
+        logging.info("Reconciliation", extra={"data": reconciliation})
+        if reconciliation["status"] == "degraded":
+            evaluation_failed = True
+            failure_reason = "degraded"
+        elif reconciliation["status"] == "unavailable":
+            evaluation_failed = True
+            failure_reason = "unavailable"
+
+    return evaluation_failed, failure_reason
+
+def publish_metrics(metrics, tick, duration_ms, evaluation_failed, health, scheduler,
+                    allowed_chains, outcomes, transport, selectors, block_cache, head_streams=None,
+                    oracle_cache=None, deadline=None):
+    health_snapshot = health.snapshot()
+
+    metrics.inc("gearbox_ticks_total")
+    if evaluation_failed:
+        metrics.inc("gearbox_tick_failures_total")
+    metrics.observe("gearbox_tick_duration_seconds", duration_ms / 1000)
+
+    metrics.set("gearbox_tick_interval_seconds", scheduler.last_interval_sec)
+    metrics.set("gearbox_block_interval_seconds", scheduler.block_interval_sec)
+
+    metrics.set("gearbox_healthy", health.healthy)
+    metrics.set("gearbox_paused", health.paused)
+    metrics.set("gearbox_halted", health.halted)
+    metrics.set("gearbox_consecutive_failures", health.consecutive_failures)
+    metrics.set("gearbox_warnings_total", health.total_warnings)
+    window = health_snapshot["window"]
+    metrics.set("gearbox_window_failure_rate", window["failure_rate"])
+    for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+        if window[key] is not None:
+            metrics.set("gearbox_window_tick_latency_seconds", window[key] / 1000, quantile=quantile)
+    metrics.set("gearbox_degraded_seconds_total", health_snapshot["degraded_sec"])
+
+    chains = {}
+    gas = {}
+    for chain_name in allowed_chains:
+        outcome = outcomes[f"chain:{chain_name}"]
+        orientation = outcome.value[1] if outcome.ok else None
+        chains[chain_name] = orientation
+        success = orientation is not None and orientation["success"]
+        metrics.set("gearbox_chain_success", success, chain=chain_name)
+        if success:
+            metrics.set("gearbox_chain_block_height", orientation["block_height"], chain=chain_name)
+            metrics.set("gearbox_chain_gas_price_wei", orientation["gas_price"], chain=chain_name)
+
+        outcome = outcomes.get(f"gas:{chain_name}")
+        if outcome is None:
+            continue
+        snapshot = outcome.value if outcome.ok else None
+        gas[chain_name] = snapshot
+        if snapshot is None or not snapshot["success"]:
+            continue
+        metrics.inc("gearbox_fee_history_blocks_total", snapshot["blocks_fetched"], chain=chain_name)
+        metrics.set("gearbox_gas_base_fee_wei", snapshot["base_fee"], chain=chain_name)
+        if snapshot["next_base_fee"] is not None:
+            metrics.set("gearbox_gas_next_base_fee_wei", snapshot["next_base_fee"], chain=chain_name)
+        for pct in ("10", "50", "90"):
+            value = snapshot[f"priority_fee_p{pct}"]
+            if value is not None:
+                metrics.set("gearbox_gas_priority_fee_wei", value, chain=chain_name, percentile=pct)
+        metrics.set("gearbox_gas_used_ratio", snapshot["gas_used_ratio"], chain=chain_name)
+
+    oracle_outcome = outcomes.get("oracle")
+    oracle = oracle_outcome.value if oracle_outcome is not None and oracle_outcome.ok else None
+    for asset, snapshot in (oracle or {}).items():
+        metrics.set("gearbox_oracle_success", snapshot["success"], asset=asset)
+        if snapshot["success"]:
+            metrics.set("gearbox_oracle_price", snapshot["price"], asset=asset)
+        if snapshot["latency_ms"] is not None:
+            metrics.set("gearbox_oracle_latency_seconds", snapshot["latency_ms"] / 1000, asset=asset)
+        if snapshot["rate_limited"]:
+            metrics.inc("gearbox_oracle_rate_limited_total", snapshot["rate_limited"], asset=asset)
+        metrics.set("gearbox_oracle_cache_age_seconds", (snapshot["cache_age_ms"] or 0) / 1000, asset=asset)
+
+    if oracle_cache is not None:
+        cache_stats = oracle_cache.snapshot()
+        metrics.set("gearbox_oracle_cache_hits_total", cache_stats["hits"] + cache_stats["coalesced"])
+        metrics.set("gearbox_oracle_cache_misses_total", cache_stats["misses"])
+
+    reconciliation = None
+    reconciled = outcomes.get("reconcile")
+    if reconciled is not None and reconciled.ok and reconciled.value is not None:
+        chain_name, reconciliation = reconciled.value
+        if oracle:
+            metrics.set(
+                "gearbox_reconciliation_delta_seconds", reconciliation.get("delta_sec"),
+                chain=chain_name, asset=_reference_snapshot(oracle)["asset"],
+            )
+
+    for chain_name, selector in selectors.items():
+        for endpoint, breaker in selector.breaker_states().items():
+            metrics.set(
+                "gearbox_breaker_open", breaker["state"] != CLOSED,
+                chain=chain_name, endpoint=endpoint,
+            )
+
+    if deadline is not None:
+        deadline_stats = deadline.snapshot()
+        metrics.inc("gearbox_rpc_retries_total", deadline_stats["retries"])
+        metrics.inc("gearbox_rpc_retries_denied_total", deadline_stats["retries_denied"])
+
+    cache_stats = block_cache.snapshot()
+    metrics.set("gearbox_block_cache_hits_total", cache_stats["hits"])
+    metrics.set("gearbox_block_cache_misses_total", cache_stats["misses"])
+    metrics.set("gearbox_block_cache_mispredictions_total", cache_stats["mispredictions"])
+
+    for chain_name, stream in (head_streams or {}).items():
+        stream_stats = stream.snapshot()
+        metrics.set("gearbox_head_stream_connected", stream_stats["connected"], chain=chain_name)
+        metrics.set("gearbox_head_stream_heads_total", stream_stats["heads"], chain=chain_name)
+
+    transport_stats = transport.stats()
+    for host, host_stats in transport_stats.get("hosts", {}).items():
+        metrics.set("gearbox_http_requests_total", host_stats["requests"], host=host)
+        metrics.set("gearbox_http_connections_opened_total", host_stats["connections"], host=host)
+
+    metrics.update_status(
+        tick=tick,
+        tick_duration_ms=duration_ms,
+        health=health_snapshot,
+        chains=chains,
+        gas=gas,
+        oracle=oracle,
+        reconciliation=reconciliation,
+    )
+
+def build_health(health_cfg):
+    return RuntimeHealth(
+        pause_after_failures=health_cfg["pause_after_failures"],
+        halt_after_failures=health_cfg["halt_after_failures"],
+        window_ticks=health_cfg.get("window_ticks", DEFAULT_WINDOW_TICKS),
+        pause_failure_rate=health_cfg.get("pause_failure_rate"),
+        halt_failure_rate=health_cfg.get("halt_failure_rate"),
+        min_window_ticks=health_cfg.get("min_window_ticks", DEFAULT_MIN_WINDOW_TICKS),
+    )
+
+def start_metrics(metrics_cfg):
+    """Start the metrics listener if enabled; returns (registry, server), either may be None."""
+    from gearbox.metrics import DEFAULT_HOST, DEFAULT_PORT, MetricsRegistry, MetricsServer
+
+    if not metrics_cfg.get("enabled", False):
+        return None, None
+    metrics = MetricsRegistry()
+    try:
+        metrics_server = MetricsServer(
+            metrics,
+            host=metrics_cfg.get("host", DEFAULT_HOST),
+            port=metrics_cfg.get("port", DEFAULT_PORT),
+        ).start()
+        logging.info(f"Metrics listening on {metrics_server.address}")
+    except OSError as e:
+        logging.error(f"Failed to start metrics listener: {e}")
+        print(f"[!] Metrics listener disabled: {e}")
+        metrics_server = None
+    return metrics, metrics_server
+
+def log_tick_timings():
+    logging.info("Tick timings", extra={"data": tracer.end_tick()})
+
+def run(validated_config, record_path=None, replay_path=None, trace_path=None, oracle=True,
+        on_tick=None, stop_event=None):
+    """
+    Run the tick loop until max_runtime_sec, a halt, Ctrl-C or `stop_event`.
+
+    `oracle=False` leaves out the oracle and reconciliation stages,
+    `on_tick` is called with a summary of every tick, and `stop_event` is
+    checked between ticks; all are used by supervised workers
+    (gearbox/supervisor.py).
+    """
+    from gearbox.capture import RecordingTransport, ReplayTransport
+    from gearbox.engine.block_cache import BlockCache
+    from gearbox.engine.state import SnapshotStore
+    from gearbox.reload import ConfigWatcher
+
     runtime_cfg = validated_config["parsed"]["runtime.yaml"]["runtime"]
     oracle_cfg = validated_config["parsed"]["oracle.yaml"]["oracle"]
     reconciliation_cfg = runtime_cfg.get("reconciliation", {})
     health_cfg = runtime_cfg.get("health", {})
 
-    health = RuntimeHealth(
-        pause_after_failures=health_cfg["pause_after_failures"],
-        halt_after_failures=health_cfg["halt_after_failures"],
-    )
+    health = build_health(health_cfg)
 
     evaluation_interval = runtime_cfg["evaluation_interval_sec"]
     max_runtime = runtime_cfg["max_runtime_sec"]
 
+    replay = None
+    if replay_path is not None:
+        replay = ReplayTransport(replay_path)
+        transport = replay
+        logging.info(f"Replaying capture: {replay_path} ({replay.tick_count} ticks)")
+    else:
+        transport = build_transport(
+            validated_config["parsed"]["chain.yaml"]["chains"],
+            runtime_cfg.get("allowed_chains", []),
+            oracle_cfg,
+        )
+        if record_path is not None:
+            transport = RecordingTransport(transport, record_path)
+            logging.info(f"Recording capture: {record_path}")
+
+    # Captures only hold HTTP exchanges, so subscriptions stay off while
+    # recording or replaying and every tick polls. Anything that decides
+    # which requests to send from timing (block prediction, latency ranking,
+    # hedging, breaker resets) is off too, so a replay sends exactly the
+    # requests that were recorded.
+    live = replay is None and record_path is None
+
+    selectors = build_selectors(
+        validated_config["parsed"]["chain.yaml"]["chains"],
+        runtime_cfg.get("allowed_chains", []),
+        adaptive=live,
+    )
+
+    block_cache = BlockCache(predict=live)
+    fee_windows = build_fee_windows(
+        validated_config["parsed"]["chain.yaml"]["chains"],
+        runtime_cfg.get("allowed_chains", []),
+    )
+
+    head_streams = {}
+    if live:
+        head_streams = build_head_streams(
+            validated_config["parsed"]["chain.yaml"]["chains"],
+            runtime_cfg.get("allowed_chains", []),
+        )
+        for chain_name, stream in head_streams.items():
+            logging.info(f"Head subscription: {chain_name} {stream.ws_url}")
+
+    scheduler_cfg = runtime_cfg.get("scheduler", {})
+    allowed_chains = runtime_cfg.get("allowed_chains", [])
+    cadence_chain = scheduler_cfg.get("cadence_chain", allowed_chains[0] if allowed_chains else None)
+    cadence_network = {}
+    if cadence_chain is not None:
+        cadence_cfg = validated_config["parsed"]["chain.yaml"]["chains"][cadence_chain]
+        cadence_network = cadence_cfg.get("networks", {}).get(cadence_cfg.get("default_network"), {})
+    scheduler = TickScheduler(
+        evaluation_interval,
+        overrun_policy=scheduler_cfg.get("overrun_policy", SKIP),
+        realtime=replay is None,
+        mode=scheduler_cfg.get("mode", FIXED),
+        min_interval_sec=scheduler_cfg.get("min_interval_sec", DEFAULT_MIN_INTERVAL_SEC),
+        max_interval_sec=scheduler_cfg.get("max_interval_sec", evaluation_interval),
+        block_offset_sec=scheduler_cfg.get("block_offset_sec", DEFAULT_BLOCK_OFFSET_SEC),
+        block_time_sec=cadence_network.get("block_time_sec"),
+    )
+
+    executor_cfg = runtime_cfg.get("executor", {})
+    stage_timeouts = executor_cfg.get("stage_timeout_sec", {})
+    tick_deadline = executor_cfg.get("tick_deadline_sec", evaluation_interval)
+    retry_cfg = executor_cfg.get("rpc_retry", {})
+    executor = ThreadPoolExecutor(
+        max_workers=executor_cfg.get("max_workers", 8),
+        thread_name_prefix="gearbox-stage",
+    )
+
+    # Asset pairs are fetched on their own pool: the oracle stage already
+    # holds a stage worker while it waits on them.
+    oracle_limiter = None
+    oracle_cache = None
+    oracle_executor = None
+    if oracle:
+        # A replay sends nothing to the provider and must not sleep
+        if replay is None:
+            oracle_limiter = build_oracle_limiter(oracle_cfg)
+        # Like head streams, the cache stays off for captures so every
+        # tick's oracle exchange is recorded and replayed.
+        if live:
+            oracle_cache = build_oracle_cache(oracle_cfg)
+        oracle_executor = build_oracle_executor(oracle_cfg)
+
+    state_cfg = runtime_cfg.get("state", {})
+    store = None
+    if state_cfg.get("enabled", False):
+        store = SnapshotStore(state_cfg.get("data_dir", "./data"))
+
+    metrics, metrics_server = start_metrics(runtime_cfg.get("metrics", {}))
+    if metrics is not None:
+        tracer.add_listener(metrics.observe_spans)
+
+    # A replay must run against the config it was started with
+    watcher = None
+    if replay is None and runtime_cfg.get("config_reload", True):
+        watcher = ConfigWatcher(CONFIGDIR, validated_config)
+
+    if trace_path is not None:
+        tracer.open(trace_path)
+        logging.info(f"Writing trace: {trace_path}")
+
     runtime_state = {
         "start_time": datetime.datetime.now(),
         "tick_count": 0,
@@ -144,164 +924,332 @@ def run(validated_config):
     logging.info("Runtime loop started")
 
     while True:
+        try:
+            stopped = scheduler.wait(stop_event)
+        except KeyboardInterrupt:
+            if health.paused:
+                logging.info("Runtime interrupted by user during pause")
+            else:
+                logging.info("Runtime interrupted by user")
+            print("[!] Runtime interrupted by user.")
+            break
+
+        if stopped:
+            logging.info("Runtime stop requested, exiting runtime loop")
+            break
+
+        if replay is not None and replay.exhausted():
+            logging.info("Replay capture exhausted, exiting runtime loop")
+            print("[+] Replay complete.")
+            break
+
         now = datetime.datetime.now()
         runtime_state["tick_count"] += 1
         runtime_state["last_tick_time"] = now
+        set_current_tick(runtime_state["tick_count"])
+        tracer.begin_tick(runtime_state["tick_count"])
 
-        elapsed = (now - runtime_state["start_time"]).total_seconds()
-        last_chain_snapshot = None
+        # Config edits are applied here, between ticks, so a tick never
+        # sees a mix of old and new config.
+        if watcher is not None:
+            with span("reload"):
+                reloaded = watcher.poll()
+            if reloaded is not None:
+                new_config, changed_files = reloaded
+                old_chain_defs = validated_config["parsed"]["chain.yaml"]["chains"]
+                new_chain_defs = new_config["parsed"]["chain.yaml"]["chains"]
+                new_oracle_cfg = new_config["parsed"]["oracle.yaml"]["oracle"]
+                allowed_chains = runtime_cfg.get("allowed_chains", [])
+
+                apply_pool_sizes(
+                    transport,
+                    _pool_sizes(old_chain_defs, allowed_chains, oracle_cfg),
+                    _pool_sizes(new_chain_defs, allowed_chains, new_oracle_cfg),
+                )
+                changed_chains = reload_chains(
+                    old_chain_defs, new_chain_defs, allowed_chains,
+                    selectors, head_streams, live, fee_windows,
+                )
+                if oracle:
+                    oracle_limiter, oracle_cache, oracle_executor = reload_oracle(
+                        oracle_cfg, new_oracle_cfg, oracle_limiter, oracle_cache, oracle_executor,
+                        live,
+                    )
+
+                validated_config = new_config
+                oracle_cfg = new_oracle_cfg
+                logging.info(
+                    "Config reloaded",
+                    extra={"data": {
+                        "files": changed_files,
+                        "chains": changed_chains,
+                        "digest": new_config["digest"],
+                    }},
+                )
+
+        elapsed = scheduler.elapsed()
 
         logging.info(
-            f"Heartbeat | tick={runtime_state['tick_count']} | elapsed={int(elapsed)}s | interval={evaluation_interval}s"
+            f"Heartbeat | tick={runtime_state['tick_count']} | elapsed={int(elapsed)}s | interval={scheduler.last_interval_sec}s"
+            f" | jitter={scheduler.last_jitter_ms}ms | overruns={scheduler.overruns}"
+            f" | skipped={scheduler.skipped_ticks}"
         )
 
         logging.info("Evaluation phase started")
-
-        evaluation_failed = False
-        failure_reason = None
+        tick_started = time.monotonic()
+        transport.begin_tick(runtime_state["tick_count"])
 
         allowed_chains = runtime_cfg.get("allowed_chains", [])
         chain_defs = validated_config["parsed"]["chain.yaml"]["chains"]
 
-        for chain_name in allowed_chains:
-            result = evaluate_chain(chain_name, chain_defs[chain_name])
-
-            if result["reachable"]:
-                logging.info("Chain reachable", extra={"data": result})
-                orientation = collect_chain_orientation(chain_name, chain_defs[chain_name])
-                if orientation["success"]:
-                    logging.info("Chain orientation", extra={"data": orientation})
-                    last_chain_snapshot = orientation
-                else:
-                    logging.warning("Chain orientation failed", extra={"data": orientation})
-                    evaluation_failed = True
-                    failure_reason = f"Chain orientation failed: {chain_name}"
-            else:
-                logging.warning("Chain unreachable", extra={"data": result})
-                evaluation_failed = True
-                failure_reason = f"Chain unreachable: {chain_name}"
+        deadline = new_tick_deadline(tick_deadline, retry_cfg, realtime=replay is None)
+        with span("stages"):
+            outcomes = run_stages(
+                build_tick_stages(
+                    allowed_chains, chain_defs, oracle_cfg if oracle else None, reconciliation_cfg,
+                    transport, selectors, stage_timeouts, block_cache, head_streams,
+                    oracle_limiter, oracle_executor, oracle_cache, deadline, fee_windows,
+                ),
+                executor,
+                tick_deadline,
+            )
 
-        oracle_snapshot = collect_oracle_snapshot(oracle_cfg)
-        if oracle_snapshot["success"]:
-            logging.info("Oracle snapshot", extra={"data": oracle_snapshot})
-        else:
-            logging.warning("Oracle snapshot failed", extra={"data": oracle_snapshot})
+        with span("report"):
+            evaluation_failed, failure_reason = report_outcomes(allowed_chains, outcomes)
 
-        if last_chain_snapshot is not None:
-            reconciliation = reconcile(last_chain_snapshot, oracle_snapshot, reconciliation_cfg)
-            logging.info("Reconciliation", extra={"data": reconciliation})
-            if reconciliation["status"] == "degraded":
-                evaluation_failed = True
-                failure_reason = "degraded"
-            elif reconciliation["status"] == "unavailable":
-                evaluation_failed = True
-                failure_reason = "unavailable"
+        cadence = outcomes.get(f"chain:{cadence_chain}")
+        if cadence is not None and cadence.ok and cadence.value[1] is not None:
+            orientation = cadence.value[1]
+            if orientation["success"]:
+                scheduler.observe_block(orientation["block_height"], orientation["block_timestamp"])
 
-        if evaluation_failed:
-            health.record_failure(failure_reason)
-            logging.warning("Runtime health degraded due to evaluation failure")
-        else:
-            health.record_success()
-            logging.info("Runtime health OK")
+        if store is not None:
+            with span("store"):
+                record_tick(store, runtime_state["tick_count"], allowed_chains, outcomes)
+
+        with span("health"):
+            # Evaluation time so far: stages, reporting and the store
+            evaluation_ms = (time.monotonic() - tick_started) * 1000
+            if evaluation_failed:
+                health.record_failure(failure_reason, evaluation_ms)
+                logging.warning("Runtime health degraded due to evaluation failure")
+            else:
+                health.record_success(evaluation_ms)
+                logging.info("Runtime health OK")
+
+            for chain_name, selector in selectors.items():
+                health.record_breakers(chain_name, selector.breaker_states())
+                for endpoint in selector.open_endpoints():
+                    health.record_warning(f"Circuit open: {chain_name} {endpoint}")
 
         # Enforce runtime health decisions
-        if health.should_halt():
+        halting = health.should_halt()
+        pausing = not halting and health.should_pause()
+        if halting:
             health.enter_halt()
             logging.error("Health halt condition met — halting runtime")
             logging.info("Final health snapshot", extra={"data": health.snapshot()})
-            print("[!] Runtime halted due to health failure. See log for details.")
-            break
-
-        if health.should_pause():
+        elif pausing:
             health.enter_pause()
             logging.warning("Health pause condition met — entering paused state")
             logging.info("Paused health snapshot", extra={"data": health.snapshot()})
+        else:
+            with span("stats"):
+                logging.info("Health snapshot", extra={"data": health.snapshot()})
+                logging.info("Transport stats", extra={"data": transport.stats()})
+                logging.info("Tick deadline", extra={"data": deadline.snapshot()})
+                logging.info(
+                    "Endpoint stats",
+                    extra={"data": {name: sel.snapshot() for name, sel in selectors.items()}},
+                )
+                logging.info("Block cache", extra={"data": block_cache.snapshot()})
+                if fee_windows:
+                    logging.info(
+                        "Fee windows",
+                        extra={"data": {name: fw.snapshot() for name, fw in fee_windows.items()}},
+                    )
+                if oracle_limiter is not None:
+                    logging.info("Oracle rate limiter", extra={"data": oracle_limiter.snapshot()})
+                if oracle_cache is not None:
+                    logging.info("Oracle cache", extra={"data": oracle_cache.snapshot()})
+                if head_streams:
+                    logging.info(
+                        "Head streams",
+                        extra={"data": {name: hs.snapshot() for name, hs in head_streams.items()}},
+                    )
+
+        log_tick_timings()
+        tick_duration_ms = round((time.monotonic() - tick_started) * 1000, 1)
+        if metrics is not None:
+            publish_metrics(
+                metrics, runtime_state["tick_count"], tick_duration_ms, evaluation_failed,
+                health, scheduler, allowed_chains, outcomes, transport, selectors, block_cache,
+                head_streams, oracle_cache, deadline,
+            )
+        if on_tick is not None:
+            on_tick({
+                "tick": runtime_state["tick_count"],
+                "failed": evaluation_failed,
+                "reason": failure_reason,
+                "duration_ms": tick_duration_ms,
+                "paused": pausing,
+                "halted": halting,
+                "breakers": dict(health.breakers),
+            })
+
+        if halting:
+            print("[!] Runtime halted due to health failure. See log for details.")
+            break
+
+        if pausing:
             print("[!] Runtime paused due to health degradation.")
             pause_interval = evaluation_interval * health_cfg["pause_interval_multiplier"]
             logging.info(f"Paused — sleeping for {pause_interval}s before recheck")
-            time.sleep(pause_interval)
-            # Pause loop: continue heartbeats, skip evaluation
-            try:
-                time.sleep(pause_interval)
-            except KeyboardInterrupt:
-                logging.info("Runtime interrupted by user during pause")
-                print("[!] Runtime interrupted by user.")
-                break
+            # Pause stays on the tick grid: the next tick is due one pause
+            # interval after this tick's deadline.
+            scheduler.advance(health_cfg["pause_interval_multiplier"])
 
             # Skip remainder of loop and re-evaluate health next tick
             continue
 
-        logging.info("Health snapshot", extra={"data": health.snapshot()})
-
-        logging.info("Evaluation phase complete")
+        logging.info("Evaluation phase complete", extra={"data": {"duration_ms": tick_duration_ms}})
 
-        if max_runtime > 0 and elapsed >= max_runtime:
+        if replay is None and max_runtime > 0 and elapsed >= max_runtime:
             logging.info("Max runtime reached, exiting runtime loop")
             print("[+] Max runtime reached, exiting.")
             break
 
-        try:
-            time.sleep(evaluation_interval)
-        except KeyboardInterrupt:
-            logging.info("Runtime interrupted by user")
-            print("[!] Runtime interrupted by user.")
-            break
+        scheduler.advance()
 
+    executor.shutdown(wait=False)
+    if oracle_executor is not None:
+        oracle_executor.shutdown(wait=False)
+    for stream in head_streams.values():
+        stream.close()
+    transport.close()
+    tracer.close()
+    if metrics is not None:
+        tracer.remove_listener(metrics.observe_spans)
+    if metrics_server is not None:
+        metrics_server.stop()
+    if store is not None:
+        store.close()
     logging.info("Runtime exited cleanly")
 
+def run_supervised(validated_config, workers):
+    """Run the tick loop in `workers` processes, one shard of allowed_chains each."""
+    from gearbox.supervisor import DEFAULT_MAX_RESTARTS, Supervisor
+
+    runtime_cfg = validated_config["parsed"]["runtime.yaml"]["runtime"]
+    supervisor_cfg = runtime_cfg.get("supervisor", {})
+    metrics, metrics_server = start_metrics(runtime_cfg.get("metrics", {}))
+
+    supervisor = Supervisor(
+        run,
+        validated_config,
+        build_health(runtime_cfg.get("health", {})),
+        workers,
+        runtime_cfg["evaluation_interval_sec"],
+        stall_timeout_sec=supervisor_cfg.get("stall_timeout_sec"),
+        max_restarts=supervisor_cfg.get("max_restarts", DEFAULT_MAX_RESTARTS),
+        metrics=metrics,
+    )
+    logging.info(
+        "Supervisor started",
+        extra={"data": {"workers": {w.index: w.chains for w in supervisor.workers}}},
+    )
+    try:
+        supervisor.run()
+    finally:
+        if metrics_server is not None:
+            metrics_server.stop()
+    logging.info("Supervisor exited")
+
 def main():
     args = parse_args()
 
     run_timestamp = get_run_timestamp()
-    logfile = os.path.join(LOGDIR, f"cli-{run_timestamp}.log")
+    log_run_dir = os.path.join(LOGDIR, f"cli-{run_timestamp}")
 
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
     root_logger.handlers = []
 
-    json_formatter = JsonFormatter()
+    segment_sink = SegmentedLogSink(log_run_dir, JsonFormatter())
+    log_sinks = [segment_sink]
+    if args.verbose:
+        log_sinks.append(StreamSink(sys.stderr, JsonFormatter()))
 
-    file_handler = logging.FileHandler(logfile)
-    file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(json_formatter)
-    root_logger.addHandler(file_handler)
+    log_writer = LogWriter(log_sinks)
+    queue_handler = QueueingHandler(log_writer)
+    queue_handler.setLevel(logging.INFO)
+    root_logger.addHandler(queue_handler)
 
-    if args.verbose:
-        console = logging.StreamHandler(sys.stderr)
-        console.setLevel(logging.INFO)
-        console.setFormatter(json_formatter)
-        root_logger.addHandler(console)
+    try:
+        print_banner()
+        logging.info("CLI startup")
+        print(f"[+] Log directory: {log_run_dir}")
+
+        initialize()
+
+        logging.info("Starting configuration validation")
+        validation_result = load_config(
+            Path(CONFIGDIR), None if args.no_config_cache else Path(CACHEDIR)
+        )
 
-    print_banner()
-    logging.info("CLI startup")
-    print(f"[+] Log file: {logfile}")
+        for err in validation_result["errors"]:
+            logging.error(err)
+            if args.verbose:
+                print(f"[!] {err}")
 
-    initialize()
+        if not validation_result["ok"]:
+            logging.error("Configuration validation failed")
+            print("[!] Configuration validation failed. See log for details.")
+            return EXIT_VALIDATION_FAILED
 
-    logging.info("Starting configuration validation")
-    validation_result = validate(Path(CONFIGDIR))
+        logging.info(
+            "Configuration validation passed",
+            extra={"data": {
+                "digest": validation_result["digest"],
+                "cached": validation_result["cached"],
+            }},
+        )
 
-    for err in validation_result["errors"]:
-        logging.error(err)
-        if args.verbose:
-            print(f"[!] {err}")
+        configure_logging(
+            log_writer,
+            segment_sink,
+            validation_result["parsed"]["runtime.yaml"]["runtime"].get("logging", {}),
+        )
 
-    if not validation_result["ok"]:
-        logging.error("Configuration validation failed")
-        print("[!] Configuration validation failed. See log for details.")
-        return EXIT_VALIDATION_FAILED
+        if args.validate:
+            print("[+] Configuration validation passed.")
+            return EXIT_OK
 
-    logging.info("Configuration validation passed")
+        print("[+] Gearbox initialized and validated successfully.")
 
-    if args.validate:
-        print("[+] Configuration validation passed.")
-        return EXIT_OK
+        from gearbox.supervisor import DEFAULT_WORKERS
 
-    print("[+] Gearbox initialized and validated successfully.")
+        runtime_cfg = validation_result["parsed"]["runtime.yaml"]["runtime"]
+        workers = runtime_cfg.get("supervisor", {}).get("workers", DEFAULT_WORKERS)
+        if workers > 1 and (args.record or args.replay or args.trace):
+            logging.warning("Capture and trace runs are single-process; ignoring supervisor.workers")
+            print("[!] --record, --replay and --trace run in a single process.")
+            workers = 1
 
-    run(validation_result)
+        if workers > 1:
+            run_supervised(validation_result, workers)
+        else:
+            run(
+                validation_result,
+                record_path=args.record,
+                replay_path=args.replay,
+                trace_path=args.trace,
+            )
 
-    return EXIT_OK
+        return EXIT_OK
+    finally:
+        root_logger.removeHandler(queue_handler)
+        log_writer.close()
 
 # Main Execution
 if __name__ == "__main__":
@@ -0,0 +1,265 @@
+import json
+import struct
+from json.encoder import encode_basestring_ascii
+
+# Field types; every field may also be None
+INT = "int"
+FLOAT = "float"
+BOOL = "bool"
+STR = "str"
+
+_PACK_CODES = {INT: "q", FLOAT: "d", BOOL: "?"}
+_STR_LENGTH = struct.Struct("<I")
+
+
+def _json_value(value) -> str:
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if type(value) is int:
+        return str(value)
+    if type(value) is str:
+        return encode_basestring_ascii(value)
+    return json.dumps(value)
+
+
+class Record:
+    """
+    Base for fixed-schema snapshot records.
+
+    Subclasses list FIELDS as (name, type, default) in a fixed order and set
+    __slots__ to the same names, so a record is one small object with no
+    per-instance dict. Records read like the dicts they replace
+    (`record["success"]`, `record.get("price")`, `dict(record)`), write JSON
+    straight from their slots (to_json) and pack to a compact binary form
+    in field order (pack/unpack). Fields named in OMIT_NONE are left out of
+    to_json and to_dict while None, for results that only sometimes carry
+    them.
+    """
+
+    __slots__ = ()
+    FIELDS = ()
+    OMIT_NONE = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.NAMES = tuple(name for name, _, _ in cls.FIELDS)
+        cls._DEFAULTS = tuple(default for _, _, default in cls.FIELDS)
+        cls._BITMAP_BYTES = (len(cls.FIELDS) + 7) // 8
+        cls._JSON_KEYS = tuple(json.dumps(name) + ":" for name in cls.NAMES)
+
+    def __init__(self, *args, **kwargs):
+        names = self.NAMES
+        if len(args) > len(names):
+            raise TypeError(f"{type(self).__name__} takes at most {len(names)} fields")
+        for name, value in zip(names, args):
+            setattr(self, name, value)
+        for name, default in zip(names[len(args):], self._DEFAULTS[len(args):]):
+            setattr(self, name, kwargs.pop(name, default))
+        if kwargs:
+            raise TypeError(f"{type(self).__name__} got unexpected or repeated fields: {sorted(kwargs)}")
+
+    # Mapping-style access, for consumers that treat snapshots as dicts
+
+    def __getitem__(self, name):
+        if name not in self.NAMES:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __setitem__(self, name, value):
+        if name not in self.NAMES:
+            raise KeyError(name)
+        setattr(self, name, value)
+
+    def __contains__(self, name):
+        return name in self.NAMES
+
+    def __iter__(self):
+        return iter(self.NAMES)
+
+    def __len__(self):
+        return len(self.NAMES)
+
+    def get(self, name, default=None):
+        if name not in self.NAMES:
+            return default
+        return getattr(self, name)
+
+    def keys(self):
+        return self.NAMES
+
+    def values(self):
+        return tuple(getattr(self, name) for name in self.NAMES)
+
+    def items(self):
+        return tuple((name, getattr(self, name)) for name in self.NAMES)
+
+    def copy(self):
+        return type(self)(*self.values())
+
+    def to_dict(self) -> dict:
+        return {
+            name: value for name, value in zip(self.NAMES, self.values())
+            if value is not None or name not in self.OMIT_NONE
+        }
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.values() == other.values()
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value!r}" for name, value in self.items())
+        return f"{type(self).__name__}({fields})"
+
+    # Serialization
+
+    def to_json(self) -> str:
+        omit = self.OMIT_NONE
+        parts = []
+        for name, key in zip(self.NAMES, self._JSON_KEYS):
+            value = getattr(self, name)
+            if value is None and name in omit:
+                continue
+            parts.append(key + _json_value(value))
+        return "{" + ",".join(parts) + "}"
+
+    def pack(self) -> bytes:
+        """
+        Encode as a null bitmap followed by each non-null field in order:
+        int as int64, float as float64, bool as one byte, str as a uint32
+        length and UTF-8 bytes (little-endian).
+        """
+        bitmap = 0
+        fmt = ["<", f"{self._BITMAP_BYTES}s"]
+        values = [None]
+        for index, ((_, kind, _), value) in enumerate(zip(self.FIELDS, self.values())):
+            if value is None:
+                continue
+            bitmap |= 1 << index
+            if kind == STR:
+                data = str(value).encode("utf-8")
+                fmt.append(f"I{len(data)}s")
+                values.extend((len(data), data))
+            else:
+                fmt.append(_PACK_CODES[kind])
+                values.append(value)
+        values[0] = bitmap.to_bytes(self._BITMAP_BYTES, "little")
+        return struct.pack("".join(fmt), *values)
+
+    @classmethod
+    def unpack(cls, data: bytes):
+        bitmap = int.from_bytes(data[:cls._BITMAP_BYTES], "little")
+        offset = cls._BITMAP_BYTES
+        values = []
+        for index, (_, kind, _) in enumerate(cls.FIELDS):
+            if not bitmap & (1 << index):
+                values.append(None)
+                continue
+            if kind == STR:
+                (length,) = _STR_LENGTH.unpack_from(data, offset)
+                offset += _STR_LENGTH.size
+                values.append(data[offset:offset + length].decode("utf-8"))
+                offset += length
+            else:
+                code = "<" + _PACK_CODES[kind]
+                (value,) = struct.unpack_from(code, data, offset)
+                offset += struct.calcsize(code)
+                values.append(value)
+        return cls(*values)
+
+
+def json_default(value):
+    """`default` hook for json.dumps of structures that contain records."""
+    if isinstance(value, Record):
+        return value.to_dict()
+    return str(value)
+
+
+class Reachability(Record):
+    FIELDS = (
+        ("chain", STR, None),
+        ("network", STR, None),
+        ("rpc", STR, None),
+        ("reachable", BOOL, False),
+        ("timestamp", INT, None),
+        ("error", STR, None),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+
+class ChainSnapshot(Record):
+    FIELDS = (
+        ("chain", STR, None),
+        ("network", STR, None),
+        ("rpc", STR, None),
+        ("block_height", INT, None),
+        ("block_timestamp", INT, None),
+        ("gas_price", INT, None),
+        ("observed_at", STR, None),
+        ("timestamp_epoch", INT, None),
+        ("block_cached", BOOL, False),
+        ("streamed", BOOL, False),
+        ("success", BOOL, False),
+        ("failure_reason", STR, None),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+
+class GasSnapshot(Record):
+    FIELDS = (
+        ("chain", STR, None),
+        ("network", STR, None),
+        ("rpc", STR, None),
+        ("oldest_block", INT, None),
+        ("newest_block", INT, None),
+        ("window_blocks", INT, 0),
+        ("blocks_fetched", INT, 0),
+        ("base_fee", INT, None),
+        ("next_base_fee", INT, None),
+        ("base_fee_p50", INT, None),
+        ("base_fee_p90", INT, None),
+        ("base_fee_trend_pct", FLOAT, None),
+        ("priority_fee_p10", INT, None),
+        ("priority_fee_p50", INT, None),
+        ("priority_fee_p90", INT, None),
+        ("gas_used_ratio", FLOAT, None),
+        ("observed_at", STR, None),
+        ("success", BOOL, False),
+        ("failure_reason", STR, None),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+
+class OracleSnapshot(Record):
+    FIELDS = (
+        ("source", STR, None),
+        ("asset", STR, None),
+        ("price", STR, None),
+        ("latency_ms", INT, None),
+        ("observed_at", STR, None),
+        ("source_timestamp", STR, None),
+        ("timestamp_epoch", INT, None),
+        ("rate_limited", INT, 0),
+        ("cached", BOOL, False),
+        ("cache_age_ms", INT, None),
+        ("success", BOOL, False),
+        ("failure_reason", STR, None),
+    )
+    __slots__ = tuple(name for name, _, _ in FIELDS)
+
+
+class Reconciliation(Record):
+    FIELDS = (
+        ("chain_timestamp_epoch", INT, None),
+        ("oracle_timestamp_epoch", INT, None),
+        ("delta_sec", INT, None),
+        ("status", STR, None),
+        ("reason", STR, None),
+    )
+    # OK results carry no reason
+    OMIT_NONE = ("reason",)
+    __slots__ = tuple(name for name, _, _ in FIELDS)
@@ -0,0 +1,92 @@
+import threading
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a single endpoint.
+
+    closed:    requests flow; consecutive failures are counted.
+    open:      requests are refused immediately until reset_sec has passed.
+    half_open: one trial request is let through; success closes the
+               breaker, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_sec: float):
+        self.failure_threshold = failure_threshold
+        self.reset_sec = reset_sec
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.times_opened = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def _reset_due(self, now) -> bool:
+        return self.state == OPEN and now - self.opened_at >= self.reset_sec
+
+    def available(self) -> bool:
+        """Return True if a request would currently be let through."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN:
+                return not self._trial_in_flight
+            return self._reset_due(time.monotonic())
+
+    def allow(self) -> bool:
+        """Claim permission to send a request (the trial slot when half-open)."""
+        with self._lock:
+            if self.state == OPEN and self._reset_due(time.monotonic()):
+                self.state = HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def cancel(self):
+        """Give back a permission claimed by allow() without counting the attempt either way."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.times_opened += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            retry_in_sec = None
+            if self.state == OPEN:
+                retry_in_sec = round(
+                    max(self.reset_sec - (time.monotonic() - self.opened_at), 0), 1
+                )
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "times_opened": self.times_opened,
+                "retry_in_sec": retry_in_sec,
+            }
@@ -0,0 +1,181 @@
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict, deque
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Response headers kept in a capture; engines only read these.
+CAPTURED_HEADERS = ("Date", "Content-Type", "Retry-After")
+
+
+def _open_capture(path, mode):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _request_key(method, url, body):
+    return method, url, json.dumps(body, sort_keys=True, separators=(",", ":"))
+
+
+class RecordingTransport:
+    """
+    Transport wrapper that records every HTTP exchange to a capture file.
+
+    The capture is NDJSON: a `tick` line at the start of each evaluation
+    phase followed by one `http` line per request, holding the request, the
+    response status, selected headers and body, or the raised error.
+    """
+
+    def __init__(self, transport, capture_path):
+        self.transport = transport
+        self._file = _open_capture(capture_path, "w")
+        self._lock = threading.Lock()
+
+    def _write(self, entry):
+        with self._lock:
+            self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+    def begin_tick(self, tick):
+        self._write({"type": "tick", "tick": tick, "wall": time.time()})
+        self.transport.begin_tick(tick)
+
+    def _record(self, method, url, body, send):
+        entry = {"type": "http", "method": method, "url": url, "body": body}
+        start = time.monotonic()
+        try:
+            response = send()
+        except Exception as e:
+            entry["elapsed_ms"] = round((time.monotonic() - start) * 1000, 1)
+            entry["error"] = {"type": type(e).__name__, "message": str(e)}
+            self._write(entry)
+            raise
+
+        entry["elapsed_ms"] = round((time.monotonic() - start) * 1000, 1)
+        entry["status"] = response.status_code
+        entry["reason"] = response.reason
+        entry["headers"] = {
+            name: response.headers[name] for name in CAPTURED_HEADERS if name in response.headers
+        }
+        entry["text"] = response.text
+        self._write(entry)
+        return response
+
+    def post(self, url, json=None, timeout=None):
+        return self._record(
+            "POST", url, json, lambda: self.transport.post(url, json=json, timeout=timeout)
+        )
+
+    def get(self, url, timeout=None):
+        return self._record("GET", url, None, lambda: self.transport.get(url, timeout=timeout))
+
+    def configure_host(self, url, pool_maxsize):
+        self.transport.configure_host(url, pool_maxsize)
+
+    def stats(self) -> dict:
+        return self.transport.stats()
+
+    def close(self):
+        self.transport.close()
+        with self._lock:
+            self._file.close()
+
+
+class ReplayTransport:
+    """
+    Transport that answers requests from a capture file instead of the network.
+
+    Each evaluation phase replays the next recorded tick: requests are matched
+    by method, URL and body against that tick's exchanges, in recorded order.
+    A request with no recorded answer fails like an unreachable host.
+    """
+
+    def __init__(self, capture_path):
+        self._ticks = []
+        with _open_capture(capture_path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                if entry["type"] == "tick":
+                    self._ticks.append([])
+                elif entry["type"] == "http" and self._ticks:
+                    self._ticks[-1].append(entry)
+
+        self._cursor = -1
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.replayed = 0
+        self.missing = 0
+
+    @property
+    def tick_count(self) -> int:
+        return len(self._ticks)
+
+    def exhausted(self) -> bool:
+        return self._cursor + 1 >= len(self._ticks)
+
+    def begin_tick(self, tick):
+        with self._lock:
+            self._cursor += 1
+            pending = defaultdict(deque)
+            if self._cursor < len(self._ticks):
+                for entry in self._ticks[self._cursor]:
+                    pending[_request_key(entry["method"], entry["url"], entry["body"])].append(entry)
+            self._pending = pending
+
+    def _replay(self, method, url, body):
+        with self._lock:
+            entries = self._pending.get(_request_key(method, url, body))
+            entry = entries.popleft() if entries else None
+            if entry is None:
+                self.missing += 1
+            else:
+                self.replayed += 1
+
+        if entry is None:
+            raise requests.exceptions.ConnectionError(f"no recorded response for {method} {url}")
+
+        if "error" in entry:
+            error_type = getattr(
+                requests.exceptions,
+                entry["error"]["type"],
+                requests.exceptions.RequestException,
+            )
+            if not (isinstance(error_type, type) and issubclass(error_type, Exception)):
+                error_type = requests.exceptions.RequestException
+            raise error_type(entry["error"]["message"])
+
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = entry.get("reason")
+        response.headers = CaseInsensitiveDict(entry.get("headers", {}))
+        response.url = url
+        response.encoding = "utf-8"
+        response._content = entry["text"].encode("utf-8")
+        return response
+
+    def post(self, url, json=None, timeout=None):
+        return self._replay("POST", url, json)
+
+    def get(self, url, timeout=None):
+        return self._replay("GET", url, None)
+
+    def configure_host(self, url, pool_maxsize):
+        pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "replayed": self.replayed,
+                "missing": self.missing,
+                "tick": self._cursor + 1,
+                "ticks_recorded": len(self._ticks),
+            }
+
+    def close(self):
+        pass
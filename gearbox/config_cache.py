@@ -0,0 +1,127 @@
+import hashlib
+import marshal
+import os
+import sys
+from pathlib import Path
+
+CONFIG_FILES = (
+    "risk.yaml",
+    "runtime.yaml",
+    "strategies.yaml",
+    "chain.yaml",
+    "oracle.yaml",
+)
+
+# Bump when the cached layout changes
+CACHE_FORMAT = 1
+
+_PACKAGE_DIR = Path(__file__).resolve().parent
+
+
+def _package_sources() -> list:
+    """
+    (relative path, bytes) of every gearbox source file. The validator and
+    whatever it imports, directly or not, decide what validates, so any
+    source change invalidates the cache.
+    """
+    return [
+        (path.relative_to(_PACKAGE_DIR).as_posix(), path.read_bytes())
+        for path in sorted(_PACKAGE_DIR.rglob("*.py"))
+    ]
+
+
+def read_sources(config_dir) -> dict:
+    """Raw bytes of each config file, or None for a missing one."""
+    sources = {}
+    for filename in CONFIG_FILES:
+        try:
+            sources[filename] = (Path(config_dir) / filename).read_bytes()
+        except FileNotFoundError:
+            sources[filename] = None
+    return sources
+
+
+def config_digest(sources: dict) -> str:
+    """
+    SHA-256 over the config file contents, the gearbox package sources and
+    the interpreter's marshal format, so editing any of them misses the
+    cache.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{CACHE_FORMAT}:{marshal.version}:{sys.implementation.cache_tag}\0".encode())
+    for name, source in _package_sources():
+        digest.update(f"\0{name}\0".encode())
+        digest.update(source)
+    for filename in CONFIG_FILES:
+        data = sources.get(filename)
+        digest.update(f"\0{filename}\0".encode())
+        digest.update(b"-" if data is None else b"+" + data)
+    return digest.hexdigest()
+
+
+def _cache_path(cache_dir, digest):
+    return Path(cache_dir) / f"config-{digest}.marshal"
+
+
+def _read_cache(path):
+    try:
+        with open(path, "rb") as f:
+            parsed = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+def _write_cache(path, parsed):
+    try:
+        data = marshal.dumps(parsed)
+    except ValueError:
+        # YAML values marshal cannot hold (e.g. dates): validate every start
+        return False
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        # Only the current config is worth keeping
+        for stale in path.parent.glob("config-*.marshal"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
+    except OSError:
+        return False
+    return True
+
+
+def load_config(config_dir, cache_dir=None) -> dict:
+    """
+    Return the validation result for `config_dir`, from the compiled cache
+    when the config is unchanged since it last validated cleanly.
+
+    The result has the same shape as validate() plus `digest` (the cache
+    key), `cached` and the raw `sources` it was checked against. Only
+    passing configs are cached, so a broken config reports its errors on
+    every start. With no `cache_dir` this is validate() with a digest.
+    """
+    sources = read_sources(config_dir)
+    digest = config_digest(sources)
+
+    path = _cache_path(cache_dir, digest) if cache_dir is not None else None
+    if path is not None:
+        parsed = _read_cache(path)
+        if parsed is not None:
+            return {
+                "ok": True, "errors": [], "parsed": parsed,
+                "digest": digest, "cached": True, "sources": sources,
+            }
+
+    # yaml and the validator are only imported on a miss
+    from gearbox.validate import validate
+
+    result = validate(config_dir, sources)
+    result["digest"] = digest
+    result["cached"] = False
+    result["sources"] = sources
+    if result["ok"] and path is not None:
+        _write_cache(path, result["parsed"])
+    return result
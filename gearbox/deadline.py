@@ -0,0 +1,106 @@
+import copy
+import random
+import threading
+import time
+
+# Retry defaults, overridable under runtime.executor.rpc_retry
+DEFAULT_RETRY_BUDGET = 4
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BACKOFF_MS = 100
+DEFAULT_MAX_BACKOFF_MS = 1000
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class _Retries:
+    """Retry allowance shared by a tick's deadline and every deadline derived from it."""
+
+    def __init__(self, budget: int):
+        self.budget = budget
+        self.used = 0
+        self.denied = 0
+        self.lock = threading.Lock()
+
+
+class Deadline:
+    """
+    Time and retry budget of one tick, passed down into every RPC call.
+
+    timeout() caps a request's own timeout at the time left, so no request
+    outlives the tick. retry_delay() grants retries from one allowance
+    shared by the whole tick, after a full-jitter exponential backoff, and
+    only while the backoff leaves time to send the request again. within()
+    narrows the deadline for one stage without giving it its own retries.
+    """
+
+    def __init__(
+        self,
+        timeout_sec: float,
+        retry_budget: int = DEFAULT_RETRY_BUDGET,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        backoff_ms: float = DEFAULT_BACKOFF_MS,
+        max_backoff_ms: float = DEFAULT_MAX_BACKOFF_MS,
+        realtime: bool = True,
+    ):
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + timeout_sec
+        self.max_attempts = max_attempts
+        self.backoff_sec = backoff_ms / 1000
+        self.max_backoff_sec = max_backoff_ms / 1000
+        # Replays do not sleep between attempts
+        self.realtime = realtime
+        self._retries = _Retries(retry_budget)
+
+    def within(self, timeout_sec):
+        """This deadline, or `timeout_sec` from now if that is sooner; retries stay shared."""
+        if timeout_sec is None:
+            return self
+        narrowed = copy.copy(self)
+        narrowed.expires_at = min(self.expires_at, time.monotonic() + timeout_sec)
+        return narrowed
+
+    def remaining(self) -> float:
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def timeout(self, timeout_sec=None) -> float:
+        """Request timeout: `timeout_sec` capped at the time left. Raises once expired."""
+        remaining = self.expires_at - time.monotonic()
+        if remaining <= 0:
+            raise DeadlineExceeded("tick deadline exceeded")
+        return remaining if timeout_sec is None else min(timeout_sec, remaining)
+
+    def retry_delay(self, attempt: int):
+        """
+        Seconds to back off before retry number `attempt` + 1, or None when
+        the call is out of attempts, the tick out of retries or out of time.
+        """
+        if attempt + 1 >= self.max_attempts:
+            return None
+        delay = random.uniform(0, min(self.max_backoff_sec, self.backoff_sec * 2 ** attempt))
+        retries = self._retries
+        with retries.lock:
+            if retries.used >= retries.budget or delay >= self.remaining():
+                retries.denied += 1
+                return None
+            retries.used += 1
+        return delay
+
+    def sleep(self, delay_sec: float):
+        if self.realtime and delay_sec > 0:
+            time.sleep(delay_sec)
+
+    def snapshot(self) -> dict:
+        retries = self._retries
+        with retries.lock:
+            return {
+                "elapsed_ms": round((time.monotonic() - self.started_at) * 1000, 1),
+                "remaining_ms": round(self.remaining() * 1000, 1),
+                "retries": retries.used,
+                "retry_budget": retries.budget,
+                "retries_denied": retries.denied,
+            }
@@ -0,0 +1,254 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from gearbox.breaker import OPEN, CircuitBreaker, CircuitOpenError
+from gearbox.deadline import DeadlineExceeded
+from gearbox.engine.rpc import RpcEndpointError
+
+# Rolling window of observations kept per endpoint.
+WINDOW_SIZE = 50
+# Latency samples required before an endpoint's percentile is trusted.
+MIN_HEDGE_SAMPLES = 5
+# Score multiplier applied per unit of error rate.
+ERROR_PENALTY = 10
+# Circuit breaker defaults, overridable per network in chain.yaml.
+DEFAULT_BREAKER_FAILURE_THRESHOLD = 3
+DEFAULT_BREAKER_RESET_SEC = 30
+
+_hedge_pool = None
+_hedge_pool_lock = threading.Lock()
+
+
+def _get_hedge_pool():
+    global _hedge_pool
+    with _hedge_pool_lock:
+        if _hedge_pool is None:
+            _hedge_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="gearbox-hedge")
+        return _hedge_pool
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class EndpointSelector:
+    """
+    Latency- and error-ranked RPC endpoint selection for one network.
+
+    Every attempt records its latency and outcome in a rolling window per
+    endpoint. Endpoints are tried best-first and failed over in order. When
+    hedging is enabled and the current endpoint has not answered within the
+    configured percentile of its recent latency, a duplicate request is sent
+    to the next-best endpoint and whichever answers first wins. Endpoints
+    whose circuit breaker is open are skipped without sending anything.
+
+    With `adaptive=False` (captures and replays) endpoints are always tried
+    in configured order, without hedging or breakers, so the requests sent
+    depend only on the responses and not on timing.
+    """
+
+    def __init__(
+        self,
+        endpoints,
+        hedge_percentile=None,
+        hedge_min_delay_ms=0,
+        breaker_failure_threshold=DEFAULT_BREAKER_FAILURE_THRESHOLD,
+        breaker_reset_sec=DEFAULT_BREAKER_RESET_SEC,
+        adaptive=True,
+    ):
+        self.endpoints = list(endpoints)
+        self.adaptive = adaptive
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay_ms = hedge_min_delay_ms
+        self.breakers = {
+            ep: CircuitBreaker(breaker_failure_threshold, breaker_reset_sec)
+            for ep in self.endpoints
+        }
+
+        self._latencies = {ep: deque(maxlen=WINDOW_SIZE) for ep in self.endpoints}
+        self._outcomes = {ep: deque(maxlen=WINDOW_SIZE) for ep in self.endpoints}
+        self._lock = threading.Lock()
+
+        self.hedges_sent = 0
+        self.hedges_won = 0
+
+    def inherit(self, previous):
+        """
+        Take over latency history, breakers and hedge counts from the
+        selector this one replaces after a config reload, for the endpoints
+        both have. Breakers keep their state but use this selector's limits.
+        """
+        with previous._lock:
+            shared = [ep for ep in self.endpoints if ep in previous.breakers]
+            for ep in shared:
+                self._latencies[ep].extend(previous._latencies[ep])
+                self._outcomes[ep].extend(previous._outcomes[ep])
+            hedges_sent = previous.hedges_sent
+            hedges_won = previous.hedges_won
+        with self._lock:
+            for ep in shared:
+                breaker = previous.breakers[ep]
+                breaker.failure_threshold = self.breakers[ep].failure_threshold
+                breaker.reset_sec = self.breakers[ep].reset_sec
+                self.breakers[ep] = breaker
+            self.hedges_sent += hedges_sent
+            self.hedges_won += hedges_won
+
+    def record(self, endpoint, latency_ms: float, ok: bool):
+        with self._lock:
+            if ok:
+                self._latencies[endpoint].append(latency_ms)
+            self._outcomes[endpoint].append(ok)
+
+    def _score(self, endpoint):
+        latencies = self._latencies[endpoint]
+        outcomes = self._outcomes[endpoint]
+        if not outcomes:
+            # Unsampled endpoints are tried early so every endpoint gets measured.
+            return 0.0
+        if not latencies:
+            return float("inf")
+        error_rate = outcomes.count(False) / len(outcomes)
+        return _percentile(latencies, 50) * (1 + error_rate * ERROR_PENALTY)
+
+    def ranked(self) -> list:
+        if not self.adaptive:
+            return list(self.endpoints)
+        with self._lock:
+            scores = {ep: self._score(ep) for ep in self.endpoints}
+        order = {ep: i for i, ep in enumerate(self.endpoints)}
+        return sorted(self.endpoints, key=lambda ep: (scores[ep], order[ep]))
+
+    def hedge_delay(self, endpoint):
+        """Seconds to wait on `endpoint` before hedging, or None to not hedge."""
+        if self.hedge_percentile is None or not self.adaptive:
+            return None
+        with self._lock:
+            latencies = list(self._latencies[endpoint])
+        if len(latencies) < MIN_HEDGE_SAMPLES:
+            return None
+        delay_ms = max(_percentile(latencies, self.hedge_percentile), self.hedge_min_delay_ms)
+        return delay_ms / 1000
+
+    def _timed(self, endpoint, fn):
+        breaker = self.breakers[endpoint] if self.adaptive else None
+        if breaker is not None and not breaker.allow():
+            raise CircuitOpenError("circuit open")
+
+        start = time.monotonic()
+        try:
+            result = fn(endpoint)
+        except DeadlineExceeded:
+            # The tick ran out of time, not the endpoint
+            if breaker is not None:
+                breaker.cancel()
+            raise
+        except Exception:
+            if breaker is not None:
+                breaker.record_failure()
+            self.record(endpoint, (time.monotonic() - start) * 1000, False)
+            raise
+        if breaker is not None:
+            breaker.record_success()
+        self.record(endpoint, (time.monotonic() - start) * 1000, True)
+        return result
+
+    def _hedged(self, primary, backup, delay, fn):
+        pool = _get_hedge_pool()
+        futures = {pool.submit(self._timed, primary, fn): primary}
+
+        done, _ = wait(futures, timeout=delay)
+        if not done:
+            futures[pool.submit(self._timed, backup, fn)] = backup
+            with self._lock:
+                self.hedges_sent += 1
+
+        last_error = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    result = future.result()
+                except DeadlineExceeded as e:
+                    # No endpoint can answer in time; the other request, if
+                    # still running, is bounded by the same deadline
+                    raise RpcEndpointError(futures[future], e)
+                except Exception as e:
+                    last_error = RpcEndpointError(futures[future], e)
+                    continue
+                if futures[future] == backup:
+                    with self._lock:
+                        self.hedges_won += 1
+                return futures[future], result, len(futures), None
+
+        return None, None, len(futures), last_error
+
+    def execute(self, fn):
+        """Run `fn(endpoint)` and return (endpoint, result) from the first success."""
+        ranked = self.ranked()
+        if self.adaptive:
+            ranked = [ep for ep in ranked if self.breakers[ep].available()]
+        if not ranked:
+            raise RpcEndpointError(self.endpoints[0], CircuitOpenError("all circuits open"))
+        last_error = None
+
+        i = 0
+        while i < len(ranked):
+            primary = ranked[i]
+            backup = ranked[i + 1] if i + 1 < len(ranked) else None
+            delay = self.hedge_delay(primary) if backup is not None else None
+
+            if delay is None:
+                try:
+                    return primary, self._timed(primary, fn)
+                except DeadlineExceeded as e:
+                    # Every other endpoint would fail the same way
+                    raise RpcEndpointError(primary, e)
+                except Exception as e:
+                    last_error = RpcEndpointError(primary, e)
+                    i += 1
+                    continue
+
+            endpoint, result, attempted, error = self._hedged(primary, backup, delay, fn)
+            if error is None:
+                return endpoint, result
+            last_error = error
+            i += attempted
+
+        raise last_error
+
+    def breaker_states(self) -> dict:
+        """Return the circuit breaker snapshot for every endpoint."""
+        return {ep: breaker.snapshot() for ep, breaker in self.breakers.items()}
+
+    def open_endpoints(self) -> list:
+        return [ep for ep, breaker in self.breakers.items() if breaker.state == OPEN]
+
+    def snapshot(self) -> dict:
+        """Return rolling latency and error figures per endpoint."""
+        endpoints = {}
+        with self._lock:
+            for ep in self.endpoints:
+                latencies = self._latencies[ep]
+                outcomes = self._outcomes[ep]
+                endpoints[ep] = {
+                    "samples": len(outcomes),
+                    "latency_p50_ms": round(_percentile(latencies, 50), 1) if latencies else None,
+                    "latency_p95_ms": round(_percentile(latencies, 95), 1) if latencies else None,
+                    "error_rate": round(outcomes.count(False) / len(outcomes), 3) if outcomes else None,
+                    "breaker": self.breakers[ep].state,
+                }
+            hedges_sent = self.hedges_sent
+            hedges_won = self.hedges_won
+
+        return {
+            "ranking": self.ranked(),
+            "hedges_sent": hedges_sent,
+            "hedges_won": hedges_won,
+            "endpoints": endpoints,
+        }
@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_BLOCKS = 64
+
+# Weight of the newest sample in the block interval moving average
+INTERVAL_SMOOTHING = 0.2
+
+
+class BlockCache:
+    """
+    Small LRU cache of fetched blocks keyed by (chain, network, height).
+
+    A block at a given height does not change once fetched, so while the head
+    has not moved the orientation engine reuses it instead of calling
+    eth_getBlockByNumber again. Per chain it also tracks the latest cached
+    block and a moving average of the block interval, which batch mode uses
+    to predict whether a new block is due before building the batch.
+
+    With `predict=False` (captures and replays) a new block is always
+    expected, since the prediction depends on the wall clock.
+    """
+
+    def __init__(self, max_blocks: int = DEFAULT_MAX_BLOCKS, predict: bool = True):
+        self.max_blocks = max_blocks
+        self.predict = predict
+        self._blocks = OrderedDict()
+        self._heads = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.mispredictions = 0
+
+    def get(self, chain_name, network_name, height):
+        """Return the cached block at `height`, or None. Counts a hit when found."""
+        if height is None:
+            return None
+        key = (chain_name, network_name, height)
+        with self._lock:
+            block = self._blocks.get(key)
+            if block is not None:
+                self._blocks.move_to_end(key)
+                self.hits += 1
+            return block
+
+    def put(self, chain_name, network_name, height, block):
+        """Cache a freshly fetched block. Every fetch counts as a miss."""
+        if height is None:
+            return
+        key = (chain_name, network_name, height)
+        with self._lock:
+            self.misses += 1
+            self._blocks[key] = block
+            self._blocks.move_to_end(key)
+            while len(self._blocks) > self.max_blocks:
+                self._blocks.popitem(last=False)
+            self._update_head(chain_name, network_name, height, block)
+
+    def _update_head(self, chain_name, network_name, height, block):
+        try:
+            timestamp = int(block["timestamp"], 16)
+        except (KeyError, TypeError, ValueError):
+            return
+
+        head = self._heads.get((chain_name, network_name))
+        if head is None:
+            self._heads[(chain_name, network_name)] = {
+                "height": height, "timestamp": timestamp, "interval_sec": None,
+            }
+            return
+        if height <= head["height"]:
+            return
+
+        sample = (timestamp - head["timestamp"]) / (height - head["height"])
+        if sample > 0:
+            if head["interval_sec"] is None:
+                head["interval_sec"] = sample
+            else:
+                head["interval_sec"] += INTERVAL_SMOOTHING * (sample - head["interval_sec"])
+        head["height"] = height
+        head["timestamp"] = timestamp
+
+    def head(self, chain_name, network_name):
+        """Return (height, timestamp, interval_sec) of the newest cached block, or None."""
+        with self._lock:
+            head = self._heads.get((chain_name, network_name))
+            if head is None:
+                return None
+            return head["height"], head["timestamp"], head["interval_sec"]
+
+    def expects_new_block(self, chain_name, network_name, block_time_sec=None, now: float = None) -> bool:
+        """
+        Predict whether the chain has produced a block since the cached head.
+
+        True once one block interval has passed since the cached head's
+        timestamp. The observed average interval is used when known, else
+        `block_time_sec`; with neither, a new block is always expected.
+        """
+        if not self.predict:
+            return True
+        head = self.head(chain_name, network_name)
+        if head is None:
+            return True
+        interval_sec = head[2] if head[2] is not None else block_time_sec
+        if interval_sec is None:
+            return True
+        now = time.time() if now is None else now
+        return now >= head[1] + interval_sec
+
+    def record_misprediction(self):
+        with self._lock:
+            self.mispredictions += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "blocks": len(self._blocks),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+                "mispredictions": self.mispredictions,
+            }
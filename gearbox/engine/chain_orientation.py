@@ -1,90 +1,285 @@
 import datetime
-import requests
 
+from gearbox.agent.schema import ChainSnapshot
+from gearbox.engine.market_data import evaluate_chain, reachability_result
+from gearbox.engine.rpc import RpcEndpointError, call_endpoints, rpc_batch, rpc_call
 
-def _rpc_call(rpc, method, params, timeout_sec: int):
-    payload = {
-        "jsonrpc": "2.0",
-        "method": method,
-        "params": params,
-        "id": 1,
-    }
+BLOCK_CALL = ("eth_getBlockByNumber", ["latest", False])
 
-    response = requests.post(rpc, json=payload, timeout=timeout_sec)
-    response.raise_for_status()
+# Orientation RPC primitives, in the order their failures are reported.
+ORIENTATION_CALLS = [
+    ("eth_chainId", []),
+    ("eth_blockNumber", []),
+    BLOCK_CALL,
+    ("eth_gasPrice", []),
+]
 
-    data = response.json()
-    if "result" not in data:
-        raise ValueError("invalid RPC response")
 
-    return data["result"]
+def _check_result(method, result):
+    if method == "eth_getBlockByNumber":
+        if not isinstance(result, dict) or "timestamp" not in result:
+            raise ValueError("invalid block response")
+    return result
+
+
+def _block_height(results):
+    try:
+        return int(results["eth_blockNumber"], 16)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _cache_block(block_cache, chain_key, results, block):
+    height = None
+    if isinstance(block, dict) and isinstance(block.get("number"), str):
+        try:
+            height = int(block["number"], 16)
+        except ValueError:
+            pass
+    if height is None:
+        height = _block_height(results)
+    block_cache.put(*chain_key, height, block)
+
+
+def _fetch_block(rpc_endpoints, timeout_sec, transport, selector, deadline=None):
+    method, params = BLOCK_CALL
+    return call_endpoints(
+        rpc_endpoints,
+        lambda rpc: _check_result(
+            method, rpc_call(rpc, method, params, timeout_sec, transport, deadline)
+        ),
+        selector,
+        deadline,
+    )
+
+
+def _fetch_sequential(rpc_endpoints, timeout_sec, transport, selector, block_cache=None, chain_key=None,
+                      deadline=None):
+    """Return (rpc, results, block_cached), fetching one method at a time."""
+    rpc = rpc_endpoints[0]
+    results = {}
+    block_cached = False
+    for method, params in ORIENTATION_CALLS:
+        if method == BLOCK_CALL[0] and block_cache is not None:
+            block = block_cache.get(*chain_key, _block_height(results))
+            if block is not None:
+                results[method] = block
+                block_cached = True
+                continue
+
+        try:
+            rpc, result = call_endpoints(
+                rpc_endpoints,
+                lambda rpc, method=method, params=params: _check_result(
+                    method, rpc_call(rpc, method, params, timeout_sec, transport, deadline)
+                ),
+                selector,
+                deadline,
+            )
+        except RpcEndpointError as e:
+            results[method] = e.error
+            return e.rpc, results, False
+        results[method] = result
+
+        if method == BLOCK_CALL[0] and block_cache is not None:
+            _cache_block(block_cache, chain_key, results, result)
+    return rpc, results, block_cached
+
+
+def _fetch_batch(rpc_endpoints, timeout_sec, transport, selector, block_cache=None,
+                 chain_key=None, block_time_sec=None, deadline=None):
+    """
+    Return (rpc, results, block_cached), fetching all methods in one batch.
+
+    With a block cache, the block is left out of the batch when the cache
+    predicts the head has not moved. If the returned height has no cached
+    block after all (a misprediction), the block is fetched separately.
+    """
+    calls = ORIENTATION_CALLS
+    if block_cache is not None and not block_cache.expects_new_block(*chain_key, block_time_sec):
+        calls = [call for call in ORIENTATION_CALLS if call != BLOCK_CALL]
+
+    try:
+        rpc, batch = call_endpoints(
+            rpc_endpoints,
+            lambda rpc: rpc_batch(rpc, calls, timeout_sec, transport, deadline),
+            selector,
+            deadline,
+        )
+    except RpcEndpointError as e:
+        return e.rpc, {method: e.error for method, _ in ORIENTATION_CALLS}, False
+
+    results = {}
+    for (method, _), result in zip(calls, batch):
+        if not isinstance(result, Exception):
+            try:
+                result = _check_result(method, result)
+            except Exception as e:
+                result = e
+        results[method] = result
+
+    if block_cache is None:
+        return rpc, results, False
+
+    method = BLOCK_CALL[0]
+    if method in results:
+        if not isinstance(results[method], Exception):
+            _cache_block(block_cache, chain_key, results, results[method])
+        return rpc, results, False
+
+    height = _block_height(results)
+    if height is None:
+        # eth_blockNumber failed; it is reported as the orientation failure
+        return rpc, results, False
+
+    block = block_cache.get(*chain_key, height)
+    if block is not None:
+        results[method] = block
+        return rpc, results, True
+
+    block_cache.record_misprediction()
+    try:
+        _, block = _fetch_block(rpc_endpoints, timeout_sec, transport, selector, deadline)
+    except RpcEndpointError as e:
+        results[method] = e.error
+        return rpc, results, False
+    results[method] = block
+    _cache_block(block_cache, chain_key, results, block)
+    return rpc, results, False
+
+
+def _new_snapshot(chain_name, network_name):
+    return ChainSnapshot(
+        chain_name,
+        network_name,
+        observed_at=datetime.datetime.utcnow().isoformat() + "Z",
+    )
+
+
+def _apply_results(snapshot, results):
+    for method, _ in ORIENTATION_CALLS:
+        if method not in results or isinstance(results[method], Exception):
+            snapshot.failure_reason = method
+            return snapshot
 
+    snapshot.block_height = int(results["eth_blockNumber"], 16)
+    snapshot.block_timestamp = int(results["eth_getBlockByNumber"]["timestamp"], 16)
+    snapshot.timestamp_epoch = snapshot.block_timestamp
+    snapshot.gas_price = int(results["eth_gasPrice"], 16)
+    snapshot.success = True
 
-def collect_chain_orientation(chain_name, chain_cfg):
+    return snapshot
+
+
+def _resolve_network(chain_cfg):
     network_name = chain_cfg.get("default_network")
     networks = chain_cfg.get("networks", {})
+    if not network_name or network_name not in networks:
+        return network_name, None
+    return network_name, networks[network_name]
 
-    observed_at = datetime.datetime.utcnow().isoformat() + "Z"
-
-    snapshot = {
-        "chain": chain_name,
-        "network": network_name,
-        "rpc": None,
-        "block_height": None,
-        "block_timestamp": None,
-        "gas_price": None,
-        "observed_at": observed_at,
-        "timestamp_epoch": None,
-        "success": False,
-        "failure_reason": None,
-    }
 
-    if not network_name or network_name not in networks:
-        snapshot["failure_reason"] = "eth_chainId"
+def collect_chain_orientation(chain_name, chain_cfg, transport=None, batch=None, selector=None,
+                              block_cache=None, deadline=None):
+    network_name, network_cfg = _resolve_network(chain_cfg)
+
+    snapshot = _new_snapshot(chain_name, network_name)
+
+    if network_cfg is None:
+        snapshot.failure_reason = "eth_chainId"
         return snapshot
 
-    network_cfg = networks[network_name]
     rpc_endpoints = network_cfg.get("rpc_endpoints", [])
     rpc_timeout_sec = network_cfg.get("rpc_timeout_sec")
 
     if not rpc_endpoints:
-        snapshot["failure_reason"] = "eth_chainId"
+        snapshot.failure_reason = "eth_chainId"
         return snapshot
 
-    rpc = rpc_endpoints[0]
-    snapshot["rpc"] = rpc
+    if batch is None:
+        batch = network_cfg.get("rpc_batch", False)
 
-    try:
-        _rpc_call(rpc, "eth_chainId", [], rpc_timeout_sec)
-    except Exception:
-        snapshot["failure_reason"] = "eth_chainId"
-        return snapshot
+    chain_key = (chain_name, network_name)
+    if batch:
+        rpc, results, block_cached = _fetch_batch(
+            rpc_endpoints, rpc_timeout_sec, transport, selector,
+            block_cache, chain_key, network_cfg.get("block_time_sec"), deadline,
+        )
+    else:
+        rpc, results, block_cached = _fetch_sequential(
+            rpc_endpoints, rpc_timeout_sec, transport, selector, block_cache, chain_key, deadline
+        )
 
-    try:
-        block_number_hex = _rpc_call(rpc, "eth_blockNumber", [], rpc_timeout_sec)
-    except Exception:
-        snapshot["failure_reason"] = "eth_blockNumber"
-        return snapshot
+    snapshot.rpc = rpc
+    snapshot.block_cached = block_cached
+    return _apply_results(snapshot, results)
 
-    try:
-        block = _rpc_call(rpc, "eth_getBlockByNumber", ["latest", False], rpc_timeout_sec)
-        if not isinstance(block, dict) or "timestamp" not in block:
-            raise ValueError("invalid block response")
-        block_timestamp_hex = block["timestamp"]
-    except Exception:
-        snapshot["failure_reason"] = "eth_getBlockByNumber"
-        return snapshot
 
-    try:
-        gas_price_hex = _rpc_call(rpc, "eth_gasPrice", [], rpc_timeout_sec)
-    except Exception:
-        snapshot["failure_reason"] = "eth_gasPrice"
-        return snapshot
+def _observe_stream(chain_name, network_name, head_stream):
+    """Return (reachability, orientation) from a fresh subscription head, or None."""
+    head = head_stream.latest()
+    if head is None:
+        return None
 
-    snapshot["block_height"] = int(block_number_hex, 16)
-    snapshot["block_timestamp"] = int(block_timestamp_hex, 16)
-    snapshot["timestamp_epoch"] = snapshot["block_timestamp"]
-    snapshot["gas_price"] = int(gas_price_hex, 16)
-    snapshot["success"] = True
+    snapshot = _new_snapshot(chain_name, network_name)
+    snapshot.rpc = head_stream.ws_url
+    snapshot.block_height = head["block_height"]
+    snapshot.block_timestamp = head["block_timestamp"]
+    snapshot.timestamp_epoch = head["block_timestamp"]
+    # Heads carry no gas price; the base fee leaves out the priority tip
+    snapshot.streamed = True
+    snapshot.success = True
+    return reachability_result(chain_name, network_name, head_stream.ws_url, True), snapshot
 
-    return snapshot
+
+def observe_chain(chain_name, chain_cfg, transport=None, selector=None, block_cache=None,
+                  head_stream=None, deadline=None):
+    """
+    Collect reachability and orientation for one chain.
+
+    With a connected newHeads subscription (`head_stream`) both come from the
+    latest streamed head without any RPC, with no gas price (see the gas
+    stage for fees). When the subscription is down or stale this falls back
+    to polling.
+
+    Networks with `rpc_batch` enabled answer both from a single JSON-RPC
+    batch: the batch's `eth_chainId` result doubles as the reachability
+    probe. With a block cache, the latest block is reused while the head
+    has not moved. Otherwise reachability is probed first and orientation is only
+    collected for reachable chains (orientation is None when unreachable).
+    Every RPC is bounded by the tick `deadline` when one is given.
+    """
+    network_name, network_cfg = _resolve_network(chain_cfg)
+
+    if head_stream is not None and network_cfg is not None:
+        streamed = _observe_stream(chain_name, network_name, head_stream)
+        if streamed is not None:
+            return streamed
+
+    if network_cfg is None or not network_cfg.get("rpc_batch", False):
+        reachability = evaluate_chain(chain_name, chain_cfg, transport, selector, deadline)
+        if not reachability["reachable"]:
+            return reachability, None
+        return reachability, collect_chain_orientation(
+            chain_name, chain_cfg, transport, batch=False, selector=selector,
+            block_cache=block_cache, deadline=deadline,
+        )
+
+    rpc_endpoints = network_cfg.get("rpc_endpoints", [])
+    if not rpc_endpoints:
+        return evaluate_chain(chain_name, chain_cfg, transport, selector, deadline), None
+
+    snapshot = _new_snapshot(chain_name, network_name)
+    rpc, results, block_cached = _fetch_batch(
+        rpc_endpoints, network_cfg.get("rpc_timeout_sec"), transport, selector,
+        block_cache, (chain_name, network_name), network_cfg.get("block_time_sec"), deadline,
+    )
+    snapshot.rpc = rpc
+    snapshot.block_cached = block_cached
+
+    chain_id = results["eth_chainId"]
+    if isinstance(chain_id, Exception):
+        return reachability_result(chain_name, network_name, rpc, False, str(chain_id)), None
+
+    reachability = reachability_result(chain_name, network_name, rpc, True)
+    return reachability, _apply_results(snapshot, results)
@@ -0,0 +1,189 @@
+import datetime
+import threading
+from collections import deque
+
+from gearbox.agent.schema import GasSnapshot
+from gearbox.engine.rpc import RpcEndpointError, call_endpoints, rpc_call
+
+DEFAULT_WINDOW_BLOCKS = 64
+# Providers commonly cap eth_feeHistory's blockCount at 1024
+DEFAULT_MAX_BLOCKS_PER_CALL = 1024
+# Priority fee percentiles requested for every block (GasSnapshot has one field each)
+REWARD_PERCENTILES = [10, 50, 90]
+
+
+def _percentile(ordered, pct):
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _check_history(result):
+    if (
+        not isinstance(result, dict)
+        or not isinstance(result.get("oldestBlock"), str)
+        or not isinstance(result.get("baseFeePerGas"), list)
+        or not isinstance(result.get("gasUsedRatio"), list)
+    ):
+        raise ValueError("invalid fee history response")
+    return result
+
+
+class FeeWindow:
+    """
+    Fee history of one chain's most recent `window_blocks` blocks.
+
+    Each tick asks eth_feeHistory only for the blocks since the newest one
+    already held (blocks_needed), and merge() appends them, dropping the
+    oldest beyond the window. Per block it keeps the base fee, gas used
+    ratio and the REWARD_PERCENTILES priority fees; fill() summarizes the
+    window into a GasSnapshot. If the head jumps further ahead than one
+    call can cover, the window restarts from the fetched range so it never
+    has holes.
+    """
+
+    def __init__(self, window_blocks=DEFAULT_WINDOW_BLOCKS, max_blocks_per_call=DEFAULT_MAX_BLOCKS_PER_CALL):
+        self.window_blocks = window_blocks
+        self.max_blocks_per_call = max_blocks_per_call
+        # (number, base_fee, gas_used_ratio, rewards), oldest first
+        self._blocks = deque(maxlen=window_blocks)
+        self._next_base_fee = None
+        self._lock = threading.Lock()
+
+        self.calls = 0
+        self.blocks_fetched = 0
+
+    def blocks_needed(self, head=None) -> int:
+        """Blocks to request ending at `head` (or latest when unknown); 0 when up to date."""
+        with self._lock:
+            count = self.window_blocks
+            if head is not None and self._blocks:
+                count = max(0, head - self._blocks[-1][0])
+        return min(count, self.window_blocks, self.max_blocks_per_call)
+
+    def merge(self, history) -> int:
+        """Append the blocks of an eth_feeHistory result newer than the window; returns how many."""
+        oldest = int(history["oldestBlock"], 16)
+        base_fees = [int(value, 16) for value in history["baseFeePerGas"]]
+        ratios = [float(value) for value in history["gasUsedRatio"]]
+        rewards = [
+            tuple(int(value, 16) for value in block_rewards)
+            for block_rewards in history.get("reward") or []
+        ]
+
+        with self._lock:
+            newest = self._blocks[-1][0] if self._blocks else None
+            if newest is not None and oldest > newest + 1:
+                self._blocks.clear()
+                newest = None
+
+            added = 0
+            for i, ratio in enumerate(ratios):
+                number = oldest + i
+                if newest is not None and number <= newest:
+                    continue
+                block_rewards = rewards[i] if i < len(rewards) else ()
+                self._blocks.append((number, base_fees[i], ratio, block_rewards))
+                added += 1
+
+            # baseFeePerGas has one extra entry: the block after the newest
+            if added and len(base_fees) > len(ratios):
+                self._next_base_fee = base_fees[len(ratios)]
+
+            self.calls += 1
+            self.blocks_fetched += added
+        return added
+
+    def fill(self, snapshot):
+        """Set the window statistics on `snapshot` and return it."""
+        with self._lock:
+            blocks = list(self._blocks)
+            next_base_fee = self._next_base_fee
+        if not blocks:
+            snapshot.failure_reason = "empty fee history"
+            return snapshot
+
+        base_fees = sorted(block[1] for block in blocks)
+        oldest_base_fee = blocks[0][1]
+
+        snapshot.oldest_block = blocks[0][0]
+        snapshot.newest_block = blocks[-1][0]
+        snapshot.window_blocks = len(blocks)
+        snapshot.base_fee = blocks[-1][1]
+        snapshot.next_base_fee = next_base_fee
+        snapshot.base_fee_p50 = _percentile(base_fees, 50)
+        snapshot.base_fee_p90 = _percentile(base_fees, 90)
+        if oldest_base_fee:
+            snapshot.base_fee_trend_pct = round((blocks[-1][1] - oldest_base_fee) / oldest_base_fee * 100, 2)
+        snapshot.gas_used_ratio = round(sum(block[2] for block in blocks) / len(blocks), 4)
+
+        # Median over the window of each block's reward at every percentile
+        for index, pct in enumerate(REWARD_PERCENTILES):
+            values = sorted(block[3][index] for block in blocks if len(block[3]) > index)
+            if values:
+                snapshot[f"priority_fee_p{pct}"] = _percentile(values, 50)
+
+        snapshot.success = True
+        return snapshot
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "window_blocks": self.window_blocks,
+                "blocks": len(self._blocks),
+                "newest_block": self._blocks[-1][0] if self._blocks else None,
+                "calls": self.calls,
+                "blocks_fetched": self.blocks_fetched,
+            }
+
+
+def collect_gas_snapshot(chain_name, chain_cfg, fee_window, transport=None, selector=None,
+                         head=None, deadline=None):
+    """
+    Update `fee_window` with one eth_feeHistory call and summarize it.
+
+    `head` is the block height the chain stage observed this tick; only the
+    blocks after the window's newest one up to it are requested, and no
+    RPC is sent when the head has not moved. Without a head the latest
+    `window_blocks` blocks are requested and merged the same way.
+    """
+    network_name = chain_cfg.get("default_network")
+    network_cfg = chain_cfg.get("networks", {}).get(network_name)
+
+    snapshot = GasSnapshot(
+        chain_name,
+        network_name,
+        observed_at=datetime.datetime.utcnow().isoformat() + "Z",
+    )
+
+    rpc_endpoints = (network_cfg or {}).get("rpc_endpoints", [])
+    if not rpc_endpoints:
+        snapshot.failure_reason = "no rpc_endpoints configured"
+        return snapshot
+
+    count = fee_window.blocks_needed(head)
+    if count == 0:
+        return fee_window.fill(snapshot)
+
+    params = [hex(count), hex(head) if head is not None else "latest", REWARD_PERCENTILES]
+    rpc_timeout_sec = network_cfg.get("rpc_timeout_sec")
+    try:
+        rpc, history = call_endpoints(
+            rpc_endpoints,
+            lambda rpc: _check_history(
+                rpc_call(rpc, "eth_feeHistory", params, rpc_timeout_sec, transport, deadline)
+            ),
+            selector,
+            deadline,
+        )
+        snapshot.blocks_fetched = fee_window.merge(history)
+    except RpcEndpointError as e:
+        snapshot.rpc = e.rpc
+        snapshot.failure_reason = str(e)
+        return snapshot
+    except (TypeError, ValueError) as e:
+        snapshot.rpc = rpc
+        snapshot.failure_reason = f"invalid fee history response: {e}"
+        return snapshot
+
+    snapshot.rpc = rpc
+    return fee_window.fill(snapshot)
@@ -0,0 +1,154 @@
+import json
+import threading
+import time
+
+from gearbox.ws import WebSocketError, connect
+
+DEFAULT_CONNECT_TIMEOUT_SEC = 5
+DEFAULT_STALE_SEC = 60
+RECONNECT_MIN_SEC = 1
+RECONNECT_MAX_SEC = 30
+
+
+class HeadSubscription:
+    """
+    Persistent eth_subscribe("newHeads") connection for one network.
+
+    A background thread keeps the latest head in memory so a tick can read
+    it without any RPC. latest() only returns a head while the subscription
+    is connected and the head is younger than `stale_sec`; callers poll over
+    HTTP otherwise. A connection that stays silent for `stale_sec` is treated
+    as dropped and reopened with exponential backoff. A reopened connection
+    starts from no head. Within one connection the node announces heads in
+    order, so every head replaces the last, including a lower one after a
+    reorg.
+    """
+
+    def __init__(self, ws_url: str, expected_chain_id: int = None, stale_sec: float = DEFAULT_STALE_SEC,
+                 connect_timeout_sec: float = DEFAULT_CONNECT_TIMEOUT_SEC, name: str = "head-stream"):
+        self.ws_url = ws_url
+        self.expected_chain_id = expected_chain_id
+        self.stale_sec = stale_sec
+        self.connect_timeout_sec = connect_timeout_sec
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._ws = None
+        self._head = None
+        self.connected = False
+        self.heads = 0
+        self.reconnects = 0
+        self.last_error = None
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._stop.set()
+        with self._lock:
+            ws = self._ws
+        if ws is not None:
+            ws.close()
+        self._thread.join(timeout=self.connect_timeout_sec)
+
+    def latest(self, now: float = None):
+        """Return the latest head dict while connected and fresh, else None."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if not self.connected or self._head is None:
+                return None
+            if now - self._head["received_at"] > self.stale_sec:
+                return None
+            return dict(self._head)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            head = self._head
+            return {
+                "connected": self.connected,
+                "block_height": head["block_height"] if head else None,
+                "head_age_sec": round(time.monotonic() - head["received_at"], 3) if head else None,
+                "heads": self.heads,
+                "reconnects": self.reconnects,
+                "last_error": self.last_error,
+            }
+
+    def _run(self):
+        backoff = RECONNECT_MIN_SEC
+        attempts = 0
+        while not self._stop.is_set():
+            if attempts:
+                with self._lock:
+                    self.reconnects += 1
+            attempts += 1
+            try:
+                self._subscribe_and_listen()
+                backoff = RECONNECT_MIN_SEC
+            except (WebSocketError, OSError, ValueError) as e:
+                with self._lock:
+                    self.last_error = str(e) or type(e).__name__
+            finally:
+                with self._lock:
+                    ws, self._ws = self._ws, None
+                    self.connected = False
+                if ws is not None:
+                    ws.close()
+
+            if self._stop.wait(backoff):
+                return
+            backoff = min(backoff * 2, RECONNECT_MAX_SEC)
+
+    def _request(self, ws, request_id, method, params):
+        ws.send(json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}))
+        while True:
+            message = json.loads(ws.recv())
+            if message.get("id") != request_id:
+                continue
+            if "error" in message:
+                raise ValueError(f"{method}: {message['error']}")
+            return message.get("result")
+
+    def _subscribe_and_listen(self):
+        ws = connect(self.ws_url, self.connect_timeout_sec)
+        with self._lock:
+            self._ws = ws
+        if self._stop.is_set():
+            return
+
+        if self.expected_chain_id is not None:
+            chain_id = int(self._request(ws, 1, "eth_chainId", []), 16)
+            if chain_id != self.expected_chain_id:
+                raise ValueError(f"chain id mismatch: expected {self.expected_chain_id}, got {chain_id}")
+        subscription = self._request(ws, 2, "eth_subscribe", ["newHeads"])
+
+        # A silent connection for longer than the stale window counts as dropped
+        ws.sock.settimeout(self.stale_sec)
+        with self._lock:
+            # The new connection may be to a node behind the previous one
+            self._head = None
+            self.connected = True
+
+        while not self._stop.is_set():
+            message = json.loads(ws.recv())
+            params = message.get("params")
+            if message.get("method") != "eth_subscription" or not isinstance(params, dict):
+                continue
+            if params.get("subscription") != subscription:
+                continue
+            self._record(params.get("result"))
+
+    def _record(self, header):
+        try:
+            head = {
+                "block_height": int(header["number"], 16),
+                "block_timestamp": int(header["timestamp"], 16),
+                "received_at": time.monotonic(),
+            }
+        except (KeyError, TypeError, ValueError):
+            return
+        with self._lock:
+            self._head = head
+            self.heads += 1
@@ -1,66 +1,39 @@
 import time
-import requests
 
-def evaluate_chain(chain_name, chain_cfg):
+from gearbox.agent.schema import Reachability
+from gearbox.engine.rpc import RpcEndpointError, call_endpoints, rpc_call
+
+
+def reachability_result(chain_name, network_name, rpc, reachable, error=None):
+    return Reachability(chain_name, network_name, rpc, reachable, int(time.time()), error)
+
+
+def evaluate_chain(chain_name, chain_cfg, transport=None, selector=None, deadline=None):
     network_name = chain_cfg.get("default_network")
     networks = chain_cfg.get("networks", {})
 
     if not network_name or network_name not in networks:
-        return {
-            "chain": chain_name,
-            "network": None,
-            "rpc": None,
-            "reachable": False,
-            "timestamp": int(time.time()),
-            "error": "default_network missing or invalid",
-        }
+        return reachability_result(
+            chain_name, None, None, False, "default_network missing or invalid"
+        )
 
     network_cfg = networks[network_name]
 
     rpc_endpoints = network_cfg.get("rpc_endpoints", [])
     rpc_timeout_sec = network_cfg.get("rpc_timeout_sec")
     if not rpc_endpoints:
-        return {
-            "chain": chain_name,
-            "network": network_name,
-            "rpc": None,
-            "reachable": False,
-            "timestamp": int(time.time()),
-            "error": "no rpc_endpoints configured",
-        }
-
-    rpc = rpc_endpoints[0]
+        return reachability_result(
+            chain_name, network_name, None, False, "no rpc_endpoints configured"
+        )
 
     try:
-        payload = {
-            "jsonrpc": "2.0",
-            "method": "eth_chainId",
-            "params": [],
-            "id": 1,
-        }
-
-        response = requests.post(rpc, json=payload, timeout=rpc_timeout_sec)
-        response.raise_for_status()
-
-        data = response.json()
-        if "result" not in data:
-            raise ValueError("invalid RPC response")
-
-        return {
-            "chain": chain_name,
-            "network": network_name,
-            "rpc": rpc,
-            "reachable": True,
-            "timestamp": int(time.time()),
-            "error": None,
-        }
-
-    except Exception as e:
-        return {
-            "chain": chain_name,
-            "network": network_name,
-            "rpc": rpc,
-            "reachable": False,
-            "timestamp": int(time.time()),
-            "error": str(e),
-        }
+        rpc, _ = call_endpoints(
+            rpc_endpoints,
+            lambda rpc: rpc_call(rpc, "eth_chainId", [], rpc_timeout_sec, transport, deadline),
+            selector,
+            deadline,
+        )
+        return reachability_result(chain_name, network_name, rpc, True)
+
+    except RpcEndpointError as e:
+        return reachability_result(chain_name, network_name, e.rpc, False, str(e))
@@ -1,8 +1,18 @@
 import datetime
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
 import requests
 from email.utils import parsedate_to_datetime
 
+from gearbox.agent.schema import OracleSnapshot
+from gearbox.trace import span
+
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_RATE_LIMIT_RETRIES = 2
+RATE_LIMIT_BACKOFF_SEC = 1
+MAX_RETRY_AFTER_SEC = 30
+
 
 def _format_utc_z(dt: datetime.datetime) -> str:
     return dt.replace(tzinfo=None).isoformat() + "Z"
@@ -34,70 +44,162 @@ def _parse_iso_utc_z_to_epoch(timestamp_str: str):
     return int(parsed.timestamp())
 
 
-def collect_oracle_snapshot(oracle_cfg: dict) -> dict:
+def oracle_pairs(oracle_cfg: dict) -> list:
+    """Return the configured asset pairs; the first is the reconciliation reference."""
+    pairs = oracle_cfg.get("asset_pairs")
+    if pairs:
+        return list(pairs)
+    asset_pair = oracle_cfg.get("asset_pair")
+    return [asset_pair] if asset_pair else []
+
+
+def _retry_after_sec(response, attempt: int) -> float:
+    """Delay before retrying a 429: Retry-After when given, else exponential with jitter."""
+    retry_after = response.headers.get("Retry-After")
+    try:
+        delay = float(retry_after)
+    except (TypeError, ValueError):
+        delay = RATE_LIMIT_BACKOFF_SEC * 2 ** attempt
+        delay += random.uniform(0, delay / 2)
+    return min(max(delay, 0.0), MAX_RETRY_AFTER_SEC)
+
+
+def _get_with_backoff(http, url, timeout_sec, limiter, retries, snapshot, deadline=None):
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.acquire(deadline)
+        request_timeout = deadline.timeout(timeout_sec) if deadline is not None else timeout_sec
+        response = http.get(url, timeout=request_timeout)
+        if response.status_code != 429 or attempt == retries:
+            return response
+
+        snapshot.rate_limited += 1
+        delay = _retry_after_sec(response, attempt)
+        # A retry that cannot be sent before the tick deadline is not worth waiting for
+        if deadline is not None and delay >= deadline.remaining():
+            return response
+        if limiter is not None:
+            limiter.backoff(delay)
+        elif deadline is not None:
+            deadline.sleep(delay)
+        else:
+            time.sleep(delay)
+    return response
+
+
+def collect_oracle_snapshot(oracle_cfg: dict, transport=None, asset_pair=None, limiter=None,
+                            cache=None, deadline=None) -> dict:
+    """
+    Fetch the spot price of one asset pair (default: the first configured).
+
+    Requests take a token from `limiter` when given. 429 responses are
+    retried up to `rate_limit_retries` times after Retry-After or an
+    exponential backoff, which also holds back the limiter's other callers.
+    With a `deadline`, request timeouts, limiter waits and backoffs are
+    capped at the time left in the tick. With an OracleCache, a fresh cached
+    snapshot is returned instead and concurrent fetches of the same pair
+    share one request.
+    """
+    if asset_pair is None:
+        pairs = oracle_pairs(oracle_cfg)
+        asset_pair = pairs[0] if pairs else None
+    if cache is None or not asset_pair:
+        return _fetch_snapshot(oracle_cfg, asset_pair, transport, limiter, deadline)
+    return cache.get_or_fetch(
+        oracle_cfg.get("provider"),
+        asset_pair,
+        lambda: _fetch_snapshot(oracle_cfg, asset_pair, transport, limiter, deadline),
+    )
+
+
+def _fetch_snapshot(oracle_cfg: dict, asset_pair, transport, limiter, deadline=None) -> dict:
     provider = oracle_cfg.get("provider")
     endpoint_url = oracle_cfg.get("endpoint_url")
-    asset_pair = oracle_cfg.get("asset_pair")
     timeout_sec = oracle_cfg.get("timeout_sec", 5)
+    retries = oracle_cfg.get("rate_limit_retries", DEFAULT_RATE_LIMIT_RETRIES)
 
     observed_at = _format_utc_z(datetime.datetime.utcnow())
 
-    snapshot = {
-        "source": provider,
-        "asset": asset_pair,
-        "price": None,
-        "latency_ms": None,
-        "observed_at": observed_at,
-        "source_timestamp": observed_at,
-        "timestamp_epoch": None,
-        "success": False,
-        "failure_reason": None,
-    }
+    snapshot = OracleSnapshot(
+        provider,
+        asset_pair,
+        observed_at=observed_at,
+        source_timestamp=observed_at,
+    )
 
     if not endpoint_url or "{asset_pair}" not in endpoint_url:
-        snapshot["failure_reason"] = "invalid_endpoint_url"
+        snapshot.failure_reason = "invalid_endpoint_url"
         return snapshot
 
     if not asset_pair:
-        snapshot["failure_reason"] = "missing_asset_pair"
+        snapshot.failure_reason = "missing_asset_pair"
         return snapshot
 
     url = endpoint_url.format(asset_pair=asset_pair)
 
     start = time.monotonic()
     try:
-        response = requests.get(url, timeout=timeout_sec)
-        response.raise_for_status()
-        data = response.json()
+        http = transport if transport is not None else requests
+        with span(provider or "oracle", "http", url=url):
+            response = _get_with_backoff(http, url, timeout_sec, limiter, retries, snapshot, deadline)
+            response.raise_for_status()
+            data = response.json()
     except Exception as e:
         end = time.monotonic()
-        snapshot["latency_ms"] = int((end - start) * 1000)
-        snapshot["failure_reason"] = str(e)
+        snapshot.latency_ms = int((end - start) * 1000)
+        snapshot.failure_reason = str(e)
         return snapshot
 
     end = time.monotonic()
-    snapshot["latency_ms"] = int((end - start) * 1000)
+    snapshot.latency_ms = int((end - start) * 1000)
 
     date_header = response.headers.get("Date")
     parsed_date = _parse_http_date(date_header)
     if parsed_date is not None:
-        snapshot["source_timestamp"] = _format_utc_z(parsed_date)
+        snapshot.source_timestamp = _format_utc_z(parsed_date)
 
-    snapshot["timestamp_epoch"] = (
-        _parse_iso_utc_z_to_epoch(snapshot["source_timestamp"])
-        or _parse_iso_utc_z_to_epoch(snapshot["observed_at"])
+    snapshot.timestamp_epoch = (
+        _parse_iso_utc_z_to_epoch(snapshot.source_timestamp)
+        or _parse_iso_utc_z_to_epoch(snapshot.observed_at)
     )
 
     try:
         price = data["data"]["amount"]
     except Exception:
-        snapshot["failure_reason"] = "missing_price"
+        snapshot.failure_reason = "missing_price"
         return snapshot
 
     if not isinstance(price, str):
-        snapshot["failure_reason"] = "invalid_price_type"
+        snapshot.failure_reason = "invalid_price_type"
         return snapshot
 
-    snapshot["price"] = price
-    snapshot["success"] = True
+    snapshot.price = price
+    snapshot.success = True
     return snapshot
+
+
+def collect_oracle_snapshots(oracle_cfg: dict, transport=None, limiter=None, executor=None,
+                             cache=None, deadline=None) -> dict:
+    """
+    Fetch every configured asset pair concurrently; returns {asset_pair: snapshot}
+    in configuration order.
+
+    Fetches share `transport`'s connection pool and `limiter`. Without an
+    `executor`, a temporary pool of `max_concurrency` threads is used.
+    """
+    pairs = oracle_pairs(oracle_cfg)
+    if len(pairs) <= 1:
+        snapshot = collect_oracle_snapshot(
+            oracle_cfg, transport, limiter=limiter, cache=cache, deadline=deadline
+        )
+        return {snapshot.asset: snapshot}
+
+    def fetch(asset_pair):
+        return collect_oracle_snapshot(oracle_cfg, transport, asset_pair, limiter, cache, deadline)
+
+    if executor is not None:
+        return dict(zip(pairs, executor.map(fetch, pairs)))
+
+    max_workers = min(len(pairs), oracle_cfg.get("max_concurrency", DEFAULT_MAX_CONCURRENCY))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gearbox-oracle") as pool:
+        return dict(zip(pairs, pool.map(fetch, pairs)))
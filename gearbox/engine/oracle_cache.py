@@ -0,0 +1,114 @@
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.snapshot = None
+        self.error = None
+
+
+class OracleCache:
+    """
+    TTL cache of oracle snapshots keyed by (provider, asset_pair), bounded
+    with LRU eviction.
+
+    Only successful snapshots are cached. A hit returns a copy marked
+    `cached` with its `cache_age_ms`; `timestamp_epoch` and
+    `source_timestamp` keep the provider's original values so reconciliation
+    still measures true staleness. Concurrent lookups for a key that is
+    already being fetched wait for that fetch instead of issuing their own.
+    """
+
+    def __init__(self, ttl_sec: float, max_entries: int = DEFAULT_MAX_ENTRIES, pair_ttl_sec=None):
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self.pair_ttl_sec = dict(pair_ttl_sec or {})
+
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def ttl_for(self, asset_pair) -> float:
+        return self.pair_ttl_sec.get(asset_pair, self.ttl_sec)
+
+    def _fresh(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        fetched_at, snapshot = entry
+        if now - fetched_at > self.ttl_for(key[1]):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        cached = snapshot.copy()
+        cached["cached"] = True
+        cached["cache_age_ms"] = int((now - fetched_at) * 1000)
+        cached["rate_limited"] = 0
+        return cached
+
+    def get_or_fetch(self, provider, asset_pair, fetch):
+        """Return a fresh cached snapshot, or the result of `fetch()` (shared by concurrent callers)."""
+        key = (provider, asset_pair)
+        with self._lock:
+            cached = self._fresh(key, time.monotonic())
+            if cached is not None:
+                self.hits += 1
+                return cached
+            in_flight = self._in_flight.get(key)
+            owner = in_flight is None
+            if owner:
+                in_flight = _InFlight()
+                self._in_flight[key] = in_flight
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            in_flight.done.wait()
+            if in_flight.error is not None:
+                raise in_flight.error
+            shared = in_flight.snapshot.copy()
+            shared["rate_limited"] = 0
+            return shared
+
+        try:
+            snapshot = fetch()
+        except Exception as e:
+            in_flight.error = e
+            raise
+        else:
+            in_flight.snapshot = snapshot
+            if snapshot.get("success"):
+                with self._lock:
+                    self._entries[key] = (time.monotonic(), snapshot)
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.max_entries:
+                        self._entries.popitem(last=False)
+                        self.evictions += 1
+            return snapshot.copy()
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            in_flight.done.set()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "hit_ratio": round((self.hits + self.coalesced) / lookups, 3) if lookups else None,
+            }
@@ -1,4 +1,7 @@
-def reconcile(chain_snapshot: dict, oracle_snapshot: dict, cfg: dict) -> dict:
+from gearbox.agent.schema import Reconciliation
+
+
+def reconcile(chain_snapshot, oracle_snapshot, cfg: dict) -> Reconciliation:
     max_time_skew_sec = cfg.get("max_time_skew_sec")
 
     chain_epoch = chain_snapshot.get("timestamp_epoch")
@@ -6,13 +9,13 @@ def reconcile(chain_snapshot: dict, oracle_snapshot: dict, cfg: dict) -> dict:
     oracle_success = oracle_snapshot.get("success", False)
 
     if not oracle_success:
-        return {
-            "chain_timestamp_epoch": chain_epoch,
-            "oracle_timestamp_epoch": oracle_epoch,
-            "delta_sec": None,
-            "status": "unavailable",
-            "reason": "oracle_unavailable",
-        }
+        return Reconciliation(
+            chain_timestamp_epoch=chain_epoch,
+            oracle_timestamp_epoch=oracle_epoch,
+            delta_sec=None,
+            status="unavailable",
+            reason="oracle_unavailable",
+        )
 
     if (
         max_time_skew_sec is None
@@ -20,27 +23,27 @@ def reconcile(chain_snapshot: dict, oracle_snapshot: dict, cfg: dict) -> dict:
         or chain_epoch is None
         or oracle_epoch is None
     ):
-        return {
-            "chain_timestamp_epoch": chain_epoch,
-            "oracle_timestamp_epoch": oracle_epoch,
-            "delta_sec": None,
-            "status": "degraded",
-            "reason": "missing_timestamp_epoch",
-        }
+        return Reconciliation(
+            chain_timestamp_epoch=chain_epoch,
+            oracle_timestamp_epoch=oracle_epoch,
+            delta_sec=None,
+            status="degraded",
+            reason="missing_timestamp_epoch",
+        )
 
     delta_sec = abs(oracle_epoch - chain_epoch)
     if delta_sec <= max_time_skew_sec:
-        return {
-            "chain_timestamp_epoch": chain_epoch,
-            "oracle_timestamp_epoch": oracle_epoch,
-            "delta_sec": delta_sec,
-            "status": "ok",
-        }
+        return Reconciliation(
+            chain_timestamp_epoch=chain_epoch,
+            oracle_timestamp_epoch=oracle_epoch,
+            delta_sec=delta_sec,
+            status="ok",
+        )
 
-    return {
-        "chain_timestamp_epoch": chain_epoch,
-        "oracle_timestamp_epoch": oracle_epoch,
-        "delta_sec": delta_sec,
-        "status": "degraded",
-        "reason": "oracle_time_skew",
-    }
+    return Reconciliation(
+        chain_timestamp_epoch=chain_epoch,
+        oracle_timestamp_epoch=oracle_epoch,
+        delta_sec=delta_sec,
+        status="degraded",
+        reason="oracle_time_skew",
+    )
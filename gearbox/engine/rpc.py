@@ -0,0 +1,129 @@
+import requests
+
+from gearbox.deadline import DeadlineExceeded
+from gearbox.trace import span
+
+
+class RpcEndpointError(Exception):
+    """Raised when no endpoint answered; `rpc` is the last endpoint tried."""
+
+    def __init__(self, rpc, error):
+        super().__init__(str(error))
+        self.rpc = rpc
+        self.error = error
+
+
+def _payload(method, params, request_id):
+    return {
+        "jsonrpc": "2.0",
+        "method": method,
+        "params": params,
+        "id": request_id,
+    }
+
+
+def _post(http, rpc, payload, timeout_sec, deadline):
+    """POST within the tick deadline; a timeout caused by the deadline raises DeadlineExceeded."""
+    if deadline is None:
+        return http.post(rpc, json=payload, timeout=timeout_sec)
+    try:
+        return http.post(rpc, json=payload, timeout=deadline.timeout(timeout_sec))
+    except requests.exceptions.Timeout as e:
+        if deadline.expired():
+            raise DeadlineExceeded("tick deadline exceeded") from e
+        raise
+
+
+def rpc_call(rpc, method, params, timeout_sec: int, transport=None, deadline=None):
+    http = transport if transport is not None else requests
+    with span(method, "rpc", rpc=rpc):
+        response = _post(http, rpc, _payload(method, params, 1), timeout_sec, deadline)
+        response.raise_for_status()
+        data = response.json()
+
+    if "result" not in data:
+        raise ValueError("invalid RPC response")
+
+    return data["result"]
+
+
+def rpc_batch(rpc, calls, timeout_sec: int, transport=None, deadline=None) -> list:
+    """
+    Send `calls` ([(method, params), ...]) as one JSON-RPC 2.0 batch.
+
+    Returns one entry per call, in call order: the call's result, or the
+    exception describing why that call failed. Responses are matched back
+    to calls by id, since servers may answer a batch in any order. Failures
+    of the request as a whole (transport, HTTP status, non-array body) are
+    raised.
+    """
+    payload = [_payload(method, params, i + 1) for i, (method, params) in enumerate(calls)]
+
+    http = transport if transport is not None else requests
+    with span("batch", "rpc", rpc=rpc, methods=[method for method, _ in calls]):
+        response = _post(http, rpc, payload, timeout_sec, deadline)
+        response.raise_for_status()
+        data = response.json()
+
+    if not isinstance(data, list):
+        raise ValueError("invalid RPC batch response")
+
+    by_id = {}
+    for entry in data:
+        if isinstance(entry, dict) and "id" in entry:
+            by_id[entry["id"]] = entry
+
+    results = []
+    for i in range(len(calls)):
+        entry = by_id.get(i + 1)
+        if entry is None or "result" not in entry:
+            results.append(ValueError("invalid RPC response"))
+        else:
+            results.append(entry["result"])
+
+    return results
+
+
+def is_transient(error) -> bool:
+    """True for failures worth retrying: connection errors, timeouts, 429 and 5xx."""
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    if isinstance(error, requests.exceptions.HTTPError) and error.response is not None:
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return False
+
+
+def _call_once(rpc_endpoints, fn, selector):
+    if selector is not None:
+        return selector.execute(fn)
+
+    rpc = rpc_endpoints[0]
+    try:
+        return rpc, fn(rpc)
+    except Exception as e:
+        raise RpcEndpointError(rpc, e)
+
+
+def call_endpoints(rpc_endpoints, fn, selector=None, deadline=None):
+    """
+    Run `fn(rpc)` against the configured endpoints and return (rpc, result).
+
+    Without a selector the first endpoint is used, as before. With one, the
+    selector ranks, fails over and hedges across all endpoints. Failures are
+    raised as RpcEndpointError so callers can report which endpoint failed.
+    With a tick `deadline`, transient failures are retried after a jittered
+    backoff for as long as the deadline's retry budget and time allow.
+    """
+    attempt = 0
+    while True:
+        try:
+            return _call_once(rpc_endpoints, fn, selector)
+        except RpcEndpointError as e:
+            if deadline is None or not is_transient(e.error):
+                raise
+            delay = deadline.retry_delay(attempt)
+            if delay is None:
+                raise
+        deadline.sleep(delay)
+        attempt += 1
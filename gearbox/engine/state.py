@@ -0,0 +1,276 @@
+import array
+import json
+import math
+import mmap
+import os
+import sys
+
+# Null markers for fixed-width columns
+NULL_INT = -(2 ** 63)
+NULL_FLOAT = float("nan")
+
+STATUS_CODES = {
+    None: 0,
+    "ok": 1,
+    "degraded": 2,
+    "unavailable": 3,
+    "failed": 4,
+    "cached": 5,
+}
+
+# (column name, array typecode); every column holds one value per tick.
+CHAIN_COLUMNS = [
+    ("tick", "q"),
+    ("observed_epoch", "d"),
+    ("block_height", "q"),
+    ("block_timestamp", "q"),
+    ("gas_price", "q"),
+    ("status", "B"),
+]
+
+GAS_COLUMNS = [
+    ("tick", "q"),
+    ("observed_epoch", "d"),
+    ("newest_block", "q"),
+    ("base_fee", "q"),
+    ("next_base_fee", "q"),
+    ("base_fee_p50", "q"),
+    ("priority_fee_p50", "q"),
+    ("gas_used_ratio", "d"),
+    ("status", "B"),
+]
+
+ORACLE_COLUMNS = [
+    ("tick", "q"),
+    ("observed_epoch", "d"),
+    ("price", "d"),
+    ("latency_ms", "q"),
+    ("status", "B"),
+]
+
+RECONCILIATION_COLUMNS = [
+    ("tick", "q"),
+    ("observed_epoch", "d"),
+    ("delta_sec", "q"),
+    ("status", "B"),
+]
+
+SCHEMA_FILE = "schema.json"
+
+# numpy dtype strings for each typecode, for np.memmap consumers
+_DTYPES = {"q": "i8", "d": "f8", "B": "u1"}
+
+
+def _to_int(value):
+    if value is None:
+        return NULL_INT
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return NULL_INT
+    if not NULL_INT < value < 2 ** 63:
+        return NULL_INT
+    return value
+
+
+def _to_float(value):
+    if value is None:
+        return NULL_FLOAT
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return NULL_FLOAT
+
+
+def _encode(typecode, value):
+    if typecode == "q":
+        value = _to_int(value)
+    elif typecode == "d":
+        value = _to_float(value)
+    else:
+        value = STATUS_CODES.get(value, 0)
+    return array.array(typecode, [value]).tobytes()
+
+
+def _oracle_status(snapshot):
+    if not snapshot.get("success"):
+        return "failed"
+    return "cached" if snapshot.get("cached") else "ok"
+
+
+class ColumnSet:
+    """
+    Append-only set of fixed-width column files in one directory.
+
+    Each column is a flat file of native-endian values (`<name>.col`) with
+    one entry per row, described by schema.json. Rows are appended to every
+    column together; on open, columns are truncated to the shortest one so
+    a torn append can never leave them misaligned.
+    """
+
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = list(columns)
+        os.makedirs(path, exist_ok=True)
+
+        schema = {
+            "byteorder": sys.byteorder,
+            "columns": [
+                {
+                    "name": name,
+                    "typecode": code,
+                    "dtype": ("<" if sys.byteorder == "little" else ">") + _DTYPES[code],
+                    "itemsize": array.array(code).itemsize,
+                    "file": f"{name}.col",
+                }
+                for name, code in self.columns
+            ],
+        }
+        schema_path = os.path.join(path, SCHEMA_FILE)
+        if os.path.exists(schema_path):
+            with open(schema_path, "r", encoding="utf-8") as f:
+                if json.load(f) != schema:
+                    raise ValueError(f"column schema mismatch in {path}")
+        else:
+            with open(schema_path, "w", encoding="utf-8") as f:
+                json.dump(schema, f, indent=2)
+
+        self.rows = self._align()
+        self._files = {
+            name: open(os.path.join(path, f"{name}.col"), "ab")
+            for name, _ in self.columns
+        }
+
+    def _align(self) -> int:
+        counts = {}
+        for name, code in self.columns:
+            col_path = os.path.join(self.path, f"{name}.col")
+            size = os.path.getsize(col_path) if os.path.exists(col_path) else 0
+            counts[name] = size // array.array(code).itemsize
+
+        rows = min(counts.values()) if counts else 0
+        for name, code in self.columns:
+            col_path = os.path.join(self.path, f"{name}.col")
+            if os.path.exists(col_path) and counts[name] != rows:
+                with open(col_path, "r+b") as f:
+                    f.truncate(rows * array.array(code).itemsize)
+        return rows
+
+    def append(self, row: dict):
+        for name, code in self.columns:
+            self._files[name].write(_encode(code, row.get(name)))
+        self.rows += 1
+
+    def flush(self):
+        for f in self._files.values():
+            f.flush()
+
+    def close(self):
+        for f in self._files.values():
+            f.close()
+
+
+def _safe_name(name) -> str:
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in str(name))
+
+
+class SnapshotStore:
+    """
+    Columnar time-series store for per-tick snapshots.
+
+    Layout under `data_dir`:
+        chains/<chain>/                 one ColumnSet per chain
+        gas/<chain>/                    one ColumnSet per chain with fee history
+        oracle/<asset>/                 one ColumnSet per asset pair
+        reconciliation/<chain>.<asset>/ one ColumnSet per compared pair
+    """
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self._sets = {}
+
+    def _set(self, kind, key, columns) -> ColumnSet:
+        path = os.path.join(self.data_dir, kind, _safe_name(key))
+        column_set = self._sets.get(path)
+        if column_set is None:
+            column_set = ColumnSet(path, columns)
+            self._sets[path] = column_set
+        return column_set
+
+    def record_chain(self, tick, observed_epoch, orientation: dict):
+        self._set("chains", orientation["chain"], CHAIN_COLUMNS).append({
+            "tick": tick,
+            "observed_epoch": observed_epoch,
+            "block_height": orientation.get("block_height"),
+            "block_timestamp": orientation.get("block_timestamp"),
+            "gas_price": orientation.get("gas_price"),
+            "status": "ok" if orientation.get("success") else "failed",
+        })
+
+    def record_gas(self, tick, observed_epoch, snapshot: dict):
+        self._set("gas", snapshot["chain"], GAS_COLUMNS).append({
+            "tick": tick,
+            "observed_epoch": observed_epoch,
+            "newest_block": snapshot.get("newest_block"),
+            "base_fee": snapshot.get("base_fee"),
+            "next_base_fee": snapshot.get("next_base_fee"),
+            "base_fee_p50": snapshot.get("base_fee_p50"),
+            "priority_fee_p50": snapshot.get("priority_fee_p50"),
+            "gas_used_ratio": snapshot.get("gas_used_ratio"),
+            "status": "ok" if snapshot.get("success") else "failed",
+        })
+
+    def record_oracle(self, tick, observed_epoch, snapshot: dict):
+        self._set("oracle", snapshot["asset"], ORACLE_COLUMNS).append({
+            "tick": tick,
+            "observed_epoch": observed_epoch,
+            "price": snapshot.get("price"),
+            "latency_ms": snapshot.get("latency_ms"),
+            "status": _oracle_status(snapshot),
+        })
+
+    def record_reconciliation(self, tick, observed_epoch, chain_name, asset, reconciliation: dict):
+        key = f"{chain_name}.{asset}"
+        self._set("reconciliation", key, RECONCILIATION_COLUMNS).append({
+            "tick": tick,
+            "observed_epoch": observed_epoch,
+            "delta_sec": reconciliation.get("delta_sec"),
+            "status": reconciliation.get("status"),
+        })
+
+    def flush(self):
+        for column_set in self._sets.values():
+            column_set.flush()
+
+    def close(self):
+        for column_set in self._sets.values():
+            column_set.close()
+        self._sets = {}
+
+
+def open_column(set_path, name) -> memoryview:
+    """
+    Map one column of a ColumnSet read-only, without copying.
+
+    Returns a typed memoryview over the mapped file; with numpy the same file
+    can be opened via np.memmap using the dtype recorded in schema.json.
+    """
+    with open(os.path.join(set_path, SCHEMA_FILE), "r", encoding="utf-8") as f:
+        schema = json.load(f)
+    column = next(c for c in schema["columns"] if c["name"] == name)
+    rows = min(
+        os.path.getsize(os.path.join(set_path, c["file"])) // c["itemsize"]
+        for c in schema["columns"]
+    )
+
+    with open(os.path.join(set_path, column["file"]), "rb") as f:
+        if rows == 0:
+            return memoryview(b"").cast(column["typecode"])
+        mapped = mmap.mmap(f.fileno(), rows * column["itemsize"], access=mmap.ACCESS_READ)
+    return memoryview(mapped).cast(column["typecode"])
+
+
+def is_null(value) -> bool:
+    if isinstance(value, float):
+        return math.isnan(value)
+    return value == NULL_INT
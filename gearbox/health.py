@@ -1,8 +1,120 @@
+import array
+import math
 import time
 
+DEFAULT_WINDOW_TICKS = 60
+DEFAULT_MIN_WINDOW_TICKS = 10
+
+# Tick latency histogram: log-spaced bucket upper bounds from 1ms growing by
+# 10% per bucket (~130 buckets up to ~5 minutes), so percentiles are within
+# 10% of the true value and cost a fixed-size scan to read.
+LATENCY_BUCKET_BASE_MS = 1.0
+LATENCY_BUCKET_GROWTH = 1.1
+LATENCY_BUCKETS = 132
+
+
+def _latency_bucket(duration_ms: float) -> int:
+    if duration_ms <= LATENCY_BUCKET_BASE_MS:
+        return 0
+    index = math.ceil(math.log(duration_ms / LATENCY_BUCKET_BASE_MS, LATENCY_BUCKET_GROWTH))
+    return min(index, LATENCY_BUCKETS - 1)
+
+
+def _bucket_upper_ms(index: int) -> float:
+    return LATENCY_BUCKET_BASE_MS * LATENCY_BUCKET_GROWTH ** index
+
+
+class RollingWindow:
+    """
+    Outcomes and durations of the last `size` ticks in fixed-size ring
+    buffers.
+
+    Each record() overwrites the oldest slot and adjusts a running failure
+    count and a bucketed latency histogram, so recording is O(1) and memory
+    never grows. Percentiles read the histogram (a fixed number of buckets)
+    and are reported as the bucket's upper bound.
+    """
+
+    __slots__ = ("size", "count", "failures", "_next", "_failed", "_bucket", "_histogram")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.count = 0
+        self.failures = 0
+        self._next = 0
+        self._failed = bytearray(size)
+        # Latency bucket of each slot; -1 when the tick had no duration
+        self._bucket = array.array("h", [-1]) * size
+        self._histogram = array.array("I", [0]) * LATENCY_BUCKETS
+
+    def record(self, failed: bool, duration_ms: float = None):
+        slot = self._next
+        if self.count == self.size:
+            self.failures -= self._failed[slot]
+            old_bucket = self._bucket[slot]
+            if old_bucket >= 0:
+                self._histogram[old_bucket] -= 1
+        else:
+            self.count += 1
+
+        self._failed[slot] = 1 if failed else 0
+        self.failures += self._failed[slot]
+        if duration_ms is None:
+            self._bucket[slot] = -1
+        else:
+            bucket = _latency_bucket(duration_ms)
+            self._bucket[slot] = bucket
+            self._histogram[bucket] += 1
+        self._next = (slot + 1) % self.size
+
+    def failure_rate(self):
+        return self.failures / self.count if self.count else None
+
+    def percentile_ms(self, pct: float):
+        total = sum(self._histogram)
+        if not total:
+            return None
+        rank = max(1, math.ceil(pct / 100 * total))
+        seen = 0
+        for index, n in enumerate(self._histogram):
+            seen += n
+            if seen >= rank:
+                return round(_bucket_upper_ms(index), 1)
+        return None
+
+    def snapshot(self) -> dict:
+        rate = self.failure_rate()
+        return {
+            "ticks": self.count,
+            "failures": self.failures,
+            "failure_rate": round(rate, 3) if rate is not None else None,
+            "p50_ms": self.percentile_ms(50),
+            "p95_ms": self.percentile_ms(95),
+            "p99_ms": self.percentile_ms(99),
+        }
+
 
 class RuntimeHealth:
-    def __init__(self, pause_after_failures: int, halt_after_failures: int):
+    __slots__ = (
+        "start_time", "last_success_ts", "last_failure_ts",
+        "total_checks", "consecutive_failures", "total_warnings",
+        "healthy", "paused", "halted",
+        "last_error", "last_warning",
+        "breakers",
+        "window", "degraded_since", "degraded_total_sec",
+        "pause_after_failures", "halt_after_failures",
+        "pause_failure_rate", "halt_failure_rate", "min_window_ticks",
+    )
+
+    def __init__(
+        self,
+        pause_after_failures: int,
+        halt_after_failures: int,
+        window_ticks: int = DEFAULT_WINDOW_TICKS,
+        pause_failure_rate: float = None,
+        halt_failure_rate: float = None,
+        min_window_ticks: int = DEFAULT_MIN_WINDOW_TICKS,
+    ):
         # Timestamps
         self.start_time = time.time()
         self.last_success_ts = None
@@ -22,29 +134,59 @@ class RuntimeHealth:
         self.last_error = None
         self.last_warning = None
 
+        # Per-endpoint circuit breaker states, keyed by chain then endpoint
+        self.breakers = {}
+
+        # Rolling outcomes and tick durations of the last window_ticks ticks
+        self.window = RollingWindow(window_ticks)
+
+        # Time spent unhealthy (failed, paused or halted)
+        self.degraded_since = None
+        self.degraded_total_sec = 0.0
+
         # Thresholds
         self.pause_after_failures = pause_after_failures
         self.halt_after_failures = halt_after_failures
+        self.pause_failure_rate = pause_failure_rate
+        self.halt_failure_rate = halt_failure_rate
+        self.min_window_ticks = min_window_ticks
+
+    def _set_healthy(self, healthy: bool, now: float):
+        if healthy and self.degraded_since is not None:
+            self.degraded_total_sec += now - self.degraded_since
+            self.degraded_since = None
+        elif not healthy and self.degraded_since is None:
+            self.degraded_since = now
+        self.healthy = healthy
 
-    def record_success(self):
+    def degraded_sec(self, now: float = None) -> float:
+        """Total time spent unhealthy, including the current degraded stretch."""
+        now = time.time() if now is None else now
+        if self.degraded_since is None:
+            return self.degraded_total_sec
+        return self.degraded_total_sec + now - self.degraded_since
+
+    def record_success(self, duration_ms: float = None):
         """Call when an evaluation cycle succeeds."""
         now = time.time()
         self.total_checks += 1
         self.last_success_ts = now
         self.consecutive_failures = 0
         self.last_error = None
-        self.healthy = True
+        self.window.record(False, duration_ms)
+        self._set_healthy(True, now)
         if self.paused:
             self.clear_pause()
 
-    def record_failure(self, error_msg: str):
+    def record_failure(self, error_msg: str, duration_ms: float = None):
         """Call when an evaluation cycle fails."""
         now = time.time()
         self.total_checks += 1
         self.last_failure_ts = now
         self.consecutive_failures += 1
         self.last_error = error_msg
-        self.healthy = False
+        self.window.record(True, duration_ms)
+        self._set_healthy(False, now)
         self.last_warning = None
 
     def record_warning(self, warning_msg: str):
@@ -52,14 +194,27 @@ class RuntimeHealth:
         self.total_warnings += 1
         self.last_warning = warning_msg
 
+    def record_breakers(self, chain_name: str, breakers: dict):
+        """Record the current circuit breaker state of each endpoint of a chain."""
+        self.breakers[chain_name] = breakers
+
+    def _window_rate_at_least(self, threshold) -> bool:
+        if threshold is None or self.window.count < self.min_window_ticks:
+            return False
+        return self.window.failure_rate() >= threshold
+
     def should_pause(self) -> bool:
         """
         Return True if the runtime should enter a paused (degraded) state.
 
         Pause is intended for persistent but potentially recoverable issues.
         """
-        # Pause after a small number of consecutive failures
-        return self.consecutive_failures >= self.pause_after_failures
+        # Pause after a small number of consecutive failures, or while the
+        # rolling failure rate stays high despite intermittent successes
+        return (
+            self.consecutive_failures >= self.pause_after_failures
+            or self._window_rate_at_least(self.pause_failure_rate)
+        )
 
     def should_halt(self) -> bool:
         """
@@ -68,23 +223,26 @@ class RuntimeHealth:
         Halt is intended for sustained failure indicating a non-recoverable
         or unsafe operating condition for this run.
         """
-        # Halt after sustained consecutive failures
-        return self.consecutive_failures >= self.halt_after_failures
+        # Halt after sustained consecutive failures or a sustained failure rate
+        return (
+            self.consecutive_failures >= self.halt_after_failures
+            or self._window_rate_at_least(self.halt_failure_rate)
+        )
 
     def enter_pause(self):
         """Set the runtime to paused state."""
         self.paused = True
-        self.healthy = False
+        self._set_healthy(False, time.time())
 
     def clear_pause(self):
         """Clear the paused state and mark as healthy."""
         self.paused = False
-        self.healthy = True
+        self._set_healthy(True, time.time())
 
     def enter_halt(self):
         """Set the runtime to halted state."""
         self.halted = True
-        self.healthy = False
+        self._set_healthy(False, time.time())
         self.paused = False
 
     def snapshot(self) -> dict:
@@ -98,4 +256,7 @@ class RuntimeHealth:
             "total_warnings": self.total_warnings,
             "last_error": self.last_error,
             "last_warning": self.last_warning,
+            "window": self.window.snapshot(),
+            "degraded_sec": round(self.degraded_sec(), 3),
+            "breakers": dict(self.breakers),
         }
@@ -0,0 +1,216 @@
+import logging
+import queue
+import threading
+import time
+
+DROP_NEWEST = "drop_newest"
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+OVERFLOW_POLICIES = (DROP_NEWEST, DROP_OLDEST, BLOCK)
+LOG_FORMATS = ("ndjson", "pretty")
+
+_STOP = object()
+
+# Tick number stamped on records as they are queued; None before the first tick.
+_current_tick = None
+
+
+def set_current_tick(tick):
+    global _current_tick
+    _current_tick = tick
+
+
+def current_tick():
+    return _current_tick
+
+
+class StreamSink:
+    """Write formatted records to an already-open text stream."""
+
+    def __init__(self, stream, formatter):
+        self.stream = stream
+        self.formatter = formatter
+
+    def write(self, records):
+        lines = []
+        for record in records:
+            lines.append(format_record(self.formatter, record))
+        self.stream.write("\n".join(lines) + "\n")
+
+    def flush(self):
+        self.stream.flush()
+
+    def close(self):
+        self.flush()
+
+
+def format_record(formatter, record) -> str:
+    try:
+        return formatter.format(record)
+    except Exception:
+        return f"<unformattable log record: {record.getMessage()!r}>"
+
+
+class LogWriter:
+    """
+    Background writer for log records.
+
+    Records are queued by QueueingHandler and formatted and written on a
+    dedicated thread in batches, so the tick thread never formats or touches
+    the disk. The queue is bounded; when it is full the overflow policy
+    decides whether the new record is dropped, the oldest queued record is
+    dropped, or the caller blocks. Drops are counted and reported in the
+    log stream once there is room again.
+    """
+
+    def __init__(
+        self,
+        sinks,
+        queue_size: int = 10000,
+        overflow: str = DROP_OLDEST,
+        batch_size: int = 256,
+        flush_interval_ms: int = 500,
+    ):
+        # Sinks provide write(records), flush() and close(), and own their formatter.
+        self.sinks = list(sinks)
+        self.overflow = overflow
+        self.batch_size = batch_size
+        self.flush_interval_sec = flush_interval_ms / 1000
+
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = threading.Thread(target=self._run, name="gearbox-log", daemon=True)
+        self._thread.start()
+
+    def configure(self, queue_size=None, overflow=None, batch_size=None, flush_interval_ms=None):
+        if queue_size is not None:
+            with self._queue.mutex:
+                self._queue.maxsize = queue_size
+        if overflow is not None:
+            self.overflow = overflow
+        if batch_size is not None:
+            self.batch_size = batch_size
+        if flush_interval_ms is not None:
+            self.flush_interval_sec = flush_interval_ms / 1000
+
+    def set_formatter(self, formatter):
+        for sink in self.sinks:
+            sink.formatter = formatter
+
+    def enqueue(self, record):
+        if self.overflow == BLOCK:
+            self._queue.put(record)
+            return
+
+        try:
+            self._queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+
+        if self.overflow == DROP_OLDEST:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                pass
+        # Any logging thread can get here
+        with self._queue.mutex:
+            self.dropped += 1
+
+    def _drop_report(self):
+        with self._queue.mutex:
+            dropped = self.dropped
+        if dropped == self._reported_dropped:
+            return None
+        record = logging.LogRecord(
+            "gearbox.log", logging.WARNING, __file__, 0,
+            "Log records dropped", None, None,
+        )
+        record.tick = _current_tick
+        record.data = {
+            "dropped_since_last_report": dropped - self._reported_dropped,
+            "dropped_total": dropped,
+            "overflow_policy": self.overflow,
+        }
+        self._reported_dropped = dropped
+        return record
+
+    def _write(self, records):
+        for sink in self.sinks:
+            try:
+                sink.write(records)
+            except Exception:
+                pass
+
+    def _flush(self):
+        for sink in self.sinks:
+            try:
+                sink.flush()
+            except Exception:
+                pass
+
+    def _run(self):
+        last_flush = time.monotonic()
+        stopping = False
+
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=self.flush_interval_sec)
+            except queue.Empty:
+                item = None
+
+            batch = []
+            while item is not None:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            report = self._drop_report()
+            if report is not None:
+                batch.append(report)
+
+            if batch:
+                self._write(batch)
+
+            now = time.monotonic()
+            if stopping or now - last_flush >= self.flush_interval_sec or not batch:
+                self._flush()
+                last_flush = now
+
+    def close(self):
+        """Write out everything queued so far, stop the writer and close sinks."""
+        self._queue.put(_STOP)
+        self._thread.join()
+        for sink in self.sinks:
+            sink.close()
+
+
+class QueueingHandler(logging.Handler):
+    """Hand records to a LogWriter; only the message text is resolved here."""
+
+    def __init__(self, writer: LogWriter):
+        super().__init__()
+        self.writer = writer
+
+    def emit(self, record):
+        try:
+            record.msg = record.getMessage()
+            record.args = None
+            # Records forwarded from worker processes carry their own tick
+            if getattr(record, "tick", None) is None:
+                record.tick = _current_tick
+            self.writer.enqueue(record)
+        except Exception:
+            self.handleError(record)
@@ -0,0 +1,262 @@
+import json
+import os
+import queue
+import threading
+import time
+import zlib
+
+from gearbox.logqueue import format_record
+
+INDEX_FILE = "index.ndjson"
+DEFAULT_SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_SEGMENT_MAX_AGE_SEC = 3600
+
+
+def _segment_name(number: int) -> str:
+    return f"segment-{number:06d}.ndjson"
+
+
+def _gzip_member(data: bytes) -> bytes:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _index_entry(block, segment_name, offset, length, compressed) -> dict:
+    entry = {
+        "tick": block["tick"],
+        "segment": segment_name,
+        "offset": offset,
+        "length": length,
+        "compressed": compressed,
+        "ts_first": block["ts_first"],
+        "ts_last": block["ts_last"],
+    }
+    if block["worker"] is not None:
+        entry["worker"] = block["worker"]
+    return entry
+
+
+class SegmentedLogSink:
+    """
+    Log sink writing a run's records into rotating segments.
+
+    All files live in one run directory:
+
+        segment-000001.ndjson.gz   closed segment, compressed
+        segment-000002.ndjson      active segment
+        index.ndjson               tick -> segment, byte offset and length
+
+    Segments rotate on size or age, but only between ticks, so every tick's
+    records sit in a single contiguous block of one segment. Records
+    forwarded from supervised workers carry their worker's own tick and
+    are blocked (and indexed) by tick and worker, so one tick number may
+    have several blocks. A closed segment
+    is compressed in the background as one gzip member per tick block: any
+    block can be decompressed on its own from its indexed offset without
+    reading the rest of the segment. Index lines for a compressed segment
+    are appended after the uncompressed ones and take precedence.
+    """
+
+    def __init__(
+        self,
+        run_dir,
+        formatter,
+        max_bytes: int = DEFAULT_SEGMENT_MAX_BYTES,
+        max_age_sec: int = DEFAULT_SEGMENT_MAX_AGE_SEC,
+        compress: bool = True,
+    ):
+        self.run_dir = run_dir
+        self.formatter = formatter
+        self.max_bytes = max_bytes
+        self.max_age_sec = max_age_sec
+        self.compress = compress
+
+        os.makedirs(run_dir)
+        self._index = open(os.path.join(run_dir, INDEX_FILE), "a", encoding="utf-8")
+        self._index_lock = threading.Lock()
+
+        self._segment_number = 0
+        self._segment = None
+        self._segment_blocks = []
+        self._block = None
+
+        self._compress_queue = queue.Queue()
+        self._compressor = threading.Thread(
+            target=self._compress_loop, name="gearbox-log-compress", daemon=True
+        )
+        self._compressor.start()
+
+        self._open_segment()
+
+    def configure(self, max_bytes=None, max_age_sec=None, compress=None):
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        if max_age_sec is not None:
+            self.max_age_sec = max_age_sec
+        if compress is not None:
+            self.compress = compress
+
+    def _open_segment(self):
+        self._segment_number += 1
+        self._segment_name = _segment_name(self._segment_number)
+        self._segment = open(os.path.join(self.run_dir, self._segment_name), "ab")
+        self._segment_opened = time.monotonic()
+        self._segment_bytes = 0
+        self._segment_blocks = []
+
+    def _write_index(self, entries):
+        with self._index_lock:
+            for entry in entries:
+                self._index.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._index.flush()
+
+    def _close_block(self):
+        block = self._block
+        if block is None:
+            return
+        self._block = None
+        self._segment_blocks.append(block)
+        self._write_index([
+            _index_entry(block, self._segment_name, block["offset"], block["length"], False)
+        ])
+
+    def _rotation_due(self) -> bool:
+        if self._segment_bytes == 0:
+            return False
+        if self._segment_bytes >= self.max_bytes:
+            return True
+        return time.monotonic() - self._segment_opened >= self.max_age_sec
+
+    def _rotate(self):
+        self._close_block()
+        self._segment.close()
+        closed = (self._segment_name, list(self._segment_blocks))
+        if self.compress:
+            self._compress_queue.put(closed)
+        self._open_segment()
+
+    def write(self, records):
+        for record in records:
+            tick = getattr(record, "tick", None) or 0
+            worker = getattr(record, "worker", None)
+            if self._block is None or (self._block["tick"], self._block["worker"]) != (tick, worker):
+                self._close_block()
+                if self._rotation_due():
+                    self._rotate()
+                self._block = {
+                    "tick": tick,
+                    "worker": worker,
+                    "offset": self._segment_bytes,
+                    "length": 0,
+                    "ts_first": record.created,
+                    "ts_last": record.created,
+                }
+
+            line = (format_record(self.formatter, record) + "\n").encode("utf-8")
+            self._segment.write(line)
+            self._segment_bytes += len(line)
+            self._block["length"] += len(line)
+            self._block["ts_last"] = record.created
+
+    def flush(self):
+        self._segment.flush()
+
+    def _compress_segment(self, segment_name, blocks):
+        plain_path = os.path.join(self.run_dir, segment_name)
+        gz_name = segment_name + ".gz"
+        gz_path = os.path.join(self.run_dir, gz_name)
+
+        entries = []
+        with open(plain_path, "rb") as plain, open(gz_path + ".tmp", "wb") as gz:
+            offset = 0
+            for block in blocks:
+                plain.seek(block["offset"])
+                member = _gzip_member(plain.read(block["length"]))
+                gz.write(member)
+                entries.append(_index_entry(block, gz_name, offset, len(member), True))
+                offset += len(member)
+
+        os.replace(gz_path + ".tmp", gz_path)
+        self._write_index(entries)
+        os.remove(plain_path)
+
+    def _compress_loop(self):
+        while True:
+            item = self._compress_queue.get()
+            if item is None:
+                return
+            try:
+                self._compress_segment(*item)
+            except Exception:
+                # Leave the plain segment in place; its index entries stay valid.
+                pass
+
+    def close(self):
+        self._close_block()
+        self._segment.close()
+        if self.compress and self._segment_bytes:
+            self._compress_queue.put((self._segment_name, list(self._segment_blocks)))
+        self._compress_queue.put(None)
+        self._compressor.join()
+        self._index.close()
+
+
+def load_index(run_dir) -> dict:
+    """
+    Return {tick: [index entry, ...]} with each tick's blocks in the order
+    they were written, preferring compressed entries.
+    """
+    # A segment's blocks are indexed in the same order before and after
+    # compression, so the nth entry of segment-N.ndjson.gz replaces the
+    # nth entry of segment-N.ndjson.
+    blocks = {}
+    counts = {}
+    with open(os.path.join(run_dir, INDEX_FILE), "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            segment = entry["segment"]
+            if entry["compressed"] and segment.endswith(".gz"):
+                segment = segment[:-3]
+            key = (segment, entry["compressed"])
+            ordinal = counts.get(key, 0)
+            counts[key] = ordinal + 1
+            blocks[(segment, ordinal)] = entry
+
+    entries = {}
+    for entry in blocks.values():
+        entries.setdefault(entry["tick"], []).append(entry)
+    return entries
+
+
+def read_block(run_dir, entry) -> list:
+    """Return the log lines of one indexed tick block."""
+    with open(os.path.join(run_dir, entry["segment"]), "rb") as f:
+        f.seek(entry["offset"])
+        data = f.read(entry["length"])
+    if entry["compressed"]:
+        data = zlib.decompressobj(31).decompress(data)
+    return data.decode("utf-8").splitlines()
+
+
+def read_tick(run_dir, tick: int, worker=None) -> list:
+    """
+    Return the log lines written during `tick` of a run. In supervised runs
+    every worker has its own tick numbers; `worker` selects one of them.
+    """
+    lines = []
+    for entry in load_index(run_dir).get(tick, []):
+        if worker is None or entry.get("worker") == worker:
+            lines.extend(read_block(run_dir, entry))
+    return lines
+
+
+def ticks_between(run_dir, start_ts: float, end_ts: float) -> list:
+    """Return the ticks with records between two epoch timestamps."""
+    return sorted(
+        tick
+        for tick, entries in load_index(run_dir).items()
+        if any(entry["ts_last"] >= start_ts and entry["ts_first"] <= end_ts for entry in entries)
+    )
@@ -0,0 +1,234 @@
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from gearbox.agent.schema import json_default
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9464
+
+# Histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+COUNTER = "counter"
+GAUGE = "gauge"
+HISTOGRAM = "histogram"
+
+METRICS = {
+    "gearbox_ticks_total": (COUNTER, "Evaluation ticks completed"),
+    "gearbox_tick_failures_total": (COUNTER, "Evaluation ticks that failed"),
+    "gearbox_tick_duration_seconds": (HISTOGRAM, "Wall time of one evaluation tick"),
+    "gearbox_span_duration_seconds": (HISTOGRAM, "Wall time of timed spans within ticks"),
+    "gearbox_tick_interval_seconds": (GAUGE, "Interval scheduled before the next tick"),
+    "gearbox_block_interval_seconds": (GAUGE, "Learned average block interval of the cadence chain"),
+    "gearbox_healthy": (GAUGE, "1 if the runtime is healthy"),
+    "gearbox_paused": (GAUGE, "1 if the runtime is paused"),
+    "gearbox_halted": (GAUGE, "1 if the runtime is halted"),
+    "gearbox_consecutive_failures": (GAUGE, "Consecutive failed ticks"),
+    "gearbox_warnings_total": (COUNTER, "Health warnings recorded"),
+    "gearbox_window_failure_rate": (GAUGE, "Failed fraction of ticks in the rolling health window"),
+    "gearbox_window_tick_latency_seconds": (GAUGE, "Tick latency percentiles over the rolling health window"),
+    "gearbox_degraded_seconds_total": (COUNTER, "Time spent unhealthy, paused or halted"),
+    "gearbox_chain_success": (GAUGE, "1 if the last chain orientation succeeded"),
+    "gearbox_chain_block_height": (GAUGE, "Latest observed block height"),
+    "gearbox_chain_gas_price_wei": (GAUGE, "Latest observed gas price"),
+    "gearbox_oracle_success": (GAUGE, "1 if the last oracle snapshot succeeded"),
+    "gearbox_oracle_price": (GAUGE, "Latest oracle price"),
+    "gearbox_oracle_latency_seconds": (GAUGE, "Latency of the last oracle request"),
+    "gearbox_oracle_rate_limited_total": (COUNTER, "Oracle requests answered with 429 and retried"),
+    "gearbox_oracle_cache_age_seconds": (GAUGE, "Age of the oracle snapshot served from cache (0 when fetched)"),
+    "gearbox_oracle_cache_hits_total": (COUNTER, "Oracle fetches served from cache or shared with one in flight"),
+    "gearbox_oracle_cache_misses_total": (COUNTER, "Oracle fetches sent to the provider through the cache"),
+    "gearbox_gas_base_fee_wei": (GAUGE, "Base fee of the newest block in the fee history window"),
+    "gearbox_gas_next_base_fee_wei": (GAUGE, "Base fee of the next block, from eth_feeHistory"),
+    "gearbox_gas_priority_fee_wei": (GAUGE, "Median over the fee window of each block's priority fee percentile"),
+    "gearbox_gas_used_ratio": (GAUGE, "Mean gas used ratio over the fee window"),
+    "gearbox_fee_history_blocks_total": (COUNTER, "Blocks fetched with eth_feeHistory"),
+    "gearbox_reconciliation_delta_seconds": (GAUGE, "Chain/oracle time skew of the last reconciliation"),
+    "gearbox_block_cache_hits_total": (COUNTER, "Block fetches avoided by the block cache"),
+    "gearbox_block_cache_misses_total": (COUNTER, "Blocks fetched and cached"),
+    "gearbox_block_cache_mispredictions_total": (COUNTER, "Batches that left out a block the head had moved to"),
+    "gearbox_head_stream_connected": (GAUGE, "1 if the chain's newHeads subscription is connected"),
+    "gearbox_head_stream_heads_total": (COUNTER, "Heads received over the newHeads subscription"),
+    "gearbox_rpc_retries_total": (COUNTER, "RPC calls retried after a transient failure"),
+    "gearbox_rpc_retries_denied_total": (COUNTER, "Transient RPC failures not retried for lack of budget or time"),
+    "gearbox_breaker_open": (GAUGE, "1 if the endpoint's circuit breaker is not closed"),
+    "gearbox_http_requests_total": (COUNTER, "HTTP requests sent by the shared transport"),
+    "gearbox_http_connections_opened_total": (COUNTER, "Connections opened by the shared transport, including replaced pools"),
+    "gearbox_worker_up": (GAUGE, "1 if the supervised worker process is running"),
+    "gearbox_worker_restarts_total": (COUNTER, "Times the supervisor restarted the worker"),
+}
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def _number(value) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class MetricsRegistry:
+    """
+    Latest runtime state and metrics, updated by the tick thread and read by
+    MetricsServer. Samples are keyed by metric name and sorted label tuples.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._histograms = {}
+        self._status = {"tick": None, "updated_at": None}
+
+    def set(self, name, value, **labels):
+        value = _to_float(value)
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            if value is None:
+                self._values.pop(key, None)
+            else:
+                self._values[key] = value
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def observe(self, name, value_sec, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = {"buckets": [0] * len(LATENCY_BUCKETS), "sum": 0.0, "count": 0}
+                self._histograms[key] = histogram
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if value_sec <= bound:
+                    histogram["buckets"][i] += 1
+            histogram["sum"] += value_sec
+            histogram["count"] += 1
+
+    def observe_spans(self, spans):
+        """Tracer listener: record each (category, name, duration_ms) span."""
+        for category, name, duration_ms in spans:
+            self.observe(
+                "gearbox_span_duration_seconds", duration_ms / 1000, category=category, span=name
+            )
+
+    def update_status(self, **status):
+        with self._lock:
+            self._status.update(status)
+            self._status["updated_at"] = time.time()
+
+    def status(self) -> dict:
+        with self._lock:
+            return dict(self._status)
+
+    def render(self) -> str:
+        """Return all samples in Prometheus text exposition format."""
+        with self._lock:
+            values = sorted(self._values.items())
+            histograms = sorted(
+                (key, dict(h, buckets=list(h["buckets"]))) for key, h in self._histograms.items()
+            )
+
+        by_name = {}
+        for (name, labels), value in values:
+            by_name.setdefault(name, []).append(f"{name}{_labels(labels)} {_number(value)}")
+        for (name, labels), histogram in histograms:
+            lines = by_name.setdefault(name, [])
+            for bound, count in zip(LATENCY_BUCKETS, histogram["buckets"]):
+                bucket_labels = labels + (("le", _number(float(bound))),)
+                lines.append(f"{name}_bucket{_labels(bucket_labels)} {count}")
+            lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {histogram['count']}")
+            lines.append(f"{name}_sum{_labels(labels)} {_number(round(histogram['sum'], 6))}")
+            lines.append(f"{name}_count{_labels(labels)} {histogram['count']}")
+
+        out = []
+        for name in sorted(by_name):
+            kind, help_text = METRICS.get(name, (GAUGE, ""))
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+            out.extend(by_name[name])
+        return "\n".join(out) + "\n"
+
+
+class MetricsServer:
+    """
+    Background HTTP listener for a MetricsRegistry.
+
+    GET /metrics  Prometheus text format
+    GET /status   latest health, chain, oracle and reconciliation snapshots (JSON)
+    GET /healthz  200 while the runtime is healthy, 503 otherwise
+    """
+
+    def __init__(self, registry: MetricsRegistry, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.registry = registry
+        self._server = ThreadingHTTPServer((host, port), _handler_for(registry))
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="gearbox-metrics", daemon=True
+        )
+
+    @property
+    def address(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _handler_for(registry: MetricsRegistry):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+
+        def _send(self, status: int, body: str, content_type: str):
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            path = self.path.split("?", 1)[0]
+            if path == "/metrics":
+                self._send(200, registry.render(), "text/plain; version=0.0.4; charset=utf-8")
+            elif path == "/status":
+                self._send(200, json.dumps(registry.status(), default=json_default), "application/json")
+            elif path == "/healthz":
+                health = registry.status().get("health") or {}
+                healthy = bool(health.get("healthy", False))
+                self._send(200 if healthy else 503, "ok\n" if healthy else "unhealthy\n", "text/plain")
+            else:
+                self._send(404, "not found\n", "text/plain")
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
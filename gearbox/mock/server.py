@@ -0,0 +1,448 @@
+import argparse
+import json
+import random
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from gearbox.ws import WebSocket, WebSocketError, accept_key
+
+DEFAULT_CHAIN_ID = 1
+DEFAULT_BLOCK_TIME_SEC = 12
+DEFAULT_GAS_PRICE_WEI = 20_000_000_000
+DEFAULT_PRIORITY_FEE_WEI = 1_000_000_000
+DEFAULT_PRICE = 3000.0
+GENESIS_HEIGHT = 19_000_000
+
+
+class MockBehavior:
+    """
+    Scriptable behavior of a MockServer. Attributes may be changed while the
+    server is running; each request reads the current values.
+
+    latency_ms / jitter_ms  added delay per HTTP request (uniform jitter)
+    error_rate              fraction of requests answered with HTTP 500
+    rpc_error_rate          fraction of RPC calls answered with a JSON-RPC error
+    rate_limit_rps          requests per second before answering 429 (0 = off)
+    """
+
+    def __init__(
+        self,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        error_rate: float = 0.0,
+        rpc_error_rate: float = 0.0,
+        rate_limit_rps: float = 0,
+        block_time_sec: float = DEFAULT_BLOCK_TIME_SEC,
+        chain_id: int = DEFAULT_CHAIN_ID,
+        gas_price_wei: int = DEFAULT_GAS_PRICE_WEI,
+        priority_fee_wei: int = DEFAULT_PRIORITY_FEE_WEI,
+        price: float = DEFAULT_PRICE,
+        seed=None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rpc_error_rate = rpc_error_rate
+        self.rate_limit_rps = rate_limit_rps
+        self.block_time_sec = block_time_sec
+        self.chain_id = chain_id
+        self.gas_price_wei = gas_price_wei
+        self.priority_fee_wei = priority_fee_wei
+        self.price = price
+        self.random = random.Random(seed)
+
+
+class MockServer:
+    """
+    Local stand-in for an Ethereum JSON-RPC node and the Coinbase spot-price API.
+
+    Serves eth_chainId, eth_blockNumber, eth_getBlockByNumber, eth_gasPrice
+    and eth_feeHistory (single calls and batches) on POST, and `/v2/prices/<pair>/spot` on GET.
+    A GET with `Upgrade: websocket` opens a JSON-RPC WebSocket on the same port
+    that also answers eth_subscribe("newHeads") and pushes each new block.
+    Blocks advance every `block_time_sec` of wall time from server start.
+    """
+
+    def __init__(self, behavior: MockBehavior = None, host: str = "127.0.0.1", port: int = 0):
+        self.behavior = behavior if behavior is not None else MockBehavior()
+        self.started_at = time.time()
+
+        self._lock = threading.Lock()
+        self._bucket_tokens = float("inf")
+        self._bucket_updated = time.monotonic()
+        self._sockets = set()
+        self.reset_stats()
+
+        self._server = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def rpc_url(self) -> str:
+        return self.url + "/"
+
+    @property
+    def ws_url(self) -> str:
+        return "ws" + self.url[len("http"):] + "/"
+
+    @property
+    def oracle_url(self) -> str:
+        """Endpoint template in the form expected by oracle.yaml."""
+        return self.url + "/v2/prices/{asset_pair}/spot"
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="gearbox-mock", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def stop(self):
+        self.drop_subscriptions()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def drop_subscriptions(self) -> int:
+        """Close every open WebSocket connection; returns how many were closed."""
+        with self._lock:
+            sockets = list(self._sockets)
+        for ws in sockets:
+            ws.close()
+        return len(sockets)
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {
+                "requests": 0,
+                "rpc_calls": 0,
+                "batches": 0,
+                "ws_connections": 0,
+                "ws_notifications": 0,
+                "methods": {},
+                "status": {},
+            }
+
+    def stats_snapshot(self) -> dict:
+        with self._lock:
+            snapshot = dict(self.stats)
+            snapshot["methods"] = dict(self.stats["methods"])
+            snapshot["status"] = dict(self.stats["status"])
+        return snapshot
+
+    def _count(self, status: int, methods=()):
+        with self._lock:
+            self.stats["requests"] += 1
+            self.stats["status"][status] = self.stats["status"].get(status, 0) + 1
+            for method in methods:
+                self.stats["rpc_calls"] += 1
+                self.stats["methods"][method] = self.stats["methods"].get(method, 0) + 1
+
+    def _rate_limited(self) -> bool:
+        rps = self.behavior.rate_limit_rps
+        if not rps:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            self._bucket_tokens = min(
+                rps, self._bucket_tokens + (now - self._bucket_updated) * rps
+            )
+            self._bucket_updated = now
+            if self._bucket_tokens >= 1:
+                self._bucket_tokens -= 1
+                return False
+            return True
+
+    def _delay(self):
+        behavior = self.behavior
+        delay_ms = behavior.latency_ms
+        if behavior.jitter_ms:
+            delay_ms += behavior.random.uniform(0, behavior.jitter_ms)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+
+    def block_height(self, now: float = None) -> int:
+        now = time.time() if now is None else now
+        return GENESIS_HEIGHT + int((now - self.started_at) // self.behavior.block_time_sec)
+
+    def block(self, height: int) -> dict:
+        timestamp = int(self.started_at + (height - GENESIS_HEIGHT) * self.behavior.block_time_sec)
+        return {
+            "number": hex(height),
+            "hash": "0x" + f"{height:064x}",
+            "timestamp": hex(timestamp),
+            "baseFeePerGas": hex(self.behavior.gas_price_wei),
+            "transactions": [],
+        }
+
+    def _rpc_result(self, method, params):
+        if method == "eth_chainId":
+            return hex(self.behavior.chain_id)
+        if method == "eth_blockNumber":
+            return hex(self.block_height())
+        if method == "eth_gasPrice":
+            return hex(self.behavior.gas_price_wei)
+        if method == "eth_getBlockByNumber":
+            tag = params[0] if params else "latest"
+            latest = self.block_height()
+            if tag == "latest":
+                return self.block(latest)
+            height = int(tag, 16)
+            return self.block(height) if height <= latest else None
+        if method == "eth_feeHistory":
+            return self.fee_history(*params)
+        raise LookupError(method)
+
+    def fee_history(self, block_count, newest_tag="latest", percentiles=None) -> dict:
+        latest = self.block_height()
+        newest = latest if newest_tag in ("latest", "pending") else min(int(newest_tag, 16), latest)
+        count = int(block_count, 16) if isinstance(block_count, str) else int(block_count)
+        count = max(1, min(count, 1024, newest - GENESIS_HEIGHT + 1))
+        oldest = newest - count + 1
+        result = {
+            "oldestBlock": hex(oldest),
+            # One extra entry: the base fee of the block after `newest`
+            "baseFeePerGas": [hex(self.behavior.gas_price_wei)] * (count + 1),
+            "gasUsedRatio": [0.5] * count,
+        }
+        if percentiles:
+            # Priority fees scale with the percentile, `priority_fee_wei` at the median
+            rewards = [hex(int(self.behavior.priority_fee_wei * pct / 50)) for pct in percentiles]
+            result["reward"] = [list(rewards) for _ in range(count)]
+        return result
+
+    def _rpc_response(self, call):
+        if not isinstance(call, dict) or "method" not in call:
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Invalid Request"}}
+
+        response = {"jsonrpc": "2.0", "id": call.get("id")}
+        if self.behavior.rpc_error_rate and self.behavior.random.random() < self.behavior.rpc_error_rate:
+            response["error"] = {"code": -32000, "message": "mock rpc error"}
+            return response
+        try:
+            response["result"] = self._rpc_result(call["method"], call.get("params") or [])
+        except LookupError:
+            response["error"] = {"code": -32601, "message": "Method not found"}
+        except (TypeError, ValueError):
+            response["error"] = {"code": -32602, "message": "Invalid params"}
+        return response
+
+    def _serve_websocket(self, ws: WebSocket):
+        """Answer RPC calls and push newHeads notifications until the socket closes."""
+        subscriptions = set()
+        closed = threading.Event()
+        with self._lock:
+            self._sockets.add(ws)
+            self.stats["ws_connections"] += 1
+
+        def push_heads():
+            height = self.block_height()
+            while not closed.is_set():
+                next_at = self.started_at + (height + 1 - GENESIS_HEIGHT) * self.behavior.block_time_sec
+                if closed.wait(max(0.0, next_at - time.time())):
+                    return
+                latest = self.block_height()
+                if latest <= height:
+                    continue
+                height = latest
+                for sub_id in list(subscriptions):
+                    message = {
+                        "jsonrpc": "2.0",
+                        "method": "eth_subscription",
+                        "params": {"subscription": sub_id, "result": self.block(height)},
+                    }
+                    try:
+                        ws.send(json.dumps(message))
+                    except OSError:
+                        return
+                    with self._lock:
+                        self.stats["ws_notifications"] += 1
+
+        pusher = threading.Thread(target=push_heads, name="gearbox-mock-heads", daemon=True)
+        pusher.start()
+        try:
+            while True:
+                try:
+                    call = json.loads(ws.recv())
+                except ValueError:
+                    call = None
+                response = self._ws_response(call, subscriptions)
+                self._count(200, [call.get("method")] if isinstance(call, dict) else ())
+                ws.send(json.dumps(response))
+        except (WebSocketError, OSError):
+            pass
+        finally:
+            closed.set()
+            with self._lock:
+                self._sockets.discard(ws)
+            ws.close()
+
+    def _ws_response(self, call, subscriptions):
+        if not isinstance(call, dict):
+            return {"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"}}
+        method = call.get("method")
+        params = call.get("params") or []
+        if method == "eth_subscribe":
+            if params[:1] != ["newHeads"]:
+                return {"jsonrpc": "2.0", "id": call.get("id"),
+                        "error": {"code": -32602, "message": "unsupported subscription"}}
+            sub_id = hex(self.behavior.random.getrandbits(64))
+            subscriptions.add(sub_id)
+            return {"jsonrpc": "2.0", "id": call.get("id"), "result": sub_id}
+        if method == "eth_unsubscribe":
+            found = bool(params) and params[0] in subscriptions
+            subscriptions.discard(params[0] if params else None)
+            return {"jsonrpc": "2.0", "id": call.get("id"), "result": found}
+        return self._rpc_response(call)
+
+    def _spot_price(self, path: str):
+        parts = path.strip("/").split("/")
+        if len(parts) != 4 or parts[:2] != ["v2", "prices"] or parts[3] != "spot":
+            return None
+        base, _, currency = parts[2].partition("-")
+        return {
+            "data": {
+                "amount": f"{self.behavior.price:.2f}",
+                "base": base,
+                "currency": currency,
+            }
+        }
+
+
+def _handler_for(mock: MockServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are written separately; without TCP_NODELAY the
+        # body waits on a delayed ACK and every response gains ~40ms.
+        disable_nagle_algorithm = True
+
+        def _send(self, status: int, payload=None, headers=None):
+            body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _fault(self, methods=()) -> bool:
+            """Apply latency, rate limiting and injected errors; True if answered."""
+            mock._delay()
+            if mock._rate_limited():
+                mock._count(429, methods)
+                self._send(429, {"message": "rate limited"}, {"Retry-After": "1"})
+                return True
+            behavior = mock.behavior
+            if behavior.error_rate and behavior.random.random() < behavior.error_rate:
+                mock._count(500, methods)
+                self._send(500, {"message": "mock server error"})
+                return True
+            return False
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b"null")
+            except ValueError:
+                mock._count(200)
+                self._send(200, {"jsonrpc": "2.0", "id": None, "error": {"code": -32700, "message": "Parse error"}})
+                return
+
+            calls = body if isinstance(body, list) else [body]
+            methods = [c.get("method") for c in calls if isinstance(c, dict)]
+            if self._fault(methods):
+                return
+
+            if isinstance(body, list):
+                with mock._lock:
+                    mock.stats["batches"] += 1
+                payload = [mock._rpc_response(call) for call in body]
+            else:
+                payload = mock._rpc_response(body)
+            mock._count(200, methods)
+            self._send(200, payload)
+
+        def _upgrade(self):
+            key = self.headers.get("Sec-WebSocket-Key")
+            if not key:
+                self._send(400, {"message": "missing Sec-WebSocket-Key"})
+                return
+            self.send_response(101)
+            self.send_header("Upgrade", "websocket")
+            self.send_header("Connection", "Upgrade")
+            self.send_header("Sec-WebSocket-Accept", accept_key(key))
+            self.end_headers()
+            self.wfile.flush()
+            self.close_connection = True
+            mock._serve_websocket(WebSocket(self.connection, mask=False, rfile=self.rfile))
+
+        def do_GET(self):
+            if self.headers.get("Upgrade", "").lower() == "websocket":
+                self._upgrade()
+                return
+            if self._fault():
+                return
+            payload = mock._spot_price(self.path)
+            if payload is None:
+                mock._count(404)
+                self._send(404, {"errors": [{"id": "not_found", "message": "Not found"}]})
+                return
+            mock._count(200)
+            self._send(200, payload, {"Date": formatdate(usegmt=True)})
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Local mock Ethereum JSON-RPC node and Coinbase spot-price API"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8545)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rpc-error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rps", type=float, default=0)
+    parser.add_argument("--block-time-sec", type=float, default=DEFAULT_BLOCK_TIME_SEC)
+    args = parser.parse_args()
+
+    server = MockServer(
+        MockBehavior(
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            rpc_error_rate=args.rpc_error_rate,
+            rate_limit_rps=args.rate_limit_rps,
+            block_time_sec=args.block_time_sec,
+        ),
+        host=args.host,
+        port=args.port,
+    )
+    print(f"[+] Mock RPC endpoint:    {server.rpc_url}")
+    print(f"[+] Mock WS endpoint:     {server.ws_url}")
+    print(f"[+] Mock oracle endpoint: {server.oracle_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import threading
+import time
+
+from gearbox.deadline import DeadlineExceeded
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter shared by all requests to one provider.
+
+    Tokens refill at `rate_per_sec` up to `burst`; acquire() blocks until a
+    token is available, or raises DeadlineExceeded once the caller's tick
+    deadline passes first. backoff() holds every caller until the given
+    delay has passed, so one 429 slows the whole provider down rather than
+    just the request that saw it.
+    """
+
+    def __init__(self, rate_per_sec: float, burst: int = 1):
+        self.rate_per_sec = rate_per_sec
+        self.burst = max(1, burst)
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+        self.acquired = 0
+        self.waited_sec = 0.0
+        self.backoffs = 0
+
+    def _refill(self, now):
+        # Nothing accrues while backing off
+        since = max(self._updated, self._blocked_until)
+        if now > since:
+            self._tokens = min(self.burst, self._tokens + (now - since) * self.rate_per_sec)
+        self._updated = now
+
+    def acquire(self, deadline=None) -> float:
+        """Take one token, sleeping as needed; returns seconds waited."""
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    waited = now - started
+                    self.acquired += 1
+                    self.waited_sec += waited
+                    return waited
+                wait = max(self._blocked_until - now, (1 - self._tokens) / self.rate_per_sec)
+            if deadline is not None:
+                if deadline.expired():
+                    raise DeadlineExceeded("tick deadline exceeded")
+                wait = min(wait, deadline.remaining())
+            time.sleep(wait)
+
+    def backoff(self, delay_sec: float):
+        """Block all callers for `delay_sec` and drain the bucket."""
+        with self._lock:
+            now = time.monotonic()
+            self._blocked_until = max(self._blocked_until, now + delay_sec)
+            self._tokens = 0.0
+            self._updated = now
+            self.backoffs += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "rate_per_sec": self.rate_per_sec,
+                "burst": self.burst,
+                "acquired": self.acquired,
+                "waited_sec": round(self.waited_sec, 3),
+                "backoffs": self.backoffs,
+            }
@@ -0,0 +1,103 @@
+import logging
+import os
+from pathlib import Path
+
+from gearbox.config_cache import CONFIG_FILES, config_digest, read_sources
+from gearbox.validate import revalidate
+
+# Files whose changes the runtime applies between ticks; edits to the others
+# are reported and take effect on the next start.
+RELOADABLE_FILES = ("chain.yaml", "oracle.yaml")
+
+
+class ConfigWatcher:
+    """
+    Detects config/ edits between ticks and revalidates only what changed.
+
+    poll() stats each config file and rereads only those whose mtime, size
+    or inode moved, then compares bytes so a touch without an edit is
+    ignored. Changed reloadable files go through revalidate() against the
+    running config (their own checks plus cross-file references); on
+    success poll() returns the new validation result and the changed file
+    names, on failure it logs the errors and the running config stays in
+    place until the file changes again.
+    """
+
+    def __init__(self, config_dir, validated, reloadable=RELOADABLE_FILES):
+        self.config_dir = Path(config_dir)
+        self.reloadable = tuple(reloadable)
+        self.current = validated
+
+        # What the running config was validated from, and what is on disk
+        sources = validated.get("sources") or read_sources(self.config_dir)
+        self._sources = dict(sources)
+        self._seen = dict(sources)
+        # Empty so the first poll compares every file with what was validated
+        self._stats = {}
+
+        self.reloads = 0
+        self.rejected = 0
+
+    def _stat(self, filename):
+        try:
+            st = os.stat(self.config_dir / filename)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _read_changed(self) -> list:
+        changed = []
+        for filename in CONFIG_FILES:
+            stat = self._stat(filename)
+            if filename in self._stats and self._stats[filename] == stat:
+                continue
+            self._stats[filename] = stat
+            try:
+                source = (self.config_dir / filename).read_bytes()
+            except FileNotFoundError:
+                source = None
+            if source != self._seen.get(filename):
+                self._seen[filename] = source
+                changed.append(filename)
+        return changed
+
+    def poll(self):
+        """Return (validated, changed_files) if a reload should be applied, else None."""
+        changed = self._read_changed()
+        if not changed:
+            return None
+
+        for filename in changed:
+            if filename not in self.reloadable and self._seen[filename] != self._sources[filename]:
+                logging.warning(f"Config reload: {filename} changed on disk; restart to apply it")
+
+        pending = {
+            filename: self._seen[filename]
+            for filename in self.reloadable
+            if self._seen[filename] != self._sources[filename]
+        }
+        if not pending:
+            return None
+
+        result = revalidate(self.current["parsed"], pending)
+        if not result["ok"]:
+            self.rejected += 1
+            for err in result["errors"]:
+                logging.error(f"Config reload rejected: {err}")
+            logging.warning(f"Config reload of {', '.join(sorted(pending))} rejected; keeping running config")
+            return None
+
+        self._sources.update(pending)
+        result["digest"] = config_digest(self._sources)
+        result["cached"] = False
+        result["sources"] = dict(self._sources)
+        self.current = result
+        self.reloads += 1
+        return result, sorted(pending)
+
+    def snapshot(self) -> dict:
+        return {
+            "digest": self.current.get("digest"),
+            "reloads": self.reloads,
+            "rejected": self.rejected,
+        }
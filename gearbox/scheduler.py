@@ -0,0 +1,196 @@
+import math
+import time
+
+SKIP = "skip"
+CATCH_UP = "catch_up"
+OVERRUN_POLICIES = (SKIP, CATCH_UP)
+
+FIXED = "fixed"
+ADAPTIVE = "adaptive"
+SCHEDULER_MODES = (FIXED, ADAPTIVE)
+
+DEFAULT_MIN_INTERVAL_SEC = 2
+DEFAULT_BLOCK_OFFSET_SEC = 1
+
+# Weight of the newest sample in the block interval moving average
+CADENCE_SMOOTHING = 0.2
+
+
+class TickScheduler:
+    """
+    Fixed-rate tick scheduler on the monotonic clock.
+
+    Tick N is due at origin + N * interval, independent of how long earlier
+    ticks took, so the period does not drift. A tick that finishes after the
+    next deadline is an overrun: with `skip` the missed deadlines are dropped
+    and the schedule resumes on the grid; with `catch_up` the missed ticks
+    run back to back until the schedule is met again.
+
+    With `realtime=False` (replay) the scheduler never sleeps: deadlines
+    advance on a virtual clock and ticks run back to back.
+
+    In `adaptive` mode the next tick is instead placed `block_offset_sec`
+    after the next expected block, using the block cadence learned from
+    observe_block() (seeded by `block_time_sec`), and clamped to
+    [min_interval_sec, max_interval_sec] after the current tick. While the
+    head is stuck, retries back off exponentially from min_interval_sec. An
+    adaptive tick that overruns its deadline simply starts late; missed
+    blocks are never caught up. Until a cadence is known, and for explicit
+    multi-period advances (pause), the fixed interval is used.
+    """
+
+    def __init__(
+        self,
+        interval_sec: float,
+        overrun_policy: str = SKIP,
+        realtime: bool = True,
+        mode: str = FIXED,
+        min_interval_sec: float = DEFAULT_MIN_INTERVAL_SEC,
+        max_interval_sec: float = None,
+        block_offset_sec: float = DEFAULT_BLOCK_OFFSET_SEC,
+        block_time_sec: float = None,
+    ):
+        self.interval_sec = interval_sec
+        self.overrun_policy = overrun_policy
+        self.realtime = realtime
+
+        self.mode = mode
+        self.min_interval_sec = min_interval_sec
+        self.max_interval_sec = max_interval_sec if max_interval_sec is not None else interval_sec
+        self.block_offset_sec = block_offset_sec
+
+        self.origin = None
+        self.deadline = None
+        self.last_interval_sec = interval_sec
+
+        self.overruns = 0
+        self.skipped_ticks = 0
+        self.last_jitter_ms = None
+        self.max_jitter_ms = 0.0
+
+        # Block cadence, learned from observed heads
+        self.block_interval_sec = block_time_sec
+        self.head_height = None
+        self.head_timestamp = None
+        self.stuck_ticks = 0
+
+    def elapsed(self) -> float:
+        """Seconds since the first tick was due."""
+        if self.origin is None:
+            return 0.0
+        if not self.realtime:
+            return self.deadline - self.origin
+        return time.monotonic() - self.origin
+
+    def wait(self, stop_event=None) -> bool:
+        """
+        Sleep until the current deadline and record start jitter. Returns
+        True without waiting further once `stop_event` is set.
+        """
+        now = time.monotonic()
+        if self.deadline is None:
+            self.origin = now
+            self.deadline = now
+
+        if stop_event is not None and stop_event.is_set():
+            return True
+
+        if not self.realtime:
+            self.last_jitter_ms = 0.0
+            return False
+
+        if now < self.deadline:
+            if stop_event is not None:
+                if stop_event.wait(self.deadline - now):
+                    return True
+            else:
+                time.sleep(self.deadline - now)
+            now = time.monotonic()
+
+        jitter_ms = (now - self.deadline) * 1000
+        self.last_jitter_ms = round(jitter_ms, 1)
+        self.max_jitter_ms = max(self.max_jitter_ms, self.last_jitter_ms)
+        return False
+
+    def observe_block(self, height: int, timestamp: int):
+        """Record the chain head seen by the current tick."""
+        if height is None or timestamp is None:
+            return
+        if self.head_height is not None and height <= self.head_height:
+            self.stuck_ticks += 1
+            return
+
+        if self.head_height is not None:
+            sample = (timestamp - self.head_timestamp) / (height - self.head_height)
+            if sample > 0:
+                if self.block_interval_sec is None:
+                    self.block_interval_sec = sample
+                else:
+                    self.block_interval_sec += CADENCE_SMOOTHING * (sample - self.block_interval_sec)
+        self.head_height = height
+        self.head_timestamp = timestamp
+        self.stuck_ticks = 0
+
+    def _adaptive_delay(self) -> float:
+        """Seconds from now until the next tick should start."""
+        if self.stuck_ticks:
+            return self.min_interval_sec * 2 ** (self.stuck_ticks - 1)
+
+        now = time.time()
+        expected = self.head_timestamp + self.block_interval_sec
+        if expected + self.block_offset_sec <= now:
+            # Behind the estimate; advance by whole intervals to the next block
+            missed = math.ceil((now - expected - self.block_offset_sec) / self.block_interval_sec)
+            expected += missed * self.block_interval_sec
+        return expected + self.block_offset_sec - now
+
+    def advance(self, periods: int = 1):
+        """Move the deadline forward by `periods` intervals, handling overruns."""
+        if (
+            self.mode == ADAPTIVE
+            and periods == 1
+            and self.realtime
+            and self.block_interval_sec is not None
+            and self.head_timestamp is not None
+        ):
+            now = time.monotonic()
+            target = now + self._adaptive_delay()
+            target = min(
+                max(target, self.deadline + self.min_interval_sec),
+                self.deadline + self.max_interval_sec,
+            )
+            self.last_interval_sec = round(target - self.deadline, 3)
+            if target < now:
+                self.overruns += 1
+                target = now
+            self.deadline = target
+            return
+
+        self.last_interval_sec = self.interval_sec * periods
+        self.deadline += self.interval_sec * periods
+        if not self.realtime:
+            return
+
+        now = time.monotonic()
+        if now <= self.deadline:
+            return
+
+        self.overruns += 1
+        if self.overrun_policy == SKIP:
+            missed = math.ceil((now - self.deadline) / self.interval_sec)
+            self.deadline += missed * self.interval_sec
+            self.skipped_ticks += missed
+
+    def snapshot(self) -> dict:
+        return {
+            "mode": self.mode,
+            "interval_sec": self.last_interval_sec,
+            "block_interval_sec": (
+                round(self.block_interval_sec, 3) if self.block_interval_sec is not None else None
+            ),
+            "stuck_ticks": self.stuck_ticks,
+            "jitter_ms": self.last_jitter_ms,
+            "max_jitter_ms": self.max_jitter_ms,
+            "overruns": self.overruns,
+            "skipped_ticks": self.skipped_ticks,
+        }
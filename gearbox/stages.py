@@ -0,0 +1,136 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from gearbox.trace import span
+
+
+class StageTimeout(Exception):
+    pass
+
+
+class StageSkipped(Exception):
+    pass
+
+
+class Stage:
+    """
+    One unit of tick work.
+
+    `fn` is called with the results of the stages named in `inputs`, in
+    that order, once all of them have completed. By default the stage is
+    skipped if any input failed; with `allow_failed_inputs` it runs anyway
+    and receives None in place of each failed input.
+    """
+
+    def __init__(self, name: str, fn, inputs=(), timeout_sec=None, allow_failed_inputs=False):
+        self.name = name
+        self.fn = fn
+        self.inputs = tuple(inputs)
+        self.timeout_sec = timeout_sec
+        self.allow_failed_inputs = allow_failed_inputs
+
+
+class StageOutcome:
+    def __init__(self, value=None, error=None, duration_ms=None):
+        self.value = value
+        self.error = error
+        self.duration_ms = duration_ms
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _run_stage(stage, args):
+    with span(stage.name, "stage"):
+        return stage.fn(*args)
+
+
+def run_stages(stages, executor, deadline_sec=None) -> dict:
+    """
+    Run a stage graph on `executor` and return {stage name: StageOutcome}.
+
+    Stages start as soon as their inputs are ready, so independent stages
+    run concurrently. A stage that runs past its own timeout, or past the
+    graph-wide deadline, is reported as StageTimeout; stages whose required
+    inputs failed are reported as StageSkipped without being run. Timed-out work
+    cannot be interrupted and is left to finish in the background.
+    """
+    names = {stage.name for stage in stages}
+    for stage in stages:
+        for name in stage.inputs:
+            if name not in names:
+                raise ValueError(f"stage '{stage.name}' has unknown input '{name}'")
+
+    start = time.monotonic()
+    graph_deadline = start + deadline_sec if deadline_sec is not None else None
+
+    outcomes = {}
+    pending = list(stages)
+    running = {}
+
+    while pending or running:
+        progressed = False
+        for stage in list(pending):
+            if not all(name in outcomes for name in stage.inputs):
+                continue
+            pending.remove(stage)
+            progressed = True
+
+            failed = [name for name in stage.inputs if not outcomes[name].ok]
+            if failed and not stage.allow_failed_inputs:
+                outcomes[stage.name] = StageOutcome(
+                    error=StageSkipped(f"input failed: {failed[0]}")
+                )
+                continue
+
+            args = [outcomes[name].value for name in stage.inputs]
+            running[executor.submit(_run_stage, stage, args)] = (stage, time.monotonic())
+
+        if not running:
+            if pending and not progressed:
+                for stage in pending:
+                    outcomes[stage.name] = StageOutcome(
+                        error=StageSkipped("inputs can never complete")
+                    )
+                break
+            continue
+
+        expiries = [
+            started + stage.timeout_sec
+            for stage, started in running.values()
+            if stage.timeout_sec is not None
+        ]
+        if graph_deadline is not None:
+            expiries.append(graph_deadline)
+        timeout = max(min(expiries) - time.monotonic(), 0) if expiries else None
+
+        done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+        now = time.monotonic()
+
+        for future in done:
+            stage, started = running.pop(future)
+            duration_ms = round((now - started) * 1000, 1)
+            try:
+                outcomes[stage.name] = StageOutcome(future.result(), None, duration_ms)
+            except Exception as e:
+                outcomes[stage.name] = StageOutcome(None, e, duration_ms)
+
+        graph_expired = graph_deadline is not None and now >= graph_deadline
+        for future, (stage, started) in list(running.items()):
+            stage_expired = stage.timeout_sec is not None and now >= started + stage.timeout_sec
+            if stage_expired or graph_expired:
+                running.pop(future)
+                future.cancel()
+                reason = "stage timeout" if stage_expired else "tick deadline"
+                outcomes[stage.name] = StageOutcome(
+                    error=StageTimeout(f"{reason} exceeded"),
+                    duration_ms=round((now - started) * 1000, 1),
+                )
+
+        if graph_expired:
+            for stage in pending:
+                outcomes[stage.name] = StageOutcome(error=StageTimeout("tick deadline exceeded"))
+            break
+
+    return outcomes
@@ -0,0 +1,379 @@
+import copy
+import logging
+import multiprocessing
+import queue
+import signal
+import time
+
+from gearbox.logqueue import current_tick, set_current_tick
+
+DEFAULT_WORKERS = 1
+DEFAULT_MAX_RESTARTS = 3
+# A worker that has not reported for this many evaluation intervals is
+# considered wedged and restarted (unless stall_timeout_sec is set)
+DEFAULT_STALL_INTERVALS = 10
+# How long a stopping worker gets to exit, beyond finishing its current
+# tick, before it is terminated
+STOP_GRACE_SEC = 5
+
+# Channel message kinds
+LOG = "log"
+TICK = "tick"
+EXIT = "exit"
+
+
+def shard_chains(chains, workers) -> list:
+    """Split chains round-robin into at most `workers` non-empty shards."""
+    chains = list(chains)
+    return [chains[i::workers] for i in range(min(workers, len(chains)))]
+
+
+def shard_config(validated, chains) -> dict:
+    """Copy of the validated config that runs only `chains`, with no metrics listener."""
+    config = copy.deepcopy(validated)
+    runtime_cfg = config["parsed"]["runtime.yaml"]["runtime"]
+    runtime_cfg["allowed_chains"] = list(chains)
+    # The supervisor serves metrics for the whole process tree
+    runtime_cfg["metrics"] = {"enabled": False}
+    scheduler_cfg = runtime_cfg.get("scheduler")
+    if scheduler_cfg and scheduler_cfg.get("cadence_chain") not in chains:
+        scheduler_cfg.pop("cadence_chain", None)
+    return config
+
+
+class ChannelHandler(logging.Handler):
+    """Forward a worker's log records to the supervisor, tagged with the worker index."""
+
+    def __init__(self, channel, worker: int):
+        super().__init__()
+        self.channel = channel
+        self.worker = worker
+
+    def emit(self, record):
+        try:
+            record.msg = record.getMessage()
+            record.args = None
+            if record.exc_info:
+                # Tracebacks do not pickle; send the formatted text
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+                record.exc_info = None
+            record.tick = current_tick()
+            record.worker = self.worker
+            self.channel.put((LOG, self.worker, record))
+        except Exception:
+            self.handleError(record)
+
+
+def _worker_main(target, index, config, channel, oracle, stop_event):
+    # Ctrl-C reaches the whole process group; the supervisor stops workers
+    # through `stop_event` instead, so a tick is never cut off halfway
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    root_logger = logging.getLogger()
+    root_logger.handlers = [ChannelHandler(channel, index)]
+    root_logger.setLevel(logging.INFO)
+    set_current_tick(None)
+
+    status = "ok"
+    try:
+        target(
+            config,
+            oracle=oracle,
+            on_tick=lambda report: channel.put((TICK, index, report)),
+            stop_event=stop_event,
+        )
+    except Exception:
+        logging.exception("Worker failed")
+        status = "failed"
+    finally:
+        channel.put((EXIT, index, status))
+
+
+class _Worker:
+    def __init__(self, index, chains):
+        self.index = index
+        self.chains = chains
+        self.process = None
+        self.stop_event = None
+        self.started_at = None
+        self.last_report_at = None
+        self.last_report = None
+        self.round_reports = []
+        self.restarts = 0
+        self.exit_status = None
+
+    @property
+    def finished(self) -> bool:
+        return self.exit_status is not None
+
+
+class Supervisor:
+    """
+    Runs the engine loop in worker processes, one shard of chains each.
+
+    Every worker runs `target` (cli.run) on its own copy of the config with
+    only its chains; worker 0 also owns the oracle and reconciliation. Log
+    records and per-tick reports come back over one multiprocessing queue:
+    records are handed to this process's logging (and so to its log
+    writer) tagged with the worker index, and reports are merged once per
+    evaluation interval into one aggregate RuntimeHealth. A worker with no
+    report in a round counts as a failure for that round, so a slow or
+    wedged shard shows up without holding up the others. Workers that
+    crash or stop reporting for `stall_timeout_sec` are restarted up to
+    `max_restarts` times. An aggregate halt or Ctrl-C stops every worker by
+    setting its stop event, which the worker checks between ticks.
+    """
+
+    def __init__(
+        self,
+        target,
+        validated,
+        health,
+        workers: int,
+        interval_sec: float,
+        stall_timeout_sec: float = None,
+        max_restarts: int = DEFAULT_MAX_RESTARTS,
+        metrics=None,
+    ):
+        self.target = target
+        self.validated = validated
+        self.health = health
+        self.interval_sec = interval_sec
+        self.stall_timeout_sec = stall_timeout_sec or interval_sec * DEFAULT_STALL_INTERVALS
+        self.max_restarts = max_restarts
+        self.metrics = metrics
+
+        runtime_cfg = validated["parsed"]["runtime.yaml"]["runtime"]
+        # A stopping worker first finishes the tick it is in
+        tick_deadline_sec = runtime_cfg.get("executor", {}).get("tick_deadline_sec", interval_sec)
+        self.stop_grace_sec = tick_deadline_sec + STOP_GRACE_SEC
+
+        allowed_chains = runtime_cfg.get("allowed_chains", [])
+        self.workers = [
+            _Worker(index, chains)
+            for index, chains in enumerate(shard_chains(allowed_chains, workers))
+        ]
+
+        # Spawned workers start from a clean interpreter rather than a
+        # fork of this process and its log and stage threads
+        self._context = multiprocessing.get_context("spawn")
+        self._channel = self._context.Queue()
+        self._round = 0
+        self._round_end = None
+
+    def _start(self, worker):
+        config = shard_config(self.validated, worker.chains)
+        worker.stop_event = self._context.Event()
+        worker.process = self._context.Process(
+            target=_worker_main,
+            args=(
+                self.target, worker.index, config, self._channel, worker.index == 0,
+                worker.stop_event,
+            ),
+            name=f"gearbox-worker-{worker.index}",
+        )
+        worker.process.start()
+        worker.started_at = time.monotonic()
+        worker.last_report_at = None
+        logging.info(
+            f"Worker {worker.index} started",
+            extra={"data": {"pid": worker.process.pid, "chains": worker.chains}},
+        )
+
+    def _stop(self, worker, grace_sec=None):
+        """
+        Stop a worker through its stop event, so it finishes its tick and
+        closes its store and transport; one that does not exit within
+        `grace_sec` (default: a tick plus STOP_GRACE_SEC) is terminated.
+        """
+        process = worker.process
+        if process is None or not process.is_alive():
+            return
+        worker.stop_event.set()
+        process.join(self.stop_grace_sec if grace_sec is None else grace_sec)
+        if process.is_alive():
+            process.terminate()
+            process.join(1)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+    def _restart(self, worker, reason):
+        # A wedged worker will not get back to checking its stop event
+        self._stop(worker, grace_sec=0)
+        if worker.restarts >= self.max_restarts:
+            worker.exit_status = "failed"
+            logging.error(f"Worker {worker.index} {reason}; restart limit reached, giving up")
+            return
+        worker.restarts += 1
+        logging.warning(f"Worker {worker.index} {reason}; restarting ({worker.restarts}/{self.max_restarts})")
+        self._start(worker)
+
+    def _handle(self, message, now):
+        kind, index, payload = message
+        worker = self.workers[index]
+        if kind == LOG:
+            logging.getLogger().handle(payload)
+        elif kind == TICK:
+            worker.last_report_at = now
+            worker.last_report = payload
+            worker.round_reports.append(payload)
+            if self._round_end is None:
+                # Rounds are centred on the workers' tick times
+                self._round_end = now + self.interval_sec / 2
+        elif kind == EXIT:
+            if payload == "ok" and (worker.last_report or {}).get("halted"):
+                payload = "halted"
+            worker.exit_status = payload
+            logging.info(f"Worker {index} exited", extra={"data": {"status": payload}})
+
+    def _check_workers(self, now):
+        for worker in self.workers:
+            if worker.finished:
+                continue
+            if not worker.process.is_alive():
+                # Its last messages are in the pipe by the time it has exited
+                self._drain(timeout=0)
+                if worker.finished:
+                    continue
+                # Exited without saying so: crashed or killed
+                self._restart(worker, f"died (exit code {worker.process.exitcode})")
+                continue
+            last_seen = worker.last_report_at or worker.started_at
+            if now - last_seen > self.stall_timeout_sec:
+                self._restart(worker, f"sent no report for {self.stall_timeout_sec:g}s")
+
+    def _close_round(self):
+        self._round += 1
+        set_current_tick(self._round)
+
+        failures = []
+        durations = []
+        paused = []
+        for worker in self.workers:
+            reports = worker.round_reports
+            worker.round_reports = []
+            if worker.exit_status == "ok":
+                continue
+            if worker.finished and not reports:
+                failures.append(f"Worker {worker.index} {worker.exit_status}")
+                continue
+            if not reports:
+                last = worker.last_report or {}
+                if last.get("paused"):
+                    paused.append(worker.index)
+                    failures.append(f"Worker {worker.index} paused")
+                else:
+                    failures.append(f"Worker {worker.index} sent no report")
+                continue
+            for report in reports:
+                durations.append(report["duration_ms"])
+                for chain_name, breakers in report["breakers"].items():
+                    self.health.record_breakers(chain_name, breakers)
+                if report["failed"]:
+                    failures.append(f"Worker {worker.index}: {report['reason']}")
+            if reports[-1]["paused"]:
+                paused.append(worker.index)
+
+        duration_ms = max(durations) if durations else None
+        if failures:
+            self.health.record_failure("; ".join(failures), duration_ms)
+        else:
+            self.health.record_success(duration_ms)
+        if paused and not self.health.paused:
+            self.health.enter_pause()
+        elif not paused and self.health.paused:
+            self.health.clear_pause()
+
+        if self.health.should_halt():
+            self.health.enter_halt()
+
+        logging.info("Supervisor health", extra={"data": self.snapshot()})
+        if self.metrics is not None:
+            self._publish_metrics(duration_ms, bool(failures))
+
+    def _publish_metrics(self, duration_ms, failed):
+        health = self.health
+        health_snapshot = health.snapshot()
+        self.metrics.inc("gearbox_ticks_total")
+        if failed:
+            self.metrics.inc("gearbox_tick_failures_total")
+        if duration_ms is not None:
+            self.metrics.observe("gearbox_tick_duration_seconds", duration_ms / 1000)
+        self.metrics.set("gearbox_healthy", health.healthy)
+        self.metrics.set("gearbox_paused", health.paused)
+        self.metrics.set("gearbox_halted", health.halted)
+        self.metrics.set("gearbox_consecutive_failures", health.consecutive_failures)
+        self.metrics.set("gearbox_window_failure_rate", health_snapshot["window"]["failure_rate"])
+        self.metrics.set("gearbox_degraded_seconds_total", health_snapshot["degraded_sec"])
+        for worker in self.workers:
+            up = not worker.finished and worker.process is not None and worker.process.is_alive()
+            self.metrics.set("gearbox_worker_up", up, worker=str(worker.index))
+            self.metrics.set("gearbox_worker_restarts_total", worker.restarts, worker=str(worker.index))
+        self.metrics.update_status(tick=self._round, health=health_snapshot, workers=self.snapshot()["workers"])
+
+    def run(self):
+        """Start the workers and supervise them until all have exited or the aggregate halts."""
+        for worker in self.workers:
+            self._start(worker)
+
+        try:
+            while not all(worker.finished for worker in self.workers):
+                now = time.monotonic()
+                wait = 0.5 if self._round_end is None else min(0.5, max(0.0, self._round_end - now))
+                try:
+                    self._handle(self._channel.get(timeout=wait), time.monotonic())
+                except queue.Empty:
+                    pass
+                # Take what else is queued before looking at the clock again
+                self._drain(timeout=0)
+
+                now = time.monotonic()
+                if self._round_end is not None and now >= self._round_end:
+                    self._close_round()
+                    # A late round is not made up for; the next one starts now
+                    self._round_end = max(self._round_end + self.interval_sec, now)
+                    if self.health.halted:
+                        logging.error("Aggregate health halt condition met — stopping workers")
+                        print("[!] Runtime halted due to health failure. See log for details.")
+                        break
+
+                self._check_workers(now)
+        except KeyboardInterrupt:
+            logging.info("Supervisor interrupted by user")
+            print("[!] Runtime interrupted by user.")
+        finally:
+            # Signal every worker first so they wind down in parallel
+            for worker in self.workers:
+                if worker.stop_event is not None:
+                    worker.stop_event.set()
+            for worker in self.workers:
+                self._stop(worker)
+            self._drain(timeout=0.1)
+            logging.info("Final supervisor snapshot", extra={"data": self.snapshot()})
+
+    def _drain(self, timeout):
+        """Handle everything already queued, waiting up to `timeout` for each message."""
+        try:
+            while True:
+                message = self._channel.get(timeout=timeout) if timeout else self._channel.get_nowait()
+                self._handle(message, time.monotonic())
+        except queue.Empty:
+            pass
+
+    def snapshot(self) -> dict:
+        return {
+            "round": self._round,
+            "health": self.health.snapshot(),
+            "workers": {
+                worker.index: {
+                    "chains": worker.chains,
+                    "pid": worker.process.pid if worker.process is not None else None,
+                    "restarts": worker.restarts,
+                    "exit_status": worker.exit_status,
+                    "last_tick": (worker.last_report or {}).get("tick"),
+                    "paused": (worker.last_report or {}).get("paused"),
+                    "halted": (worker.last_report or {}).get("halted"),
+                }
+                for worker in self.workers
+            },
+        }
@@ -0,0 +1,128 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Tracer:
+    """
+    Collects timing spans for the current tick.
+
+    Spans may be opened from any thread (stage workers, hedged requests).
+    At the end of a tick they are folded into a compact per-category summary
+    and, when a trace file is open, appended to it as Chrome trace events
+    ("X" complete events, timestamps in microseconds) that can be loaded in
+    chrome://tracing or Perfetto.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._spans = []
+        self._origin_ns = time.perf_counter_ns()
+        self._file = None
+        self._named_threads = set()
+        self._listeners = []
+        self.tick = None
+
+    def add_listener(self, fn):
+        """Call `fn([(category, name, duration_ms), ...])` with each tick's spans."""
+        self._listeners.append(fn)
+
+    def remove_listener(self, fn):
+        self._listeners.remove(fn)
+
+    def open(self, path):
+        """Start writing trace events to `path` (JSON array format)."""
+        self._file = open(path, "w", encoding="utf-8")
+        self._file.write("[\n")
+        self._file.write(json.dumps({
+            "name": "process_name", "ph": "M", "pid": os.getpid(),
+            "args": {"name": "gearbox"},
+        }))
+
+    def begin_tick(self, tick):
+        with self._lock:
+            self.tick = tick
+            self._spans = []
+
+    @contextmanager
+    def span(self, name: str, category: str = "phase", **args):
+        tick = self.tick
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            thread = threading.current_thread()
+            with self._lock:
+                self._spans.append(
+                    (name, category, start, end, thread.ident, thread.name, tick, args)
+                )
+
+    def end_tick(self) -> dict:
+        """Return {category: {name: {count, total_ms, max_ms}}} for the tick."""
+        with self._lock:
+            spans = self._spans
+            self._spans = []
+
+        summary = {}
+        for name, category, start, end, _, _, _, _ in spans:
+            duration_ms = (end - start) / 1e6
+            entry = summary.setdefault(category, {}).setdefault(
+                name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0}
+            )
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+
+        for names in summary.values():
+            for entry in names.values():
+                entry["total_ms"] = round(entry["total_ms"], 2)
+                entry["max_ms"] = round(entry["max_ms"], 2)
+
+        if self._listeners:
+            durations = [(category, name, (end - start) / 1e6) for name, category, start, end, *_ in spans]
+            for listener in self._listeners:
+                listener(durations)
+
+        if self._file is not None:
+            self._write_events(spans)
+        return summary
+
+    def _write_events(self, spans):
+        pid = os.getpid()
+        events = []
+        for name, category, start, end, tid, thread_name, tick, args in spans:
+            if tid not in self._named_threads:
+                self._named_threads.add(tid)
+                events.append({
+                    "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                    "args": {"name": thread_name},
+                })
+            events.append({
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self._origin_ns) / 1000,
+                "dur": (end - start) / 1000,
+                "pid": pid,
+                "tid": tid,
+                "args": dict(args, tick=tick),
+            })
+        if events:
+            self._file.write("".join(",\n" + json.dumps(event) for event in events))
+
+    def close(self):
+        if self._file is not None:
+            self._file.write("\n]\n")
+            self._file.close()
+            self._file = None
+
+
+# Process-wide tracer; engines record spans on it via span().
+tracer = Tracer()
+
+
+def span(name: str, category: str = "phase", **args):
+    return tracer.span(name, category, **args)
@@ -0,0 +1,123 @@
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_POOL_MAXSIZE = 4
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _opened_connections(adapter) -> int:
+    """Connections the adapter's pools have opened so far."""
+    pools = adapter.poolmanager.pools
+    connections = 0
+    for pool_key in pools.keys():
+        pool = pools.get(pool_key)
+        if pool is not None:
+            connections += pool.num_connections
+    return connections
+
+
+class HttpTransport:
+    """
+    Shared keep-alive HTTP transport for all engines.
+
+    One session (and one connection pool) is kept per host so repeated
+    calls to the same RPC or oracle endpoint reuse warm TCP/TLS connections
+    instead of paying a new handshake on every request.
+    """
+
+    def __init__(self, default_pool_maxsize: int = DEFAULT_POOL_MAXSIZE):
+        self.default_pool_maxsize = default_pool_maxsize
+        self._pool_sizes = {}
+        self._sessions = {}
+        self._request_counts = {}
+        # Connections opened by adapters that have since been replaced
+        self._retired_connections = {}
+        self._lock = threading.Lock()
+
+    def configure_host(self, url: str, pool_maxsize: int):
+        """Set the connection pool size used for the host of `url`."""
+        key = _host_key(url)
+        with self._lock:
+            previous_size = self._pool_sizes.get(key, self.default_pool_maxsize)
+            self._pool_sizes[key] = pool_maxsize
+            session = self._sessions.get(key)
+            if session is None or previous_size == pool_maxsize:
+                return
+            old_adapter = session.get_adapter(key)
+            self._mount(session, pool_maxsize)
+            self._retired_connections[key] = (
+                self._retired_connections.get(key, 0) + _opened_connections(old_adapter)
+            )
+        # Release the replaced pool's keep-alive sockets
+        old_adapter.close()
+
+    def _mount(self, session, pool_maxsize: int):
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+
+    def _session(self, url: str):
+        key = _host_key(url)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                self._mount(session, self._pool_sizes.get(key, self.default_pool_maxsize))
+                self._sessions[key] = session
+                self._request_counts[key] = 0
+            self._request_counts[key] += 1
+        return session
+
+    def begin_tick(self, tick):
+        """Called at the start of each evaluation phase (used by capture wrappers)."""
+
+    def post(self, url, json=None, timeout=None):
+        return self._session(url).post(url, json=json, timeout=timeout)
+
+    def get(self, url, timeout=None):
+        return self._session(url).get(url, timeout=timeout)
+
+    def stats(self) -> dict:
+        """Return request, connection and reuse counters per host."""
+        hosts = {}
+        total_requests = 0
+        total_connections = 0
+
+        with self._lock:
+            sessions = list(self._sessions.items())
+            request_counts = dict(self._request_counts)
+            retired = dict(self._retired_connections)
+
+        for key, session in sessions:
+            connections = retired.get(key, 0) + _opened_connections(session.get_adapter(key))
+            count = request_counts.get(key, 0)
+            hosts[key] = {
+                "requests": count,
+                "connections": connections,
+                "reused": max(count - connections, 0),
+            }
+            total_requests += count
+            total_connections += connections
+
+        total_reused = max(total_requests - total_connections, 0)
+        return {
+            "requests": total_requests,
+            "connections": total_connections,
+            "reused": total_reused,
+            "reuse_ratio": round(total_reused / total_requests, 3) if total_requests else None,
+            "hosts": hosts,
+        }
+
+    def close(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions = {}
+        for session in sessions:
+            session.close()
@@ -1,301 +1,719 @@
 import yaml
 
-def validate(config_dir):
-    errors = []
-    required_files = [
-        "risk.yaml",
-        "runtime.yaml",
-        "strategies.yaml",
-        "chain.yaml",
-        "oracle.yaml",
-    ]
-
-    parsed = {}
-
-    for filename in required_files:
-        path = config_dir / filename
-        if not path.exists():
-            errors.append(f"Missing config file: {filename}")
-            continue
-        try:
-            with open(path, "r") as f:
-                data = yaml.safe_load(f)
-        except Exception as e:
-            errors.append(f"Invalid YAML syntax in {filename}: {e}")
-            continue
-        parsed[filename] = data
-
-    if "risk.yaml" in parsed:
-        data = parsed["risk.yaml"]
-        if not isinstance(data, dict):
-            errors.append("risk.yaml must contain a YAML mapping at the top level")
-        elif "risk" not in data:
-            errors.append("risk.yaml missing required top-level key: 'risk'")
-        else:
-            risk = data["risk"]
-
-            required_fields = {
-                "max_drawdown_pct": (int, float),
-                "daily_loss_pct": (int, float),
-                "max_trade_loss_pct": (int, float),
-                "max_position_pct": (int, float),
-                "max_concurrent_positions": int,
-            }
-
-            for field, expected_type in required_fields.items():
-                if field not in risk:
-                    errors.append(f"risk.yaml missing required field: '{field}'")
-                elif not isinstance(risk[field], expected_type):
+from gearbox.config_cache import CONFIG_FILES, read_sources
+from gearbox.health import DEFAULT_MIN_WINDOW_TICKS, DEFAULT_WINDOW_TICKS
+from gearbox.logqueue import LOG_FORMATS, OVERFLOW_POLICIES
+from gearbox.scheduler import OVERRUN_POLICIES, SCHEDULER_MODES
+
+# libyaml's loader is several times faster than the pure-Python one
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _validate_risk(data, errors):
+    if not isinstance(data, dict):
+        errors.append("risk.yaml must contain a YAML mapping at the top level")
+    elif "risk" not in data:
+        errors.append("risk.yaml missing required top-level key: 'risk'")
+    else:
+        risk = data["risk"]
+
+        required_fields = {
+            "max_drawdown_pct": (int, float),
+            "daily_loss_pct": (int, float),
+            "max_trade_loss_pct": (int, float),
+            "max_position_pct": (int, float),
+            "max_concurrent_positions": int,
+        }
+
+        for field, expected_type in required_fields.items():
+            if field not in risk:
+                errors.append(f"risk.yaml missing required field: '{field}'")
+            elif not isinstance(risk[field], expected_type):
+                errors.append(
+                    f"risk.yaml field '{field}' must be of type {expected_type}"
+                )
+
+
+def _validate_runtime(data, errors):
+    if not isinstance(data, dict):
+        errors.append("runtime.yaml must contain a YAML mapping at the top level")
+    elif "runtime" not in data:
+        errors.append("runtime.yaml missing required top-level key: 'runtime'")
+    else:
+        runtime = data["runtime"]
+
+        required_fields = {
+            "mode": str,
+            "execution_enabled": bool,
+            "allowed_chains": list,
+            "min_expected_gain_pct": (int, float),
+            "respect_fees": bool,
+            "allow_discovery": bool,
+            "allow_strategy_switching": bool,
+            "evaluation_interval_sec": int,
+            "max_runtime_sec": int,
+            "strict_validation": bool,
+            "reconciliation": dict,
+            "health": dict,
+        }
+
+        for field, expected_type in required_fields.items():
+            if field not in runtime:
+                errors.append(f"runtime.yaml missing required field: '{field}'")
+            elif not isinstance(runtime[field], expected_type):
+                errors.append(
+                    f"runtime.yaml field '{field}' must be of type {expected_type}"
+                )
+
+        reconciliation = runtime.get("reconciliation")
+        if isinstance(reconciliation, dict):
+            if "max_time_skew_sec" not in reconciliation:
+                errors.append(
+                    "runtime.yaml reconciliation missing required field: 'max_time_skew_sec'"
+                )
+            elif not isinstance(reconciliation["max_time_skew_sec"], int):
+                errors.append(
+                    "runtime.yaml reconciliation field 'max_time_skew_sec' must be of type int"
+                )
+
+        health = runtime.get("health")
+        if isinstance(health, dict):
+            if "pause_after_failures" not in health:
+                errors.append(
+                    "runtime.yaml health missing required field: 'pause_after_failures'"
+                )
+            elif not isinstance(health["pause_after_failures"], int):
+                errors.append(
+                    "runtime.yaml health field 'pause_after_failures' must be of type int"
+                )
+
+            if "halt_after_failures" not in health:
+                errors.append(
+                    "runtime.yaml health missing required field: 'halt_after_failures'"
+                )
+            elif not isinstance(health["halt_after_failures"], int):
+                errors.append(
+                    "runtime.yaml health field 'halt_after_failures' must be of type int"
+                )
+
+            if "pause_interval_multiplier" not in health:
+                errors.append(
+                    "runtime.yaml health missing required field: 'pause_interval_multiplier'"
+                )
+            elif not isinstance(health["pause_interval_multiplier"], int):
+                errors.append(
+                    "runtime.yaml health field 'pause_interval_multiplier' must be of type int"
+                )
+
+            for field in ("window_ticks", "min_window_ticks"):
+                if field in health and (
+                    not isinstance(health[field], int)
+                    or isinstance(health[field], bool)
+                    or health[field] < 1
+                ):
                     errors.append(
-                        f"risk.yaml field '{field}' must be of type {expected_type}"
+                        f"runtime.yaml health field '{field}' must be a positive int"
                     )
 
-    if "runtime.yaml" in parsed:
-        data = parsed["runtime.yaml"]
-        if not isinstance(data, dict):
-            errors.append("runtime.yaml must contain a YAML mapping at the top level")
-        elif "runtime" not in data:
-            errors.append("runtime.yaml missing required top-level key: 'runtime'")
-        else:
-            runtime = data["runtime"]
-
-            required_fields = {
-                "mode": str,
-                "execution_enabled": bool,
-                "allowed_chains": list,
-                "min_expected_gain_pct": (int, float),
-                "respect_fees": bool,
-                "allow_discovery": bool,
-                "allow_strategy_switching": bool,
-                "evaluation_interval_sec": int,
-                "max_runtime_sec": int,
-                "strict_validation": bool,
-                "reconciliation": dict,
-                "health": dict,
-            }
-
-            for field, expected_type in required_fields.items():
-                if field not in runtime:
-                    errors.append(f"runtime.yaml missing required field: '{field}'")
-                elif not isinstance(runtime[field], expected_type):
+            for field in ("pause_failure_rate", "halt_failure_rate"):
+                if field in health and (
+                    not isinstance(health[field], (int, float))
+                    or isinstance(health[field], bool)
+                    or not 0 < health[field] <= 1
+                ):
                     errors.append(
-                        f"runtime.yaml field '{field}' must be of type {expected_type}"
+                        f"runtime.yaml health field '{field}' must be a number in (0, 1]"
                     )
 
-            reconciliation = runtime.get("reconciliation")
-            if isinstance(reconciliation, dict):
-                if "max_time_skew_sec" not in reconciliation:
+            window_ticks = health.get("window_ticks", DEFAULT_WINDOW_TICKS)
+            min_window_ticks = health.get("min_window_ticks", DEFAULT_MIN_WINDOW_TICKS)
+            if (
+                isinstance(window_ticks, int)
+                and isinstance(min_window_ticks, int)
+                and min_window_ticks > window_ticks
+            ):
+                errors.append(
+                    "runtime.yaml health field 'min_window_ticks' must not exceed 'window_ticks'"
+                )
+
+        scheduler = runtime.get("scheduler")
+        if scheduler is not None:
+            if not isinstance(scheduler, dict):
+                errors.append("runtime.yaml field 'scheduler' must be a mapping")
+            else:
+                if "overrun_policy" in scheduler and scheduler["overrun_policy"] not in OVERRUN_POLICIES:
                     errors.append(
-                        "runtime.yaml reconciliation missing required field: 'max_time_skew_sec'"
+                        f"runtime.yaml scheduler field 'overrun_policy' must be one of {list(OVERRUN_POLICIES)}"
                     )
-                elif not isinstance(reconciliation["max_time_skew_sec"], int):
+                if "mode" in scheduler and scheduler["mode"] not in SCHEDULER_MODES:
                     errors.append(
-                        "runtime.yaml reconciliation field 'max_time_skew_sec' must be of type int"
+                        f"runtime.yaml scheduler field 'mode' must be one of {list(SCHEDULER_MODES)}"
                     )
-
-            health = runtime.get("health")
-            if isinstance(health, dict):
-                if "pause_after_failures" not in health:
+                for field in ("min_interval_sec", "max_interval_sec"):
+                    if field in scheduler and (
+                        not isinstance(scheduler[field], (int, float))
+                        or isinstance(scheduler[field], bool)
+                        or scheduler[field] <= 0
+                    ):
+                        errors.append(
+                            f"runtime.yaml scheduler field '{field}' must be a positive number"
+                        )
+                if "block_offset_sec" in scheduler and (
+                    not isinstance(scheduler["block_offset_sec"], (int, float))
+                    or isinstance(scheduler["block_offset_sec"], bool)
+                    or scheduler["block_offset_sec"] < 0
+                ):
                     errors.append(
-                        "runtime.yaml health missing required field: 'pause_after_failures'"
+                        "runtime.yaml scheduler field 'block_offset_sec' must be a non-negative number"
                     )
-                elif not isinstance(health["pause_after_failures"], int):
+                min_interval = scheduler.get("min_interval_sec")
+                max_interval = scheduler.get("max_interval_sec")
+                if (
+                    isinstance(min_interval, (int, float))
+                    and isinstance(max_interval, (int, float))
+                    and min_interval > max_interval
+                ):
                     errors.append(
-                        "runtime.yaml health field 'pause_after_failures' must be of type int"
+                        "runtime.yaml scheduler field 'min_interval_sec' must not exceed 'max_interval_sec'"
                     )
+                if "cadence_chain" in scheduler and scheduler["cadence_chain"] not in (
+                    runtime.get("allowed_chains") or []
+                ):
+                    errors.append(
+                        "runtime.yaml scheduler field 'cadence_chain' must be one of allowed_chains"
+                    )
+
+        executor = runtime.get("executor")
+        if executor is not None:
+            if not isinstance(executor, dict):
+                errors.append("runtime.yaml field 'executor' must be a mapping")
+            else:
+                for field in ("max_workers", "tick_deadline_sec"):
+                    if field in executor and (
+                        not isinstance(executor[field], int) or executor[field] < 1
+                    ):
+                        errors.append(
+                            f"runtime.yaml executor field '{field}' must be a positive int"
+                        )
+
+                stage_timeouts = executor.get("stage_timeout_sec")
+                if stage_timeouts is not None:
+                    if not isinstance(stage_timeouts, dict):
+                        errors.append(
+                            "runtime.yaml executor field 'stage_timeout_sec' must be a mapping"
+                        )
+                    else:
+                        for stage_name, timeout in stage_timeouts.items():
+                            if stage_name not in ("chain", "gas", "oracle", "reconcile"):
+                                errors.append(
+                                    f"runtime.yaml executor stage_timeout_sec has unknown stage: '{stage_name}'"
+                                )
+                            elif not isinstance(timeout, (int, float)) or timeout <= 0:
+                                errors.append(
+                                    f"runtime.yaml executor stage_timeout_sec '{stage_name}' must be a positive number"
+                                )
+
+                rpc_retry = executor.get("rpc_retry")
+                if rpc_retry is not None:
+                    if not isinstance(rpc_retry, dict):
+                        errors.append("runtime.yaml executor field 'rpc_retry' must be a mapping")
+                    else:
+                        for field, minimum in (
+                            ("budget_per_tick", 0),
+                            ("max_attempts", 1),
+                        ):
+                            value = rpc_retry.get(field)
+                            if field in rpc_retry and (
+                                not isinstance(value, int) or isinstance(value, bool) or value < minimum
+                            ):
+                                errors.append(
+                                    f"runtime.yaml executor rpc_retry field '{field}' must be an int >= {minimum}"
+                                )
+                        for field in ("backoff_ms", "max_backoff_ms"):
+                            value = rpc_retry.get(field)
+                            if field in rpc_retry and (
+                                not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0
+                            ):
+                                errors.append(
+                                    f"runtime.yaml executor rpc_retry field '{field}' must be a non-negative number"
+                                )
 
-                if "halt_after_failures" not in health:
+        state = runtime.get("state")
+        if state is not None:
+            if not isinstance(state, dict):
+                errors.append("runtime.yaml field 'state' must be a mapping")
+            else:
+                if "enabled" in state and not isinstance(state["enabled"], bool):
+                    errors.append("runtime.yaml state field 'enabled' must be of type bool")
+                if "data_dir" in state and not isinstance(state["data_dir"], str):
+                    errors.append("runtime.yaml state field 'data_dir' must be of type str")
+
+        if "config_reload" in runtime and not isinstance(runtime["config_reload"], bool):
+            errors.append("runtime.yaml field 'config_reload' must be of type bool")
+
+        supervisor = runtime.get("supervisor")
+        if supervisor is not None:
+            if not isinstance(supervisor, dict):
+                errors.append("runtime.yaml field 'supervisor' must be a mapping")
+            else:
+                if "workers" in supervisor and (
+                    not isinstance(supervisor["workers"], int)
+                    or isinstance(supervisor["workers"], bool)
+                    or supervisor["workers"] < 1
+                ):
+                    errors.append("runtime.yaml supervisor field 'workers' must be a positive int")
+                if "max_restarts" in supervisor and (
+                    not isinstance(supervisor["max_restarts"], int)
+                    or isinstance(supervisor["max_restarts"], bool)
+                    or supervisor["max_restarts"] < 0
+                ):
+                    errors.append("runtime.yaml supervisor field 'max_restarts' must be a non-negative int")
+                if "stall_timeout_sec" in supervisor and (
+                    not isinstance(supervisor["stall_timeout_sec"], (int, float))
+                    or isinstance(supervisor["stall_timeout_sec"], bool)
+                    or supervisor["stall_timeout_sec"] <= 0
+                ):
+                    errors.append("runtime.yaml supervisor field 'stall_timeout_sec' must be a positive number")
+
+        metrics = runtime.get("metrics")
+        if metrics is not None:
+            if not isinstance(metrics, dict):
+                errors.append("runtime.yaml field 'metrics' must be a mapping")
+            else:
+                if "enabled" in metrics and not isinstance(metrics["enabled"], bool):
+                    errors.append("runtime.yaml metrics field 'enabled' must be of type bool")
+                if "host" in metrics and not isinstance(metrics["host"], str):
+                    errors.append("runtime.yaml metrics field 'host' must be of type str")
+                if "port" in metrics and (
+                    not isinstance(metrics["port"], int) or not 1 <= metrics["port"] <= 65535
+                ):
+                    errors.append("runtime.yaml metrics field 'port' must be an int between 1 and 65535")
+
+        logging_cfg = runtime.get("logging")
+        if logging_cfg is not None:
+            if not isinstance(logging_cfg, dict):
+                errors.append("runtime.yaml field 'logging' must be a mapping")
+            else:
+                if "format" in logging_cfg and logging_cfg["format"] not in LOG_FORMATS:
+                    errors.append(
+                        f"runtime.yaml logging field 'format' must be one of {list(LOG_FORMATS)}"
+                    )
+                if "overflow" in logging_cfg and logging_cfg["overflow"] not in OVERFLOW_POLICIES:
                     errors.append(
-                        "runtime.yaml health missing required field: 'halt_after_failures'"
+                        f"runtime.yaml logging field 'overflow' must be one of {list(OVERFLOW_POLICIES)}"
                     )
-                elif not isinstance(health["halt_after_failures"], int):
+                if "compress_segments" in logging_cfg and not isinstance(logging_cfg["compress_segments"], bool):
                     errors.append(
-                        "runtime.yaml health field 'halt_after_failures' must be of type int"
+                        "runtime.yaml logging field 'compress_segments' must be of type bool"
                     )
+                for field in (
+                    "queue_size",
+                    "batch_size",
+                    "flush_interval_ms",
+                    "segment_max_bytes",
+                    "segment_max_age_sec",
+                ):
+                    if field in logging_cfg and (
+                        not isinstance(logging_cfg[field], int) or logging_cfg[field] < 1
+                    ):
+                        errors.append(
+                            f"runtime.yaml logging field '{field}' must be a positive int"
+                        )
+
+
+def _validate_strategies(data, errors):
+    if not isinstance(data, dict):
+        errors.append("strategies.yaml must contain a YAML mapping at the top level")
+    elif "strategies" not in data:
+        errors.append("strategies.yaml missing required top-level key: 'strategies'")
+    else:
+        strategies = data["strategies"]
+
+        required_fields = {
+            "allowed_classes": list,
+            "allowed_horizons": list,
+            "switching": dict,
+            "data_sources": dict,
+        }
+
+        for field, expected_type in required_fields.items():
+            if field not in strategies:
+                errors.append(f"strategies.yaml missing required field: '{field}'")
+            elif not isinstance(strategies[field], expected_type):
+                errors.append(
+                    f"strategies.yaml field '{field}' must be of type {expected_type}"
+                )
+
+        if "switching" in strategies and isinstance(strategies["switching"], dict):
+            switching = strategies["switching"]
+
+            switching_fields = {
+                "min_dwell_time_sec": int,
+                "max_switches_per_day": int,
+            }
 
-                if "pause_interval_multiplier" not in health:
+            for field, expected_type in switching_fields.items():
+                if field not in switching:
                     errors.append(
-                        "runtime.yaml health missing required field: 'pause_interval_multiplier'"
+                        f"strategies.yaml switching missing required field: '{field}'"
                     )
-                elif not isinstance(health["pause_interval_multiplier"], int):
+                elif not isinstance(switching[field], expected_type):
                     errors.append(
-                        "runtime.yaml health field 'pause_interval_multiplier' must be of type int"
+                        f"strategies.yaml switching field '{field}' must be of type {expected_type}"
                     )
 
-            allowed_chains = runtime.get("allowed_chains")
-            if isinstance(allowed_chains, list):
-                chain_defs = parsed.get("chain.yaml", {}).get("chains", {})
-                if isinstance(chain_defs, dict):
-                    for chain_name in allowed_chains:
-                        if chain_name not in chain_defs:
-                            errors.append(
-                                f"runtime.yaml allowed_chains references undefined chain: '{chain_name}'"
-                            )
-
-    if "strategies.yaml" in parsed:
-        data = parsed["strategies.yaml"]
-        if not isinstance(data, dict):
-            errors.append("strategies.yaml must contain a YAML mapping at the top level")
-        elif "strategies" not in data:
-            errors.append("strategies.yaml missing required top-level key: 'strategies'")
-        else:
-            strategies = data["strategies"]
+        if "data_sources" in strategies and isinstance(strategies["data_sources"], dict):
+            data_sources = strategies["data_sources"]
 
-            required_fields = {
-                "allowed_classes": list,
-                "allowed_horizons": list,
-                "switching": dict,
-                "data_sources": dict,
+            data_source_fields = {
+                "allow_price_data": bool,
+                "allow_volume_data": bool,
+                "allow_onchain_data": bool,
+                "allow_external_sentiment": bool,
             }
 
-            for field, expected_type in required_fields.items():
-                if field not in strategies:
-                    errors.append(f"strategies.yaml missing required field: '{field}'")
-                elif not isinstance(strategies[field], expected_type):
+            for field, expected_type in data_source_fields.items():
+                if field not in data_sources:
+                    errors.append(
+                        f"strategies.yaml data_sources missing required field: '{field}'"
+                    )
+                elif not isinstance(data_sources[field], expected_type):
                     errors.append(
-                        f"strategies.yaml field '{field}' must be of type {expected_type}"
+                        f"strategies.yaml data_sources field '{field}' must be of type {expected_type}"
                     )
 
-            if "switching" in strategies and isinstance(strategies["switching"], dict):
-                switching = strategies["switching"]
 
-                switching_fields = {
-                    "min_dwell_time_sec": int,
-                    "max_switches_per_day": int,
+def _validate_chain(data, errors):
+    if not isinstance(data, dict):
+        errors.append("chain.yaml must contain a YAML mapping at the top level")
+    elif "chains" not in data:
+        errors.append("chain.yaml missing required top-level key: 'chains'")
+    else:
+        chains = data["chains"]
+        if not isinstance(chains, dict):
+            errors.append("chain.yaml 'chains' must be a mapping")
+        else:
+            for chain_name, chain_cfg in chains.items():
+                if not isinstance(chain_cfg, dict):
+                    errors.append(f"chain.yaml chain '{chain_name}' must be a mapping")
+                    continue
+
+                required_chain_fields = {
+                    "description": str,
+                    "default_network": str,
+                    "networks": dict,
                 }
 
-                for field, expected_type in switching_fields.items():
-                    if field not in switching:
+                for field, expected_type in required_chain_fields.items():
+                    if field not in chain_cfg:
                         errors.append(
-                            f"strategies.yaml switching missing required field: '{field}'"
+                            f"chain.yaml chain '{chain_name}' missing required field: '{field}'"
                         )
-                    elif not isinstance(switching[field], expected_type):
+                    elif not isinstance(chain_cfg[field], expected_type):
                         errors.append(
-                            f"strategies.yaml switching field '{field}' must be of type {expected_type}"
+                            f"chain.yaml chain '{chain_name}' field '{field}' must be of type {expected_type}"
                         )
 
-            if "data_sources" in strategies and isinstance(strategies["data_sources"], dict):
-                data_sources = strategies["data_sources"]
+                networks = chain_cfg.get("networks")
+                if isinstance(networks, dict):
+                    for net_name, net_cfg in networks.items():
+                        if not isinstance(net_cfg, dict):
+                            errors.append(
+                                f"chain.yaml chain '{chain_name}' network '{net_name}' must be a mapping"
+                            )
+                            continue
+
+                        if "description" not in net_cfg or not isinstance(net_cfg["description"], str):
+                            errors.append(
+                                f"chain.yaml chain '{chain_name}' network '{net_name}' missing or invalid 'description'"
+                            )
 
-                data_source_fields = {
-                    "allow_price_data": bool,
-                    "allow_volume_data": bool,
-                    "allow_onchain_data": bool,
-                    "allow_external_sentiment": bool,
-                }
+                        if "rpc_endpoints" not in net_cfg or not isinstance(net_cfg["rpc_endpoints"], list):
+                            errors.append(
+                                f"chain.yaml chain '{chain_name}' network '{net_name}' missing or invalid 'rpc_endpoints'"
+                            )
 
-                for field, expected_type in data_source_fields.items():
-                    if field not in data_sources:
-                        errors.append(
-                            f"strategies.yaml data_sources missing required field: '{field}'"
-                        )
-                    elif not isinstance(data_sources[field], expected_type):
-                        errors.append(
-                            f"strategies.yaml data_sources field '{field}' must be of type {expected_type}"
-                        )
+                        if "rpc_timeout_sec" not in net_cfg or not isinstance(net_cfg["rpc_timeout_sec"], int):
+                            errors.append(
+                                f"chain.yaml chain '{chain_name}' network '{net_name}' missing or invalid 'rpc_timeout_sec'"
+                            )
 
-    if "chain.yaml" in parsed:
-        data = parsed["chain.yaml"]
-        if not isinstance(data, dict):
-            errors.append("chain.yaml must contain a YAML mapping at the top level")
-        elif "chains" not in data:
-            errors.append("chain.yaml missing required top-level key: 'chains'")
-        else:
-            chains = data["chains"]
-            if not isinstance(chains, dict):
-                errors.append("chain.yaml 'chains' must be a mapping")
-            else:
-                for chain_name, chain_cfg in chains.items():
-                    if not isinstance(chain_cfg, dict):
-                        errors.append(f"chain.yaml chain '{chain_name}' must be a mapping")
-                        continue
-
-                    required_chain_fields = {
-                        "description": str,
-                        "default_network": str,
-                        "networks": dict,
-                    }
-
-                    for field, expected_type in required_chain_fields.items():
-                        if field not in chain_cfg:
+                        if not (
+                            ("chain_id" in net_cfg and isinstance(net_cfg["chain_id"], int)) or
+                            ("cluster" in net_cfg and isinstance(net_cfg["cluster"], str))
+                        ):
                             errors.append(
-                                f"chain.yaml chain '{chain_name}' missing required field: '{field}'"
+                                f"chain.yaml chain '{chain_name}' network '{net_name}' must define 'chain_id' (int) or 'cluster' (str)"
                             )
-                        elif not isinstance(chain_cfg[field], expected_type):
+
+                        if "rpc_batch" in net_cfg and not isinstance(net_cfg["rpc_batch"], bool):
                             errors.append(
-                                f"chain.yaml chain '{chain_name}' field '{field}' must be of type {expected_type}"
+                                f"chain.yaml chain '{chain_name}' network '{net_name}' field 'rpc_batch' must be of type bool"
                             )
 
-                    networks = chain_cfg.get("networks")
-                    if isinstance(networks, dict):
-                        for net_name, net_cfg in networks.items():
-                            if not isinstance(net_cfg, dict):
-                                errors.append(
-                                    f"chain.yaml chain '{chain_name}' network '{net_name}' must be a mapping"
-                                )
-                                continue
+                        if "hedge_percentile" in net_cfg and (
+                            not isinstance(net_cfg["hedge_percentile"], int)
+                            or not 1 <= net_cfg["hedge_percentile"] <= 99
+                        ):
+                            errors.append(
+                                f"chain.yaml chain '{chain_name}' network '{net_name}' field 'hedge_percentile' must be an int between 1 and 99"
+                            )
+
+                        if "hedge_min_delay_ms" in net_cfg and (
+                            not isinstance(net_cfg["hedge_min_delay_ms"], int)
+                            or net_cfg["hedge_min_delay_ms"] < 0
+                        ):
+                            errors.append(
+                                f"chain.yaml chain '{chain_name}' network '{net_name}' field 'hedge_min_delay_ms' must be a non-negative int"
+                            )
 
-                            if "description" not in net_cfg or not isinstance(net_cfg["description"], str):
+                        for field in ("breaker_failure_threshold", "breaker_reset_sec"):
+                            if field in net_cfg and (
+                                not isinstance(net_cfg[field], int) or net_cfg[field] < 1
+                            ):
                                 errors.append(
-                                    f"chain.yaml chain '{chain_name}' network '{net_name}' missing or invalid 'description'"
+                                    f"chain.yaml chain '{chain_name}' network '{net_name}' field '{field}' must be a positive int"
                                 )
 
-                            if "rpc_endpoints" not in net_cfg or not isinstance(net_cfg["rpc_endpoints"], list):
+                        if "http_pool_maxsize" in net_cfg and (
+                            not isinstance(net_cfg["http_pool_maxsize"], int)
+                            or net_cfg["http_pool_maxsize"] < 1
+                        ):
+                            errors.append(
+                                f"chain.yaml chain '{chain_name}' network '{net_name}' field 'http_pool_maxsize' must be a positive int"
+                            )
+
+                        if "block_time_sec" in net_cfg and (
+                            not isinstance(net_cfg["block_time_sec"], (int, float))
+                            or isinstance(net_cfg["block_time_sec"], bool)
+                            or net_cfg["block_time_sec"] <= 0
+                        ):
+                            errors.append(
+                                f"chain.yaml chain '{chain_name}' network '{net_name}' field 'block_time_sec' must be a positive number"
+                            )
+
+                        if "ws_endpoint" in net_cfg and (
+                            not isinstance(net_cfg["ws_endpoint"], str)
+                            or not net_cfg["ws_endpoint"].startswith(("ws://", "wss://"))
+                        ):
+                            errors.append(
+                                f"chain.yaml chain '{chain_name}' network '{net_name}' field 'ws_endpoint' must be a ws:// or wss:// URL"
+                            )
+
+                        if "head_stream" in net_cfg:
+                            if not isinstance(net_cfg["head_stream"], bool):
                                 errors.append(
-                                    f"chain.yaml chain '{chain_name}' network '{net_name}' missing or invalid 'rpc_endpoints'"
+                                    f"chain.yaml chain '{chain_name}' network '{net_name}' field 'head_stream' must be of type bool"
                                 )
-
-                            if "rpc_timeout_sec" not in net_cfg or not isinstance(net_cfg["rpc_timeout_sec"], int):
+                            elif net_cfg["head_stream"] and "ws_endpoint" not in net_cfg:
                                 errors.append(
-                                    f"chain.yaml chain '{chain_name}' network '{net_name}' missing or invalid 'rpc_timeout_sec'"
+                                    f"chain.yaml chain '{chain_name}' network '{net_name}' field 'head_stream' requires 'ws_endpoint'"
                                 )
 
-                            if not (
-                                ("chain_id" in net_cfg and isinstance(net_cfg["chain_id"], int)) or
-                                ("cluster" in net_cfg and isinstance(net_cfg["cluster"], str))
+                        if "stream_stale_sec" in net_cfg and (
+                            not isinstance(net_cfg["stream_stale_sec"], (int, float))
+                            or isinstance(net_cfg["stream_stale_sec"], bool)
+                            or net_cfg["stream_stale_sec"] <= 0
+                        ):
+                            errors.append(
+                                f"chain.yaml chain '{chain_name}' network '{net_name}' field 'stream_stale_sec' must be a positive number"
+                            )
+
+                        if "fee_history" in net_cfg and not isinstance(net_cfg["fee_history"], bool):
+                            errors.append(
+                                f"chain.yaml chain '{chain_name}' network '{net_name}' field 'fee_history' must be of type bool"
+                            )
+
+                        for field in ("fee_window_blocks", "fee_max_blocks_per_call"):
+                            if field in net_cfg and (
+                                not isinstance(net_cfg[field], int)
+                                or isinstance(net_cfg[field], bool)
+                                or net_cfg[field] < 1
                             ):
                                 errors.append(
-                                    f"chain.yaml chain '{chain_name}' network '{net_name}' must define 'chain_id' (int) or 'cluster' (str)"
+                                    f"chain.yaml chain '{chain_name}' network '{net_name}' field '{field}' must be a positive int"
                                 )
 
-    if "oracle.yaml" in parsed:
-        data = parsed["oracle.yaml"]
-        if not isinstance(data, dict):
-            errors.append("oracle.yaml must contain a YAML mapping at the top level")
-        elif "oracle" not in data:
-            errors.append("oracle.yaml missing required top-level key: 'oracle'")
+
+def _validate_oracle(data, errors):
+    if not isinstance(data, dict):
+        errors.append("oracle.yaml must contain a YAML mapping at the top level")
+    elif "oracle" not in data:
+        errors.append("oracle.yaml missing required top-level key: 'oracle'")
+    else:
+        oracle = data["oracle"]
+        if not isinstance(oracle, dict):
+            errors.append("oracle.yaml 'oracle' must be a mapping")
         else:
-            oracle = data["oracle"]
-            if not isinstance(oracle, dict):
-                errors.append("oracle.yaml 'oracle' must be a mapping")
-            else:
-                required_fields = {
-                    "provider": str,
-                    "endpoint_url": str,
-                    "asset_pair": str,
-                    "timeout_sec": int,
-                }
+            required_fields = {
+                "provider": str,
+                "endpoint_url": str,
+                "timeout_sec": int,
+            }
 
-                for field, expected_type in required_fields.items():
-                    if field not in oracle:
-                        errors.append(f"oracle.yaml missing required field: '{field}'")
-                    elif not isinstance(oracle[field], expected_type):
+            for field, expected_type in required_fields.items():
+                if field not in oracle:
+                    errors.append(f"oracle.yaml missing required field: '{field}'")
+                elif not isinstance(oracle[field], expected_type):
+                    errors.append(
+                        f"oracle.yaml field '{field}' must be of type {expected_type}"
+                    )
+
+            if "asset_pair" in oracle and "asset_pairs" in oracle:
+                errors.append("oracle.yaml must define only one of 'asset_pair' or 'asset_pairs'")
+            elif "asset_pairs" in oracle:
+                pairs = oracle["asset_pairs"]
+                if (
+                    not isinstance(pairs, list)
+                    or not pairs
+                    or not all(isinstance(pair, str) and pair for pair in pairs)
+                ):
+                    errors.append("oracle.yaml field 'asset_pairs' must be a non-empty list of str")
+                elif len(set(pairs)) != len(pairs):
+                    errors.append("oracle.yaml field 'asset_pairs' must not contain duplicates")
+            elif "asset_pair" not in oracle:
+                errors.append("oracle.yaml missing required field: 'asset_pair' or 'asset_pairs'")
+            elif not isinstance(oracle["asset_pair"], str):
+                errors.append(f"oracle.yaml field 'asset_pair' must be of type {str}")
+
+            for field in ("max_concurrency", "rate_limit_burst"):
+                if field in oracle and (not isinstance(oracle[field], int) or oracle[field] < 1):
+                    errors.append(f"oracle.yaml field '{field}' must be a positive int")
+
+            if "rate_limit_rps" in oracle and (
+                not isinstance(oracle["rate_limit_rps"], (int, float))
+                or isinstance(oracle["rate_limit_rps"], bool)
+                or oracle["rate_limit_rps"] <= 0
+            ):
+                errors.append("oracle.yaml field 'rate_limit_rps' must be a positive number")
+
+            if "rate_limit_retries" in oracle and (
+                not isinstance(oracle["rate_limit_retries"], int)
+                or oracle["rate_limit_retries"] < 0
+            ):
+                errors.append("oracle.yaml field 'rate_limit_retries' must be a non-negative int")
+
+            cache = oracle.get("cache")
+            if cache is not None:
+                if not isinstance(cache, dict):
+                    errors.append("oracle.yaml field 'cache' must be a mapping")
+                else:
+                    if "ttl_sec" not in cache:
+                        errors.append("oracle.yaml cache missing required field: 'ttl_sec'")
+                    elif (
+                        not isinstance(cache["ttl_sec"], (int, float))
+                        or isinstance(cache["ttl_sec"], bool)
+                        or cache["ttl_sec"] <= 0
+                    ):
+                        errors.append("oracle.yaml cache field 'ttl_sec' must be a positive number")
+                    if "max_entries" in cache and (
+                        not isinstance(cache["max_entries"], int) or cache["max_entries"] < 1
+                    ):
+                        errors.append("oracle.yaml cache field 'max_entries' must be a positive int")
+                    pair_ttl = cache.get("pair_ttl_sec")
+                    if pair_ttl is not None and (
+                        not isinstance(pair_ttl, dict)
+                        or not all(
+                            isinstance(ttl, (int, float)) and not isinstance(ttl, bool) and ttl > 0
+                            for ttl in pair_ttl.values()
+                        )
+                    ):
                         errors.append(
-                            f"oracle.yaml field '{field}' must be of type {expected_type}"
+                            "oracle.yaml cache field 'pair_ttl_sec' must map asset pairs to positive numbers"
                         )
 
-                provider = oracle.get("provider")
-                if provider is not None and provider != "coinbase":
-                    errors.append("oracle.yaml field 'provider' must be 'coinbase'")
+            provider = oracle.get("provider")
+            if provider is not None and provider != "coinbase":
+                errors.append("oracle.yaml field 'provider' must be 'coinbase'")
+
+            endpoint_url = oracle.get("endpoint_url")
+            if isinstance(endpoint_url, str) and "{asset_pair}" not in endpoint_url:
+                errors.append(
+                    "oracle.yaml field 'endpoint_url' must include '{asset_pair}'"
+                )
+
+            if "http_pool_maxsize" in oracle and (
+                not isinstance(oracle["http_pool_maxsize"], int)
+                or oracle["http_pool_maxsize"] < 1
+            ):
+                errors.append(
+                    "oracle.yaml field 'http_pool_maxsize' must be a positive int"
+                )
+
+
+def _validate_references(parsed, errors):
+    """Checks that span files; run on the merged config after any file changes."""
+    runtime = parsed.get("runtime.yaml")
+    runtime = runtime.get("runtime") if isinstance(runtime, dict) else None
+    chains = parsed.get("chain.yaml", {})
+    chain_defs = chains.get("chains", {}) if isinstance(chains, dict) else None
+
+    allowed_chains = runtime.get("allowed_chains") if isinstance(runtime, dict) else None
+    if isinstance(allowed_chains, list) and isinstance(chain_defs, dict):
+        for chain_name in allowed_chains:
+            if chain_name not in chain_defs:
+                errors.append(
+                    f"runtime.yaml allowed_chains references undefined chain: '{chain_name}'"
+                )
+
+
+FILE_VALIDATORS = {
+    "risk.yaml": _validate_risk,
+    "runtime.yaml": _validate_runtime,
+    "strategies.yaml": _validate_strategies,
+    "chain.yaml": _validate_chain,
+    "oracle.yaml": _validate_oracle,
+}
+
+
+def _check_file(filename, source, parsed, errors):
+    """Parse and check one file, adding it to `parsed` if it is valid YAML."""
+    if source is None:
+        errors.append(f"Missing config file: {filename}")
+        return
+    try:
+        data = yaml.load(source, Loader=SafeLoader)
+    except Exception as e:
+        errors.append(f"Invalid YAML syntax in {filename}: {e}")
+        return
+    parsed[filename] = data
+    FILE_VALIDATORS[filename](data, errors)
+
+
+def validate(config_dir, sources=None):
+    errors = []
+    if sources is None:
+        sources = read_sources(config_dir)
 
-                endpoint_url = oracle.get("endpoint_url")
-                if isinstance(endpoint_url, str) and "{asset_pair}" not in endpoint_url:
-                    errors.append(
-                        "oracle.yaml field 'endpoint_url' must include '{asset_pair}'"
-                    )
+    parsed = {}
+    for filename in CONFIG_FILES:
+        _check_file(filename, sources.get(filename), parsed, errors)
+    _validate_references(parsed, errors)
 
     return {
         "ok": len(errors) == 0,
         "errors": errors,
         "parsed": parsed,
     }
+
+
+def revalidate(parsed, changed_sources):
+    """
+    Validate changed config files against an already validated config.
+
+    Only the files in `changed_sources` ({filename: bytes, or None if
+    deleted}) are parsed and checked; the others are taken from `parsed` as
+    they are. Cross-file references are then checked on the merged config.
+    """
+    errors = []
+    merged = dict(parsed)
+    for filename, source in changed_sources.items():
+        merged.pop(filename, None)
+        _check_file(filename, source, merged, errors)
+    _validate_references(merged, errors)
+
+    return {
+        "ok": len(errors) == 0,
+        "errors": errors,
+        "parsed": merged,
+    }
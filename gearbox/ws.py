@@ -0,0 +1,209 @@
+import base64
+import hashlib
+import os
+import socket
+import ssl
+import struct
+import threading
+from urllib.parse import urlsplit
+
+# Minimal RFC 6455 WebSocket support (text messages, ping/pong, close),
+# enough for JSON-RPC subscriptions without a third-party client.
+
+GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+class WebSocketError(Exception):
+    pass
+
+
+class WebSocketClosed(WebSocketError):
+    pass
+
+
+def accept_key(key: str) -> str:
+    digest = hashlib.sha1((key + GUID).encode("ascii")).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def encode_frame(opcode: int, payload: bytes, mask: bool) -> bytes:
+    header = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    length = len(payload)
+    if length < 126:
+        header.append(mask_bit | length)
+    elif length < 1 << 16:
+        header.append(mask_bit | 126)
+        header += struct.pack("!H", length)
+    else:
+        header.append(mask_bit | 127)
+        header += struct.pack("!Q", length)
+
+    if not mask:
+        return bytes(header) + payload
+    key = os.urandom(4)
+    return bytes(header) + key + _apply_mask(payload, key)
+
+
+def _apply_mask(payload: bytes, key: bytes) -> bytes:
+    if not payload:
+        return b""
+    # XOR with the repeated 4-byte key, as one big-int operation
+    repeated = (key * (len(payload) // 4 + 1))[:len(payload)]
+    masked = int.from_bytes(payload, "big") ^ int.from_bytes(repeated, "big")
+    return masked.to_bytes(len(payload), "big")
+
+
+def _read_exact(rfile, n: int) -> bytes:
+    data = rfile.read(n)
+    if data is None or len(data) < n:
+        raise WebSocketClosed("connection closed")
+    return data
+
+
+def read_frame(rfile):
+    """Return (fin, opcode, payload) for the next frame, unmasking if needed."""
+    first, second = _read_exact(rfile, 2)
+    fin = bool(first & 0x80)
+    opcode = first & 0x0F
+    masked = bool(second & 0x80)
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack("!H", _read_exact(rfile, 2))[0]
+    elif length == 127:
+        length = struct.unpack("!Q", _read_exact(rfile, 8))[0]
+    if length > MAX_MESSAGE_BYTES:
+        raise WebSocketError(f"frame too large: {length} bytes")
+
+    key = _read_exact(rfile, 4) if masked else None
+    payload = _read_exact(rfile, length) if length else b""
+    if key is not None:
+        payload = _apply_mask(payload, key)
+    return fin, opcode, payload
+
+
+class WebSocket:
+    """
+    One open WebSocket connection over a connected socket.
+
+    Clients mask outgoing frames and servers do not (`mask`). recv() returns
+    the next complete text message, answering pings on the way; send() is
+    safe to call from several threads.
+    """
+
+    def __init__(self, sock, mask: bool, rfile=None):
+        self.sock = sock
+        self.mask = mask
+        self.rfile = rfile if rfile is not None else sock.makefile("rb")
+        self._send_lock = threading.Lock()
+        self.closed = False
+
+    def _send_frame(self, opcode: int, payload: bytes):
+        frame = encode_frame(opcode, payload, self.mask)
+        with self._send_lock:
+            self.sock.sendall(frame)
+
+    def send(self, text: str):
+        self._send_frame(OP_TEXT, text.encode("utf-8"))
+
+    def recv(self) -> str:
+        parts = []
+        size = 0
+        while True:
+            fin, opcode, payload = read_frame(self.rfile)
+            if opcode == OP_PING:
+                self._send_frame(OP_PONG, payload)
+                continue
+            if opcode == OP_PONG:
+                continue
+            if opcode == OP_CLOSE:
+                if not self.closed:
+                    self.closed = True
+                    try:
+                        self._send_frame(OP_CLOSE, payload[:2])
+                    except OSError:
+                        pass
+                raise WebSocketClosed("closed by peer")
+            if opcode not in (OP_TEXT, OP_BINARY, OP_CONTINUATION):
+                raise WebSocketError(f"unexpected opcode {opcode}")
+
+            parts.append(payload)
+            size += len(payload)
+            if size > MAX_MESSAGE_BYTES:
+                raise WebSocketError("message too large")
+            if fin:
+                return b"".join(parts).decode("utf-8")
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            try:
+                self._send_frame(OP_CLOSE, struct.pack("!H", 1000))
+            except OSError:
+                pass
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+def connect(url: str, timeout_sec: float) -> WebSocket:
+    """Open a client connection to a ws:// or wss:// URL."""
+    parts = urlsplit(url)
+    if parts.scheme not in ("ws", "wss"):
+        raise WebSocketError(f"unsupported scheme: {parts.scheme}")
+    secure = parts.scheme == "wss"
+    host = parts.hostname
+    port = parts.port or (443 if secure else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+
+    sock = socket.create_connection((host, port), timeout=timeout_sec)
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if secure:
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+
+        key = base64.b64encode(os.urandom(16)).decode("ascii")
+        host_header = host if parts.port is None else f"{host}:{port}"
+        request = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {host_header}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n"
+            "\r\n"
+        )
+        sock.sendall(request.encode("ascii"))
+
+        rfile = sock.makefile("rb")
+        status = rfile.readline().decode("latin-1").strip()
+        headers = {}
+        while True:
+            line = rfile.readline().decode("latin-1")
+            if line in ("\r\n", "\n", ""):
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if not status.startswith("HTTP/1.1 101"):
+            raise WebSocketError(f"handshake failed: {status or 'no response'}")
+        if headers.get("sec-websocket-accept") != accept_key(key):
+            raise WebSocketError("handshake failed: bad Sec-WebSocket-Accept")
+    except Exception:
+        sock.close()
+        raise
+
+    return WebSocket(sock, mask=True, rfile=rfile)